@@ -6,14 +6,50 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
 
+from fi_forecasting.dashboard.charts import add_event_markers, downsample_series
+from fi_forecasting.dashboard.data_access import DataStore, read_forecast_table
+from fi_forecasting.dashboard.reshape import reshape_forecasts as reshape_forecast_table
+from fi_forecasting.dashboard.views import DashboardViews
+
 # -----------------------------
 # Load Data Functions
 # -----------------------------
-@st.cache_data
-def load_enriched_data(path="../data/processed/enriched_fi_data.csv"):
-    df = pd.read_csv(path, parse_dates=["observation_date"])
-    df['year'] = df['observation_date'].dt.year
-    return df
+@st.cache_resource
+def get_data_store():
+    """
+    One shared, file-aware store per server process. Paths come from
+    the settings; the watcher picks up new pipeline outputs without a
+    dashboard restart.
+    """
+    store = DataStore(
+        loaders={"forecasts": lambda path: reshape_forecasts(read_forecast_table(path))}
+    )
+    store.start_watcher()
+    return store
+
+
+def load_enriched_data():
+    return get_data_store().get("enriched")
+
+
+def load_dashboard_views():
+    """
+    Prebuilt aggregates written by the pipeline (scripts/run_pipeline.sh);
+    built from the enriched CSV when they have not been exported yet.
+    """
+    store = get_data_store()
+    try:
+        return store.get("views")
+    except FileNotFoundError:
+        data = load_enriched_data()
+        return _views_from_data(store.version, data)
+
+
+@st.cache_resource(max_entries=1)
+def _views_from_data(version, _data):
+    # Keyed on the store version: rebuilt only when the data reloads
+    return DashboardViews.from_data(_data)
+
 
 # -----------------------------
 # Forecast Reshaping
@@ -22,55 +58,40 @@ def reshape_forecasts(forecasts):
     """
     Reshape wide forecast CSV into long format:
     indicator_code | year | scenario | forecast | lower_ci | upper_ci
+
+    Indicators and scenarios are discovered from the column names
+    (``<INDICATOR>_<scenario|lower|upper>``).
     """
-    rows = []
-    # List of indicators in your CSV
-    indicators = ["ACC_OWNERSHIP", "USG_P2P_COUNT"]
-    scenarios = ["base", "optimistic", "pessimistic"]
-
-    for _, row in forecasts.iterrows():
-        year = row['year']
-        for ind in indicators:
-            for sc in scenarios:
-                forecast_val = row.get(f"{ind}_{sc}", None)
-                # Get bounds if exist
-                lower = row.get(f"{ind}_lower", None)
-                upper = row.get(f"{ind}_upper", None)
-                rows.append({
-                    "year": year,
-                    "indicator_code": ind,
-                    "scenario": sc.capitalize(),
-                    "forecast": forecast_val,
-                    "lower_ci": lower,
-                    "upper_ci": upper
-                })
-    return pd.DataFrame(rows)
-
-@st.cache_data
-def load_forecasts(path="../models/forecast_outputs.csv"):
-    # First column is the year, no header name
-    df = pd.read_csv(path)
-    # If first column is unnamed, rename it to 'year'
-    if df.columns[0].startswith('Unnamed'):
-        df = df.rename(columns={df.columns[0]: 'year'})
-    df_long = reshape_forecasts(df)
+    df_long = reshape_forecast_table(forecasts)
+    df_long['scenario'] = df_long['scenario'].str.capitalize()
     return df_long
 
 
+def load_forecasts():
+    return get_data_store().get("forecasts")
+
+
 # -----------------------------
 # KPI Calculation Functions
 # -----------------------------
-def calculate_kpis(data):
-    latest_year = data['year'].max()
-    latest_data = data[data['year'] == latest_year]
+def _latest_value(views, indicator):
+    kpi = views.kpi(indicator)
+    return None if kpi is None else float(kpi["value"])
+
+
+def calculate_kpis(views):
+    """Latest-year KPI values, looked up in the prebuilt snapshot view."""
+    def rounded(value):
+        return "N/A" if value is None else round(value, 2)
+
     kpis = {
-        "Account Ownership": round(latest_data[latest_data['indicator_code']=='ACC_OWNERSHIP']['value_numeric'].mean(),2),
-        "Digital Payment Usage": round(latest_data[latest_data['indicator_code']=='USG_DIGITAL_PAYMENT']['value_numeric'].mean(),2)
+        "Account Ownership": rounded(_latest_value(views, 'ACC_OWNERSHIP')),
+        "Digital Payment Usage": rounded(_latest_value(views, 'USG_DIGITAL_PAYMENT')),
     }
     # P2P/ATM ratio (example)
-    if 'USG_P2P_COUNT' in latest_data.columns and 'ATM_TRANSACTIONS' in latest_data.columns:
-        p2p = latest_data['USG_P2P_COUNT'].sum()
-        atm = latest_data['ATM_TRANSACTIONS'].sum()
+    p2p = _latest_value(views, 'USG_P2P_COUNT')
+    atm = _latest_value(views, 'ATM_TRANSACTIONS')
+    if p2p is not None and atm is not None:
         kpis["P2P/ATM Ratio"] = round(p2p/atm if atm>0 else 0,2)
     else:
         kpis["P2P/ATM Ratio"] = "N/A"
@@ -79,16 +100,16 @@ def calculate_kpis(data):
 # -----------------------------
 # Overview Page
 # -----------------------------
-def show_overview(data):
+def show_overview(views):
     st.title("📊 Ethiopia Financial Inclusion Overview")
-    kpis = calculate_kpis(data)
+    kpis = calculate_kpis(views)
     col1, col2, col3 = st.columns(3)
     col1.metric("Account Ownership (%)", kpis["Account Ownership"])
     col2.metric("Digital Payment Usage (%)", kpis["Digital Payment Usage"])
     col3.metric("P2P/ATM Ratio", kpis["P2P/ATM Ratio"])
 
     st.markdown("### Historical Trends")
-    df_trend = data.groupby(['year','indicator_code'])['value_numeric'].mean().reset_index()
+    df_trend = views.trend().rename(columns={'value': 'value_numeric'})
     fig = px.line(df_trend, x='year', y='value_numeric', color='indicator_code',
                   markers=True, title="Financial Inclusion Trends (2011-2024)")
     st.plotly_chart(fig, use_container_width=True)
@@ -96,23 +117,28 @@ def show_overview(data):
 # -----------------------------
 # Trends Page
 # -----------------------------
-def show_trends(data):
+def show_trends(views):
     st.title("📈 Historical Trends")
-    indicators = data['indicator_code'].unique()
+    indicators = views.indicators
     selected_indicators = st.multiselect("Select indicators to display", indicators, default=indicators[:2])
 
-    years = st.slider("Select year range", int(data['year'].min()), int(data['year'].max()), (2011, 2024))
-    filtered = data[(data['year']>=years[0]) & (data['year']<=years[1]) & (data['indicator_code'].isin(selected_indicators))]
+    first, last = views.year_range
+    default_start = min(max(first, 2011), last)
+    default_end = max(min(last, 2024), default_start)
+    years = st.slider("Select year range", first, last, (default_start, default_end))
+    filtered = views.trend(selected_indicators, years[0], years[1])
+    filtered = filtered.rename(columns={'value': 'value_numeric'})
+    filtered = downsample_series(
+        filtered, 'year', 'value_numeric', group='indicator_code'
+    )
 
     fig = px.line(filtered, x='year', y='value_numeric', color='indicator_code', markers=True,
                   title="Indicator Trends Over Time")
 
-    # Optional: overlay events if available
-    if 'record_type' in data.columns:
-        events = data[data['record_type']=='event']
-        for idx, row in events.iterrows():
-            fig.add_vline(x=row['observation_date'].year, line_dash="dash", line_color="red",
-                          annotation_text=row['category'], annotation_position="top left")
+    # Overlay events from the prebuilt timeline (one batched layout update)
+    add_event_markers(
+        fig, views.events_between(years[0], years[1]), x='year', label='category'
+    )
     st.plotly_chart(fig, use_container_width=True)
 
 # -----------------------------
@@ -201,7 +227,6 @@ def show_projections(forecasts_long):
     st.plotly_chart(fig, width='stretch')
 
 
-
 # -----------------------------
 # Main
 # -----------------------------
@@ -210,14 +235,14 @@ def main():
     page = st.sidebar.radio("Go to", ["Overview", "Trends", "Forecasts", "Inclusion Projections"])
 
     # Load data
-    data = load_enriched_data()
+    views = load_dashboard_views()
     forecasts = load_forecasts()
 
     # Page routing
     if page=="Overview":
-        show_overview(data)
+        show_overview(views)
     elif page=="Trends":
-        show_trends(data)
+        show_trends(views)
     elif page=="Forecasts":
         show_forecasts(forecasts)
     elif page=="Inclusion Projections":
@@ -0,0 +1,9 @@
+#!/usr/bin/env bash
+# Benchmark every pipeline stage on synthetic data and compare with the
+# stored baseline. Extra arguments are passed through, e.g.
+# `scripts/run_benchmarks.sh --scales 1m 10m` or
+# `scripts/run_benchmarks.sh --save-baseline`.
+set -euo pipefail
+
+cd "$(dirname "$0")/.."
+python -m fi_forecasting.benchmarks "$@"
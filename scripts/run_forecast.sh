@@ -0,0 +1,7 @@
+#!/usr/bin/env bash
+# Build the forecasts and write the output files, reusing cached data
+# stages. Extra arguments are passed through (e.g. `--force baseline`).
+set -euo pipefail
+
+cd "$(dirname "$0")/.."
+python -m fi_forecasting.pipeline baseline intervals scenarios export "$@"
@@ -0,0 +1,8 @@
+#!/usr/bin/env bash
+# Run the full pipeline; stages whose inputs are unchanged are read
+# from data/interim/.pipeline_cache. Extra arguments are passed through,
+# e.g. `scripts/run_pipeline.sh --force` or `scripts/run_pipeline.sh --list`.
+set -euo pipefail
+
+cd "$(dirname "$0")/.."
+python -m fi_forecasting.pipeline "$@"
@@ -0,0 +1,90 @@
+"""
+Command-line entry point: ``python -m fi_forecasting.benchmarks``.
+
+Examples
+--------
+Default scales, recorded to the history and compared with the baseline::
+
+    python -m fi_forecasting.benchmarks
+
+Impact stages at 1M and 10M records, failing on a regression::
+
+    python -m fi_forecasting.benchmarks --scales 1m 10m \\
+        --cases merge_events_impact apply_event_effects --fail-on-regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+
+from fi_forecasting.benchmarks.suite import (
+    append_history,
+    case_names,
+    compare_to_baseline,
+    load_baseline,
+    run_suite,
+    save_baseline,
+)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m fi_forecasting.benchmarks",
+        description="Benchmark the pipeline stages on seeded synthetic data.",
+    )
+    parser.add_argument("--scales", nargs="+",
+                        help="record counts, e.g. 10k 100k 1m 10m")
+    parser.add_argument("--cases", nargs="+", metavar="CASE",
+                        help="cases to time (default: all)")
+    parser.add_argument("--repeat", type=int, default=None, help="timed runs per case")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc run")
+    parser.add_argument("--no-history", action="store_true",
+                        help="do not append to the history")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the baseline")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="exit with status 1 when a case regressed")
+    parser.add_argument("--list", action="store_true", help="print the cases and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(case_names()))
+        return 0
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+
+    run = run_suite(
+        scales=args.scales,
+        cases=args.cases,
+        repeat=args.repeat,
+        track_memory=False if args.no_memory else None,
+    )
+    print(run.to_frame().to_string(index=False))
+
+    if not args.no_history:
+        print(f"\nHistory: {append_history(run)}")
+
+    status = 0
+    baseline = load_baseline()
+    if baseline is not None:
+        comparison = compare_to_baseline(run, baseline)
+        print(f"\nAgainst baseline of {baseline.started_at}:")
+        print(comparison.to_string(index=False))
+        regressed = comparison[comparison["regression"]]
+        if len(regressed):
+            print(f"\n{len(regressed)} regression(s): "
+                  + ", ".join(f"{r.case}@{r.scale}" for r in regressed.itertuples()))
+            status = 1 if args.fail_on_regression else 0
+
+    if args.save_baseline:
+        print(f"\nBaseline: {save_baseline(run)}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
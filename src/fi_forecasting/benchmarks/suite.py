@@ -0,0 +1,523 @@
+from __future__ import annotations
+
+import gc
+import json
+import logging
+import platform
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fi_forecasting.benchmarks.synthetic import (
+    EXCEL_MAX_ROWS,
+    SyntheticSpec,
+    generate_guide,
+    generate_unified,
+    guide_workbook,
+    parse_scale,
+    scale_label,
+    unified_workbook,
+)
+from fi_forecasting.core.settings import settings
+from fi_forecasting.utils.paths import ensure_parent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCALES = ("10k", "100k")
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_SECONDS = 0.05
+DEFAULT_EXCEL_MAX_RECORDS = 100_000
+COMPARISON_COLUMNS = [
+    "seconds",
+    "baseline_seconds",
+    "time_ratio",
+    "peak_mb",
+    "baseline_peak_mb",
+    "memory_ratio",
+    "regression",
+]
+DEFAULT_PATHS = {
+    "workdir": "data/interim/.benchmarks",
+    "history": "reports/benchmarks/history.json",
+    "baseline": "reports/benchmarks/baseline.json",
+}
+
+
+def benchmark_config() -> Dict:
+    """The ``benchmarks`` section of the merged config."""
+    return settings.get("benchmarks", {}) or {}
+
+
+def benchmark_path(name: str) -> Path:
+    """Configured ``workdir``, ``history`` or ``baseline`` path."""
+    return settings.root / benchmark_config().get(name, DEFAULT_PATHS[name])
+
+
+# ---------------------------------------------------------------------
+# Cases
+# ---------------------------------------------------------------------
+
+Context = Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class Case:
+    """
+    One timed step of the suite.
+
+    ``run`` receives the shared context; its result is stored under
+    ``output`` for later cases. ``setup`` runs untimed before the
+    measurements, and a case whose ``requires`` keys are missing from
+    the context (e.g. no workbook above the xlsx limit) is skipped.
+    ``rows`` gives the input size used for the throughput.
+    """
+
+    name: str
+    run: Callable[[Context], Any]
+    rows: Callable[[Context], int]
+    output: Optional[str] = None
+    setup: Optional[Callable[[Context], None]] = None
+    requires: Tuple[str, ...] = ()
+
+
+def _n_records(ctx: Context) -> int:
+    return len(ctx["unified"])
+
+
+def _n_enriched(ctx: Context) -> int:
+    return len(ctx["enriched"])
+
+
+def _load_excel(ctx: Context):
+    from fi_forecasting.data.loaders import load_unified_excel
+
+    return load_unified_excel(use_cache=False, path=ctx["workbook"])
+
+
+def _load_guide(ctx: Context):
+    from fi_forecasting.data.loaders import load_additional_data_guide
+
+    return load_additional_data_guide(path=ctx["guide_workbook"])
+
+
+def _parse_guide(ctx: Context):
+    from fi_forecasting.data.additional_parsers import process_additional_data_points
+
+    return process_additional_data_points(ctx["guide"])
+
+
+def _enrich(ctx: Context):
+    from fi_forecasting.data.enrichers import enrich_dataset
+
+    return enrich_dataset(ctx["unified"], ctx["guide"])
+
+
+def _validate(ctx: Context):
+    from fi_forecasting.data.validation_engine import validate_dataset
+
+    return validate_dataset(ctx["enriched"])
+
+
+def _legacy_validators(ctx: Context):
+    from fi_forecasting.data import validators
+
+    # The legacy record-type check predates indicator_definition records
+    df = ctx["unified"]
+    validators.validate_required_columns(df)
+    validators.validate_record_types(df)
+    validators.validate_non_null_observations(df)
+
+
+def _split_impact(ctx: Context) -> None:
+    df = ctx["enriched"]
+    record_type = df["record_type"].astype(object)
+    ctx["events"] = df[(record_type == "event").to_numpy()]
+    ctx["links"] = df[(record_type == "impact_link").to_numpy()]
+
+
+def _merge(ctx: Context):
+    from fi_forecasting.impact.impact_model import merge_events_impact
+
+    return merge_events_impact(ctx["events"], ctx["links"])
+
+
+def _effects(ctx: Context):
+    from fi_forecasting.impact.impact_model import apply_event_effects
+
+    return apply_event_effects(ctx["merged"])
+
+
+def _matrix(ctx: Context):
+    from fi_forecasting.impact.impact_model import build_event_indicator_matrix
+
+    return build_event_indicator_matrix(ctx["effects"])
+
+
+def _clean(ctx: Context):
+    from fi_forecasting.impact.preprocessing import clean_fi_data
+
+    return clean_fi_data(ctx["enriched"])
+
+
+def _split_observations(ctx: Context) -> None:
+    df = ctx["cleaned"]
+    observed = (df["record_type"].astype(object) == "observation").to_numpy()
+    ctx["observations"] = df[observed]
+
+
+def _transforms(ctx: Context):
+    from fi_forecasting.impact.preprocessing import compute_indicator_transforms
+
+    return compute_indicator_transforms(ctx["observations"], by_year=True)
+
+
+def _panel(ctx: Context):
+    from fi_forecasting.forecasting.forecaster import year_panel
+
+    return year_panel(ctx["observations"])
+
+
+def _forecast(ctx: Context):
+    from fi_forecasting.forecasting.forecaster import forecast_trends
+
+    return forecast_trends(ctx["panel"])
+
+
+def _forecast_detail(ctx: Context):
+    from fi_forecasting.forecasting.forecaster import forecast_trends, year_panel
+
+    keys = ("indicator_code", "region", "gender")
+    panel = year_panel(ctx["observations"], group_cols=keys)
+    return forecast_trends(panel)
+
+
+CASES: Tuple[Case, ...] = (
+    Case("load_unified_excel", _load_excel, _n_records, requires=("workbook",)),
+    Case("load_additional_data_guide", _load_guide,
+         lambda ctx: 4 * ctx["spec"].guide_rows, requires=("guide_workbook",)),
+    Case("parse_guide", _parse_guide, lambda ctx: 4 * ctx["spec"].guide_rows),
+    Case("enrich_dataset", _enrich, _n_records, output="enriched"),
+    Case("validate_dataset", _validate, _n_enriched),
+    Case("validators", _legacy_validators, _n_records),
+    Case("merge_events_impact", _merge, lambda ctx: len(ctx["links"]),
+         output="merged", setup=_split_impact),
+    Case("apply_event_effects", _effects, lambda ctx: len(ctx["merged"]),
+         output="effects"),
+    Case("build_event_indicator_matrix", _matrix, lambda ctx: len(ctx["effects"])),
+    Case("clean_fi_data", _clean, _n_enriched, output="cleaned"),
+    Case("indicator_transforms", _transforms, lambda ctx: len(ctx["observations"]),
+         setup=_split_observations),
+    Case("year_panel", _panel, lambda ctx: len(ctx["observations"]), output="panel"),
+    Case("forecast_trends", _forecast, lambda ctx: ctx["panel"].shape[1]),
+    Case("forecast_trends_detail", _forecast_detail,
+         lambda ctx: len(ctx["observations"])),
+)
+
+
+def case_names() -> List[str]:
+    return [case.name for case in CASES]
+
+
+# ---------------------------------------------------------------------
+# Results
+# ---------------------------------------------------------------------
+
+@dataclass
+class CaseResult:
+    """Timing of one case at one scale; seconds are the best of ``repeat`` runs."""
+
+    case: str
+    scale: str
+    rows: int
+    repeat: int
+    seconds: float
+    mean_seconds: float
+    rows_per_second: float
+    peak_mb: Optional[float] = None
+
+
+@dataclass
+class BenchmarkRun:
+    """Results of one suite run plus the environment it ran in."""
+
+    started_at: str
+    environment: Dict[str, str]
+    settings: Dict[str, Any]
+    results: List[CaseResult] = field(default_factory=list)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame([asdict(r) for r in self.results])
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "BenchmarkRun":
+        results = [CaseResult(**r) for r in data.get("results", [])]
+        return cls(
+            data["started_at"],
+            data.get("environment", {}),
+            data.get("settings", {}),
+            results,
+        )
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+# ---------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------
+
+def _measure(
+    case: Case, ctx: Context, repeat: int, track_memory: bool
+) -> Tuple[Any, List[float], Optional[float]]:
+    times, result = [], None
+    for _ in range(repeat):
+        result = None      # drop the previous output before the next run
+        gc.collect()
+        start = time.perf_counter()
+        result = case.run(ctx)
+        times.append(time.perf_counter() - start)
+
+    peak = None
+    if track_memory:
+        # Separate run: tracemalloc slows allocation-heavy code down
+        result = None
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = case.run(ctx)
+            peak = tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+    return result, times, peak
+
+
+def _context(spec: SyntheticSpec, excel_max_records: int, workdir: Path) -> Context:
+    ctx: Context = {
+        "spec": spec,
+        "unified": generate_unified(spec),
+        "guide": generate_guide(spec),
+    }
+    ctx["guide_workbook"] = guide_workbook(spec, workdir, guide=ctx["guide"])
+    # xlsx sheets cap out near 1M rows and writing them is slow, so the
+    # Excel load is only timed up to excel_max_records
+    if spec.n_records <= min(excel_max_records, EXCEL_MAX_ROWS - 1):
+        ctx["workbook"] = unified_workbook(spec, workdir, df=ctx["unified"])
+    else:
+        logger.info("%s records: above excel_max_records, skipping load_unified_excel",
+                    scale_label(spec.n_records))
+    return ctx
+
+
+def run_suite(
+    scales: Optional[Sequence] = None,
+    cases: Optional[Iterable[str]] = None,
+    repeat: Optional[int] = None,
+    track_memory: Optional[bool] = None,
+    spec_overrides: Optional[Dict] = None,
+) -> BenchmarkRun:
+    """
+    Run the benchmark cases on synthetic data at each scale.
+
+    Every scale generates its dataset once (``SyntheticSpec.from_config``)
+    and runs the cases in pipeline order, each on the previous cases'
+    outputs, so the suite covers load -> parse -> enrich -> validate ->
+    impact -> preprocessing -> forecasting. Each case is timed ``repeat``
+    times and, with ``track_memory``, run once more under tracemalloc
+    for its peak allocation.
+
+    Parameters
+    ----------
+    scales : sequence of int or str, optional
+        Record counts such as ``"10k"`` or ``1_000_000`` (default
+        ``benchmarks.scales``).
+    cases : iterable of str, optional
+        Case names to time (default: all). Cases whose outputs later
+        selected cases need still run, untimed.
+    repeat, track_memory : optional
+        Override ``benchmarks.repeat`` / ``benchmarks.track_memory``.
+    spec_overrides : dict, optional
+        ``SyntheticSpec`` fields to override at every scale.
+
+    Returns
+    -------
+    BenchmarkRun
+    """
+    cfg = benchmark_config()
+    scales = [parse_scale(s) for s in (scales or cfg.get("scales", DEFAULT_SCALES))]
+    repeat = max(1, int(repeat or cfg.get("repeat", DEFAULT_REPEAT)))
+    if track_memory is None:
+        track_memory = cfg.get("track_memory", True)
+    excel_max = int(cfg.get("excel_max_records", DEFAULT_EXCEL_MAX_RECORDS))
+
+    selected = set(case_names() if cases is None else cases)
+    unknown = selected - set(case_names())
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {sorted(unknown)}")
+
+    run = BenchmarkRun(
+        started_at=datetime.now().isoformat(timespec="seconds"),
+        environment=environment(),
+        settings={
+            "repeat": repeat,
+            "track_memory": track_memory,
+            "scales": [scale_label(n) for n in scales],
+        },
+    )
+
+    for n_records in scales:
+        spec = SyntheticSpec.from_config(n_records, **(spec_overrides or {}))
+        label = scale_label(n_records)
+        logger.info("Benchmark scale %s: %s", label, spec.counts)
+        ctx = _context(spec, excel_max, benchmark_path("workdir"))
+
+        for case in CASES:
+            if any(key not in ctx for key in case.requires):
+                continue
+            if case.setup is not None:
+                case.setup(ctx)
+            if case.name not in selected:
+                if case.output:
+                    ctx[case.output] = case.run(ctx)
+                continue
+
+            result, times, peak = _measure(case, ctx, repeat, track_memory)
+            if case.output:
+                ctx[case.output] = result
+            rows = int(case.rows(ctx))
+            best = min(times)
+            run.results.append(
+                CaseResult(
+                    case=case.name,
+                    scale=label,
+                    rows=rows,
+                    repeat=repeat,
+                    seconds=best,
+                    mean_seconds=statistics.fmean(times),
+                    rows_per_second=rows / best if best > 0 else float("inf"),
+                    peak_mb=peak,
+                )
+            )
+            logger.info("%-30s %6s %9.4fs %12.0f rows/s%s", case.name, label, best,
+                        rows / best if best > 0 else float("inf"),
+                        f" {peak:9.1f} MB" if peak is not None else "")
+        del ctx
+        gc.collect()
+    return run
+
+
+# ---------------------------------------------------------------------
+# History and baseline
+# ---------------------------------------------------------------------
+
+def _write_json(path: Path, payload) -> Path:
+    path = ensure_parent(Path(path))
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    tmp.replace(path)
+    return path
+
+
+def load_history(path: Optional[Path] = None) -> List[BenchmarkRun]:
+    """Runs recorded by ``append_history`` (oldest first)."""
+    path = Path(path or benchmark_path("history"))
+    if not path.exists():
+        return []
+    runs = json.loads(path.read_text(encoding="utf-8"))
+    return [BenchmarkRun.from_dict(d) for d in runs]
+
+
+def append_history(run: BenchmarkRun, path: Optional[Path] = None) -> Path:
+    """Append ``run`` to the JSON history file."""
+    path = Path(path or benchmark_path("history"))
+    runs = [r.to_dict() for r in load_history(path)] + [run.to_dict()]
+    return _write_json(path, runs)
+
+
+def history_frame(path: Optional[Path] = None) -> pd.DataFrame:
+    """Every recorded result, one row per run x case x scale."""
+    frames = [r.to_frame().assign(started_at=r.started_at) for r in load_history(path)]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def save_baseline(run: BenchmarkRun, path: Optional[Path] = None) -> Path:
+    return _write_json(Path(path or benchmark_path("baseline")), run.to_dict())
+
+
+def load_baseline(path: Optional[Path] = None) -> Optional[BenchmarkRun]:
+    path = Path(path or benchmark_path("baseline"))
+    if not path.exists():
+        return None
+    return BenchmarkRun.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+def compare_to_baseline(
+    run: BenchmarkRun,
+    baseline: BenchmarkRun,
+    threshold: Optional[float] = None,
+    memory_threshold: Optional[float] = None,
+    min_seconds: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Compare ``run`` with ``baseline`` case by case.
+
+    A case regresses when its best time exceeds the baseline's by more
+    than ``threshold`` (a fraction, default ``benchmarks.threshold``)
+    or its peak memory by more than ``memory_threshold``. Cases faster
+    than ``min_seconds`` in both runs are too noisy for the time check.
+
+    Returns
+    -------
+    pd.DataFrame
+        case, scale, seconds, baseline_seconds, time_ratio, peak_mb,
+        baseline_peak_mb, memory_ratio, regression; only cases present
+        in both runs.
+    """
+    cfg = benchmark_config()
+    if threshold is None:
+        threshold = cfg.get("threshold", DEFAULT_THRESHOLD)
+    threshold = float(threshold)
+    if memory_threshold is None:
+        memory_threshold = cfg.get("memory_threshold", threshold)
+    memory_threshold = float(memory_threshold)
+    if min_seconds is None:
+        min_seconds = cfg.get("min_seconds", DEFAULT_MIN_SECONDS)
+    min_seconds = float(min_seconds)
+
+    keys = ["case", "scale"]
+    current = run.to_frame()
+    reference = baseline.to_frame()
+    if current.empty or reference.empty:
+        return pd.DataFrame(columns=keys + COMPARISON_COLUMNS)
+
+    out = current[keys + ["seconds", "peak_mb"]].merge(
+        reference[keys + ["seconds", "peak_mb"]].rename(
+            columns={"seconds": "baseline_seconds", "peak_mb": "baseline_peak_mb"}
+        ),
+        on=keys,
+    )
+    out["time_ratio"] = out["seconds"] / out["baseline_seconds"]
+    peak = pd.to_numeric(out["peak_mb"], errors="coerce")
+    out["memory_ratio"] = peak / pd.to_numeric(out["baseline_peak_mb"], errors="coerce")
+    timed = out[["seconds", "baseline_seconds"]].max(axis=1) >= min_seconds
+    slower = timed & (out["time_ratio"] > 1 + threshold)
+    larger = out["memory_ratio"].gt(1 + memory_threshold).fillna(False).astype(bool)
+    out["regression"] = slower | larger
+    return out[keys + COMPARISON_COLUMNS]
@@ -0,0 +1,527 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from fi_forecasting.core.settings import settings
+from fi_forecasting.data.additional_parsers import SHEET_LAYOUTS
+from fi_forecasting.data.loaders import GUIDE_SHEETS
+from fi_forecasting.data.validators import REQUIRED_COLUMNS
+from fi_forecasting.impact.lag_models import events_config, evidence_weights
+from fi_forecasting.utils.paths import ensure_parent
+
+logger = logging.getLogger(__name__)
+
+# Rows per xlsx sheet, including the header row
+EXCEL_MAX_ROWS = 1_048_576
+
+PILLARS = {"ACCESS": "ACC", "USAGE": "USG", "QUALITY": "QLT", "GENDER": "GEN"}
+GENDERS = ("all", "male", "female")
+LOCATIONS = ("national", "urban", "rural")
+CONFIDENCE = ("high", "medium", "low")
+SOURCES = (
+    "Global Findex",
+    "National Bank of Ethiopia",
+    "GSMA",
+    "ITU",
+    "Ethio Telecom",
+    "Safaricom",
+)
+EVENT_CATEGORIES = (
+    "policy",
+    "product_launch",
+    "infrastructure",
+    "market_entry",
+    "partnership",
+    "milestone",
+)
+MAGNITUDES = ("low", "medium", "high")
+LAG_MONTHS = (0, 3, 6, 12, 18, 24, 36)
+
+EXTRA_COLUMNS = [
+    "gender",
+    "location",
+    "region",
+    "unit",
+    "source_type",
+    "event_date",
+    "related_indicator",
+    "relationship_type",
+    "impact_direction",
+    "impact_magnitude",
+    "impact_estimate",
+    "lag_months",
+    "evidence_basis",
+]
+
+
+def synthetic_config() -> Dict:
+    """The ``benchmarks.synthetic`` section of the merged config."""
+    return (settings.get("benchmarks", {}) or {}).get("synthetic", {}) or {}
+
+
+def parse_scale(scale) -> int:
+    """Record count of a scale label: ``10000``, ``"10k"``, ``"1.5m"``."""
+    if isinstance(scale, (int, np.integer)):
+        return int(scale)
+    text = str(scale).strip().lower().replace("_", "")
+    factor = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    number = text[:-1] if factor > 1 else text
+    try:
+        return int(float(number) * factor)
+    except ValueError:
+        raise ValueError(f"Invalid scale: {scale!r}") from None
+
+
+def scale_label(n_records: int) -> str:
+    """Short label of a record count: 10000 -> ``"10k"``."""
+    for suffix, factor in (("m", 1_000_000), ("k", 1_000)):
+        if n_records >= factor and n_records % factor == 0:
+            return f"{n_records // factor}{suffix}"
+    return str(n_records)
+
+
+# ---------------------------------------------------------------------
+# Specification
+# ---------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """
+    Shape of a synthetic unified dataset.
+
+    ``n_records`` counts every record type; events, impact links and
+    targets take the configured shares and observations the rest. The
+    same spec and ``seed`` always produce the same data.
+    """
+
+    n_records: int = 10_000
+    n_indicators: int = 120
+    n_regions: int = 11
+    start_year: int = 2011
+    end_year: int = 2024
+    event_share: float = 0.002
+    links_per_event: int = 5
+    target_share: float = 0.005
+    guide_rows: int = 200
+    seed: int = 42
+
+    @classmethod
+    def from_config(cls, n_records: int, **overrides) -> "SyntheticSpec":
+        """Spec for ``n_records`` with ``benchmarks.synthetic`` and ``seed`` applied."""
+        known = {f.name for f in fields(cls)}
+        cfg = {k: v for k, v in synthetic_config().items() if k in known}
+        seed = (settings.get("benchmarks", {}) or {}).get("seed")
+        if seed is not None:
+            cfg.setdefault("seed", seed)
+        return cls(**{**cfg, **overrides, "n_records": int(n_records)})
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """Records per record type."""
+        events = max(1, int(round(self.n_records * self.event_share)))
+        links = events * self.links_per_event
+        targets = max(1, int(round(self.n_records * self.target_share)))
+        observations = self.n_records - events - links - targets
+        if observations < 1:
+            raise ValueError(
+                f"{self.n_records} record(s) leave no room for observations "
+                f"({events} events, {links} links, {targets} targets)"
+            )
+        return {
+            "observation": observations,
+            "target": targets,
+            "event": events,
+            "impact_link": links,
+        }
+
+    def digest(self) -> str:
+        """Short content hash, used to name cached workbooks."""
+        payload = json.dumps(asdict(self), sort_keys=True).encode()
+        return hashlib.sha256(payload).hexdigest()[:12]
+
+
+# ---------------------------------------------------------------------
+# Unified dataset
+# ---------------------------------------------------------------------
+
+def _categorical(codes: np.ndarray, categories: Sequence) -> pd.Categorical:
+    """Categorical from integer codes (-1 is missing)."""
+    return pd.Categorical.from_codes(
+        np.asarray(codes, dtype=np.int32), categories=list(categories)
+    )
+
+
+def _ids(prefix: str, n: int, width: int) -> pd.Series:
+    return prefix + pd.Series(np.arange(1, n + 1)).astype(str).str.zfill(width)
+
+
+def _random_dates(rng: np.random.Generator, years: np.ndarray) -> np.ndarray:
+    """A random day within each of ``years``."""
+    starts = (years - 1970).astype("datetime64[Y]").astype("datetime64[D]")
+    return starts + rng.integers(0, 365, size=len(years)).astype("timedelta64[D]")
+
+
+def _codes(
+    rng: np.random.Generator, n: int, k: int, p: Optional[Sequence[float]] = None
+) -> np.ndarray:
+    return rng.choice(k, size=n, p=p).astype(np.int32)
+
+
+def indicator_catalog(spec: SyntheticSpec) -> pd.DataFrame:
+    """
+    Indicators of a spec with the trend their observations follow.
+
+    Columns: indicator_code, indicator, pillar, level, slope.
+    """
+    rng = np.random.default_rng([spec.seed, 0])
+    pillars = list(PILLARS)
+    pillar = np.arange(spec.n_indicators) % len(pillars)
+    codes = [f"{PILLARS[pillars[p]]}_{i:04d}" for i, p in enumerate(pillar)]
+    return pd.DataFrame(
+        {
+            "indicator_code": codes,
+            "indicator": [
+                f"Synthetic {pillars[p].title()} Indicator {i}"
+                for i, p in enumerate(pillar)
+            ],
+            "pillar": [pillars[p] for p in pillar],
+            "level": rng.uniform(5.0, 60.0, spec.n_indicators),
+            "slope": rng.uniform(-0.5, 3.0, spec.n_indicators),
+        }
+    )
+
+
+def generate_unified(spec: SyntheticSpec) -> pd.DataFrame:
+    """
+    Seeded synthetic unified dataset.
+
+    Has every column of ``validators.REQUIRED_COLUMNS`` plus the
+    disaggregation (gender, location, region) and impact-link columns
+    the impact and forecasting code reads. Rows are ordered
+    observations, targets, events, impact links (the order
+    ``load_unified_excel`` concatenates the main and impact sheets in).
+    Observations follow a per-indicator linear trend with noise, so the
+    forecasting stages fit meaningful series; every impact link points
+    at an existing event and indicator.
+
+    Low-cardinality text columns are categorical and dates are
+    ``datetime64``, as in the compact frame ``load_unified_excel``
+    returns, which keeps 10M-record datasets within a few GB.
+    """
+    rng = np.random.default_rng(spec.seed)
+    counts = spec.counts
+    n = spec.n_records
+    n_obs, n_tgt, n_evt, n_lnk = (
+        counts[k] for k in ("observation", "target", "event", "impact_link")
+    )
+    fact_rows = n_obs + n_tgt  # observations and targets share the indicator columns
+    evt0, lnk0 = fact_rows, fact_rows + n_evt
+
+    catalog = indicator_catalog(spec)
+    regions = [f"REGION_{i:02d}" for i in range(1, spec.n_regions + 1)]
+    categories = list(events_config().get("categories") or EVENT_CATEGORIES)
+    evidence = list(evidence_weights()) or ["empirical"]
+
+    # -------------------------
+    # Observations and targets
+    # -------------------------
+    indicator = rng.integers(0, spec.n_indicators, size=fact_rows)
+    years = np.concatenate([
+        rng.integers(spec.start_year, spec.end_year + 1, size=n_obs),
+        rng.integers(spec.end_year + 1, spec.end_year + 7, size=n_tgt),
+    ])
+    level = catalog["level"].to_numpy()[indicator]
+    slope = catalog["slope"].to_numpy()[indicator]
+    values = level + slope * (years - spec.start_year) + rng.normal(0.0, 1.5, fact_rows)
+
+    # -------------------------
+    # Events and impact links
+    # -------------------------
+    event_years = rng.integers(spec.start_year, spec.end_year + 1, size=n_evt)
+    event_dates = _random_dates(rng, event_years)
+    parent = np.sort(rng.integers(0, n_evt, size=n_lnk))
+    related = rng.integers(0, spec.n_indicators, size=n_lnk)
+
+    # -------------------------
+    # Assemble column by column
+    # -------------------------
+    record_type = np.repeat(
+        np.arange(4, dtype=np.int32), [n_obs, n_tgt, n_evt, n_lnk]
+    )
+    dates = np.empty(n, dtype="datetime64[D]")
+    dates[:fact_rows] = _random_dates(rng, years)
+    dates[evt0:lnk0] = event_dates
+    dates[lnk0:] = event_dates[parent]
+
+    event_ids = _ids("EVT_", n_evt, 7)
+    record_id = pd.concat(
+        [_ids("REC_", fact_rows, 9), event_ids, _ids("IMP_", n_lnk, 9)],
+        ignore_index=True,
+    )
+
+    pillar_index = {p: i for i, p in enumerate(PILLARS)}
+    pillar_of = catalog["pillar"].map(pillar_index).to_numpy(dtype=np.int32)
+    pillar = np.full(n, -1, dtype=np.int32)
+    pillar[:fact_rows] = pillar_of[indicator]
+    pillar[lnk0:] = pillar_of[related]
+
+    # indicator / indicator_code categories: catalog, then one per event
+    ind_codes = np.full(n, -1, dtype=np.int32)
+    ind_codes[:fact_rows] = indicator
+    ind_codes[evt0:lnk0] = spec.n_indicators + np.arange(n_evt)
+    code_categories = catalog["indicator_code"].tolist() + event_ids.tolist()
+    event_names = [f"Synthetic Event {i + 1}" for i in range(n_evt)]
+    name_categories = catalog["indicator"].tolist() + event_names
+
+    value_numeric = np.full(n, np.nan)
+    value_numeric[:fact_rows] = values
+    impact_estimate = np.full(n, np.nan)
+    impact_estimate[lnk0:] = rng.uniform(1.0, 25.0, n_lnk)
+    value_numeric[lnk0:] = impact_estimate[lnk0:]
+    lag = np.full(n, np.nan)
+    lag_choice = _codes(rng, n_lnk, len(LAG_MONTHS))
+    lag[lnk0:] = np.asarray(LAG_MONTHS, dtype=float)[lag_choice]
+
+    category = np.full(n, -1, dtype=np.int32)
+    category[evt0:lnk0] = _codes(rng, n_evt, len(categories))
+
+    parent_id = np.full(n, -1, dtype=np.int32)
+    parent_id[lnk0:] = parent
+
+    def links_only(codes: np.ndarray) -> np.ndarray:
+        out = np.full(n, -1, dtype=np.int32)
+        out[lnk0:] = codes
+        return out
+
+    related_indicator = links_only(related)
+    source = _codes(rng, n, len(SOURCES))
+    text = np.where(rng.random(n) < 0.3, _codes(rng, n, 3), -1)
+    event_date = np.where(record_type == 2, dates, np.datetime64("NaT"))
+
+    df = pd.DataFrame(
+        {
+            "record_id": record_id,
+            "record_type": _categorical(
+                record_type, ["observation", "target", "event", "impact_link"]
+            ),
+            "pillar": _categorical(pillar, list(PILLARS)),
+            "indicator": _categorical(ind_codes, name_categories),
+            "indicator_code": _categorical(ind_codes, code_categories),
+            "value_numeric": value_numeric,
+            "observation_date": dates.astype("datetime64[ns]"),
+            "category": _categorical(category, categories),
+            "parent_id": _categorical(parent_id, event_ids.tolist()),
+            "source_name": _categorical(source, SOURCES),
+            "source_url": _categorical(
+                source, [f"https://example.org/{i}" for i in range(len(SOURCES))]
+            ),
+            "confidence": _categorical(
+                _codes(rng, n, 3, p=[0.5, 0.35, 0.15]), CONFIDENCE
+            ),
+            "original_text": _categorical(
+                text, ["Baseline year", "Survey estimate", "Operator report"]
+            ),
+            "collected_by": _categorical(np.zeros(n), ["Synthetic"]),
+            "collection_date": np.full(n, np.datetime64("2025-01-20", "ns")),
+            "notes": _categorical(np.full(n, -1), ["-"]),
+            "gender": _categorical(_codes(rng, n, 3, p=[0.6, 0.2, 0.2]), GENDERS),
+            "location": _categorical(_codes(rng, n, 3, p=[0.6, 0.2, 0.2]), LOCATIONS),
+            "region": _categorical(_codes(rng, n, len(regions)), regions),
+            "unit": _categorical(np.zeros(n), ["%"]),
+            "source_type": _categorical(
+                source % 3, ["survey", "regulator", "operator"]
+            ),
+            "event_date": event_date.astype("datetime64[ns]"),
+            "related_indicator": _categorical(
+                related_indicator, catalog["indicator_code"].tolist()
+            ),
+            "relationship_type": _categorical(
+                links_only(_codes(rng, n_lnk, 2, p=[0.7, 0.3])), ["direct", "indirect"]
+            ),
+            "impact_direction": _categorical(
+                links_only(_codes(rng, n_lnk, 2, p=[0.8, 0.2])),
+                ["increase", "decrease"],
+            ),
+            "impact_magnitude": _categorical(
+                links_only(_codes(rng, n_lnk, len(MAGNITUDES))), MAGNITUDES
+            ),
+            "impact_estimate": impact_estimate,
+            "lag_months": lag,
+            "evidence_basis": _categorical(
+                links_only(_codes(rng, n_lnk, len(evidence))), evidence
+            ),
+        },
+        columns=REQUIRED_COLUMNS + EXTRA_COLUMNS,
+    )
+    logger.debug("Generated %d synthetic record(s): %s", n, counts)
+    return df
+
+
+# ---------------------------------------------------------------------
+# Additional Data Points Guide
+# ---------------------------------------------------------------------
+
+_GUIDE_WIDTH = 7
+_GUIDE_TITLES = {
+    "alternative_baselines": "A. Alternative Baselines",
+    "direct_correlation": "B. Direct Correlation",
+    "indirect_correlation": "C. Indirect Correlation",
+    "market_nuances": "D. Market Nuances",
+}
+_NAME_STEMS = {
+    "alternative_baselines": ("Survey", "Operator dataset", "Regulator bulletin"),
+    "direct_correlation": (
+        "Agent network density",
+        "Account opening volume",
+        "P2P transfer value",
+    ),
+    "indirect_correlation": (
+        "Smartphone penetration",
+        "Agent liquidity",
+        "Electricity access",
+    ),
+    "market_nuances": ("Interoperability", "Cash preference", "Trust in agents"),
+}
+
+
+def _guide_sheet(rng: np.random.Generator, sheet: str, n_rows: int) -> pd.DataFrame:
+    start_row, name_col = SHEET_LAYOUTS[sheet]
+    stems = _NAME_STEMS[sheet]
+    body = np.full((n_rows, _GUIDE_WIDTH), None, dtype=object)
+    body[:, name_col] = [f"{stems[i % len(stems)]} {i + 1}" for i in range(n_rows)]
+    for col in range(name_col + 1, _GUIDE_WIDTH):
+        body[:, col] = [f"{sheet} note {col}.{i % 17}" for i in range(n_rows)]
+    if sheet.endswith("_correlation"):
+        body[:, 2] = np.where(rng.random(n_rows) < 0.7, "positive", "negative")
+
+    # A few rows the parsers reject: blank, too short, not text
+    bad = rng.random(n_rows) < 0.05
+    body[bad, name_col] = rng.choice(
+        np.array([None, "x", 12345], dtype=object), size=int(bad.sum())
+    )
+
+    preamble = np.full((start_row, _GUIDE_WIDTH), None, dtype=object)
+    preamble[0, 0] = "Synthetic guide for benchmarking"
+    columns = [_GUIDE_TITLES[sheet]] + [f"Unnamed: {i}" for i in range(1, _GUIDE_WIDTH)]
+    return pd.DataFrame(np.vstack([preamble, body]), columns=columns)
+
+
+def generate_guide(spec: SyntheticSpec) -> Dict[str, pd.DataFrame]:
+    """
+    Synthetic Additional Data Points Guide, keyed like
+    ``load_additional_data_guide``.
+
+    Each sheet mirrors its ``SHEET_LAYOUTS`` entry (a preamble of
+    ``start_row`` rows, the name column, the detail columns) with
+    ``spec.guide_rows`` body rows, about 5% of which the parsers reject.
+    """
+    rng = np.random.default_rng([spec.seed, 1])
+    return {sheet: _guide_sheet(rng, sheet, spec.guide_rows) for sheet in GUIDE_SHEETS}
+
+
+# ---------------------------------------------------------------------
+# Workbooks
+# ---------------------------------------------------------------------
+
+def _excel_frame(df: pd.DataFrame) -> pd.DataFrame:
+    return df.astype(
+        {c: object for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)}
+    )
+
+
+def write_unified_workbook(
+    df: pd.DataFrame,
+    path: Path,
+    main_sheet: Optional[str] = None,
+    impact_sheet: Optional[str] = None,
+) -> Path:
+    """
+    Write a unified dataset as ``load_unified_excel`` expects it:
+    impact links on the impact sheet, everything else on the main sheet
+    (sheet names default to ``datasets.unified_excel``).
+
+    Raises
+    ------
+    ValueError
+        If a sheet would exceed the xlsx row limit.
+    """
+    cfg = settings.get("datasets", {}).get("unified_excel", {})
+    main_sheet = main_sheet or cfg.get("main_sheet", "ethiopia_fi_unified_data")
+    impact_sheet = impact_sheet or cfg.get("impact_sheet", "Impact_sheet")
+
+    is_link = (df["record_type"].astype(object) == "impact_link").to_numpy()
+    parts = {main_sheet: df[~is_link], impact_sheet: df[is_link]}
+    too_large = {
+        name: len(part) for name, part in parts.items() if len(part) >= EXCEL_MAX_ROWS
+    }
+    if too_large:
+        raise ValueError(
+            f"Sheets exceed the xlsx row limit ({EXCEL_MAX_ROWS - 1} rows): {too_large}"
+        )
+
+    path = ensure_parent(Path(path))
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for name, part in parts.items():
+            _excel_frame(part).to_excel(writer, sheet_name=name, index=False)
+    return path
+
+
+def write_guide_workbook(sheets: Dict[str, pd.DataFrame], path: Path) -> Path:
+    """Write guide sheets in ``GUIDE_SHEETS`` order (they are read by position)."""
+    path = ensure_parent(Path(path))
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for name in GUIDE_SHEETS:
+            sheets[name].to_excel(writer, sheet_name=name[:31], index=False)
+    return path
+
+
+def _cached_workbook(path: Path, write: Callable[[Path], Path]) -> Path:
+    if not path.exists():
+        logger.info("Writing synthetic workbook %s", path.name)
+        tmp = path.with_name(f"{path.stem}.tmp{path.suffix}")
+        write(tmp)
+        tmp.replace(path)
+    return path
+
+
+def unified_workbook(
+    spec: SyntheticSpec, directory: Path, df: Optional[pd.DataFrame] = None
+) -> Path:
+    """
+    Unified workbook of ``spec`` under ``directory``.
+
+    Named after ``spec.digest()`` and reused when present, since writing
+    a large xlsx takes far longer than reading it. Pass ``df`` when the
+    dataset has already been generated.
+    """
+    name = f"unified_{scale_label(spec.n_records)}_{spec.digest()}.xlsx"
+    path = Path(directory) / name
+    return _cached_workbook(
+        path,
+        lambda tmp: write_unified_workbook(
+            generate_unified(spec) if df is None else df, tmp
+        ),
+    )
+
+
+def guide_workbook(
+    spec: SyntheticSpec,
+    directory: Path,
+    guide: Optional[Dict[str, pd.DataFrame]] = None,
+) -> Path:
+    """Guide workbook of ``spec`` under ``directory``, cached like the unified one."""
+    path = Path(directory) / f"guide_{spec.guide_rows}_{spec.seed}.xlsx"
+    return _cached_workbook(
+        path,
+        lambda tmp: write_guide_workbook(
+            generate_guide(spec) if guide is None else guide, tmp
+        ),
+    )
@@ -1,7 +1,7 @@
 from pathlib import Path
-from typing import Dict
+from threading import Lock
+from typing import Dict, Optional, Tuple
 import logging
-import yaml
 
 from fi_forecasting.core.project_root import get_project_root
 
@@ -13,6 +13,8 @@ logger = logging.getLogger(__name__)
 
 
 def _load_yaml(path: Path) -> Dict:
+    import yaml  # deferred: only needed once config is first read
+
     try:
         with path.open("r", encoding="utf-8") as f:
             data = yaml.safe_load(f) or {}
@@ -46,14 +48,42 @@ def _deep_merge(d1: Dict, d2: Dict) -> Dict:
 # Load all YAML configs from config/
 # -------------------------
 
+# config_dir -> (file signature, merged config)
+_CONFIG_CACHE: Dict[Path, Tuple[Tuple, Dict]] = {}
+_CONFIG_LOCK = Lock()
 
-def load_config(config_dir: Path = None) -> Dict:
-    root = get_project_root()
-    config_dir = config_dir or (root / "config")
 
-    merged: Dict = {}
+def _config_signature(config_dir: Path) -> Tuple:
+    signature = []
     for path in sorted(config_dir.glob("*.yaml")):
-        merged = _deep_merge(merged, _load_yaml(path))
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        signature.append((path.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def load_config(config_dir: Path = None) -> Dict:
+    """
+    Deep-merge every YAML file in ``config_dir`` (sorted by name).
+
+    The merged result is cached per directory and revalidated against
+    the files' mtimes and sizes, so repeated calls only stat the files.
+    The returned dict is shared; treat it as read-only.
+    """
+    config_dir = (config_dir or (get_project_root() / "config")).resolve()
+    signature = _config_signature(config_dir)
+
+    cached = _CONFIG_CACHE.get(config_dir)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with _CONFIG_LOCK:
+        merged: Dict = {}
+        for name, _, _ in signature:
+            merged = _deep_merge(merged, _load_yaml(config_dir / name))
+        _CONFIG_CACHE[config_dir] = (signature, merged)
 
     return merged
 
@@ -63,7 +93,16 @@ def load_config(config_dir: Path = None) -> Dict:
 
 
 class PathRegistry:
-    def __init__(self, root: Path, config: Dict, create_dirs: bool = True):
+    """
+    Resolved project paths from the ``paths`` config section.
+
+    Paths are only resolved here; directories are created on demand via
+    ``ensure`` (or ``fi_forecasting.utils.paths.ensure_parent``) by code
+    that actually writes to them. Pass ``create_dirs=True`` to create
+    every configured directory up front.
+    """
+
+    def __init__(self, root: Path, config: Dict, create_dirs: bool = False):
         self.root = root.resolve()
         self._paths: Dict[str, Dict[str, Path]] = {}
         # Get the paths dict, default to empty if not found
@@ -72,7 +111,7 @@ class PathRegistry:
         for section, mapping in paths_cfg.items():
             resolved: Dict[str, Path] = {}
             for key, rel_path in mapping.items():
-                path = (self.root / rel_path).resolve()
+                path = self.root / rel_path
                 if create_dirs:
                     path.mkdir(parents=True, exist_ok=True)
                 resolved[key] = path
@@ -91,6 +130,12 @@ class PathRegistry:
         if name.lower() in self._paths:
             return self._paths[name.lower()]
         raise AttributeError(f"'PathRegistry' has no attribute '{name}'")
+
+    def ensure(self, section: str, key: str) -> Path:
+        """Return the configured directory, creating it if needed."""
+        path = self[section][key]
+        path.mkdir(parents=True, exist_ok=True)
+        return path
 # -------------------------
 # Central settings
 # -------------------------
@@ -100,17 +145,57 @@ class Settings:
     """
     Central runtime settings object.
     Access YAML configs via settings.CONFIG and paths via settings.paths.
+
+    The merged config is read through ``load_config`` on access, so edits
+    to ``config/*.yaml`` are picked up without rebuilding the object.
     """
 
-    def __init__(self, root: Path = None, create_dirs: bool = True):
+    def __init__(self, root: Path = None, create_dirs: bool = False):
         self.root = root.resolve() if root else get_project_root()
-        self.config: Dict = load_config(config_dir=self.root / "config")
-        self.paths: PathRegistry = PathRegistry(
-            self.root, self.config, create_dirs)
+        self._create_dirs = create_dirs
+        self._paths: Optional[PathRegistry] = None
+        self._paths_config: Optional[Dict] = None
+
+    @property
+    def config(self) -> Dict:
+        return load_config(config_dir=self.root / "config")
+
+    @property
+    def paths(self) -> PathRegistry:
+        config = self.config
+        if self._paths is None or self._paths_config is not config:
+            self._paths = PathRegistry(self.root, config, self._create_dirs)
+            self._paths_config = config
+        return self._paths
 
     def get(self, section: str, default=None):
         return self.config.get(section, default)
 
 
-# Singleton instance
-settings = Settings()
+_settings: Optional[Settings] = None
+_SETTINGS_LOCK = Lock()
+
+
+def get_settings() -> Settings:
+    """Return the process-wide ``Settings``, creating it on first use."""
+    global _settings
+    if _settings is None:
+        with _SETTINGS_LOCK:
+            if _settings is None:
+                _settings = Settings()
+    return _settings
+
+
+class _LazySettings:
+    """Proxy that defers building ``Settings`` until first attribute access."""
+
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+
+    def __repr__(self) -> str:
+        state = "unresolved" if _settings is None else repr(_settings)
+        return f"<lazy settings: {state}>"
+
+
+# Singleton instance (resolved lazily)
+settings = _LazySettings()
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fi_forecasting.dashboard.views import dashboard_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_POINTS = 1000
+DEFAULT_MAX_EVENT_MARKERS = 40
+EVENT_LINE = {"color": "red", "dash": "dash", "width": 1}
+
+
+def _as_numeric(x: pd.Series) -> np.ndarray:
+    """Numeric x values (datetimes as int64 nanoseconds)."""
+    if pd.api.types.is_datetime64_any_dtype(x):
+        return x.to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(float)
+    return pd.to_numeric(x, errors="coerce").to_numpy(dtype=float)
+
+
+# ---------------------------------------------------------------------
+# Downsampling
+# ---------------------------------------------------------------------
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last point and, from each of ``n_out - 2``
+    equal-count buckets, the point forming the largest triangle with the
+    previously kept point and the mean of the next bucket, which
+    preserves peaks and troughs much better than striding.
+
+    Parameters
+    ----------
+    x, y : np.ndarray
+        Points sorted by ``x``, without NaN.
+    n_out : int
+        Number of points to keep (at least 3 to downsample).
+
+    Returns
+    -------
+    np.ndarray
+        Sorted positions of the kept points.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)   # bucket bounds
+    # Mean of each bucket (plus the last point as the final "next bucket")
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        cx, cy = avg_x[b + 1], avg_y[b + 1]
+        area = np.abs(
+            (x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        kept[b + 1] = a
+    return kept
+
+
+def downsample_series(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    group: Optional[str] = None,
+    max_points: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Downsample every series of a long frame to at most ``max_points``.
+
+    ``max_points`` (default ``dashboard.max_points``) is the budget per
+    series; roughly the chart width in pixels. Series already within
+    budget pass through untouched, and rows with a missing x or y are
+    always kept (on top of the budget) so line gaps survive.
+    """
+    budget = int(max_points or dashboard_config().get("max_points", DEFAULT_MAX_POINTS))
+    if len(df) <= budget:
+        return df
+
+    if group is None:
+        parts = [df]
+    else:
+        parts = [g for _, g in df.groupby(group, sort=False, observed=True)]
+    keep = []
+    for part in parts:
+        if len(part) <= budget:
+            keep.append(part.index.to_numpy())
+            continue
+        part = part.sort_values(x, kind="stable")
+        xs = _as_numeric(part[x])
+        ys = pd.to_numeric(part[y], errors="coerce").to_numpy(dtype=float)
+        valid = np.isfinite(xs) & np.isfinite(ys)
+        positions = np.flatnonzero(valid)[lttb(xs[valid], ys[valid], budget)]
+        positions = np.sort(np.concatenate([positions, np.flatnonzero(~valid)]))
+        keep.append(part.index.to_numpy()[positions])
+
+    out = df.loc[np.concatenate(keep)]
+    logger.debug("Downsampled %d point(s) to %d", len(df), len(out))
+    return out
+
+
+# ---------------------------------------------------------------------
+# Event markers
+# ---------------------------------------------------------------------
+
+def collapse_events(
+    events: pd.DataFrame,
+    x: str,
+    label: str,
+    min_gap: Optional[float] = None,
+    max_markers: Optional[int] = None,
+    max_labels: int = 3,
+) -> pd.DataFrame:
+    """
+    Merge events closer than ``min_gap`` on the x axis into one marker.
+
+    ``min_gap`` defaults to the x span divided by ``max_markers``
+    (``dashboard.max_event_markers``), so markers never sit closer than
+    a chart can separate them. Each marker is placed at the first event
+    of its cluster and labelled with up to ``max_labels`` distinct,
+    non-empty event labels plus a count of the rest.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns: x, label, n_events.
+    """
+    if events.empty:
+        return pd.DataFrame(columns=["x", "label", "n_events"])
+
+    ordered = events.sort_values(x, kind="stable")
+    xs = _as_numeric(ordered[x])
+    if min_gap is None:
+        cfg = dashboard_config()
+        markers = int(
+            max_markers or cfg.get("max_event_markers", DEFAULT_MAX_EVENT_MARKERS)
+        )
+        span = np.nanmax(xs) - np.nanmin(xs)
+        min_gap = span / markers if span > 0 else 0.0
+
+    # A new cluster starts where the gap to the cluster's first event
+    # reaches min_gap; anchors are found greedily in one pass.
+    cluster = np.empty(len(xs), dtype=np.int64)
+    anchor, current = xs[0], 0
+    for i, value in enumerate(xs):
+        if value - anchor >= min_gap and i:
+            anchor, current = value, current + 1
+        cluster[i] = current
+
+    labels = ordered[label].astype(object).fillna("").astype(str).to_numpy()
+    starts = np.flatnonzero(np.r_[True, cluster[1:] != cluster[:-1]])
+    stops = np.r_[starts[1:], len(cluster)]
+
+    rows = []
+    for s, e in zip(starts, stops):
+        names = [name for name in pd.unique(labels[s:e]) if name]
+        text = ", ".join(names[:max_labels])
+        if len(names) > max_labels:
+            text += f" +{len(names) - max_labels}"
+        rows.append((ordered[x].iloc[s], text, int(e - s)))
+    return pd.DataFrame(rows, columns=["x", "label", "n_events"])
+
+
+def event_layout(
+    markers: pd.DataFrame,
+    line: Optional[Dict] = None,
+) -> Tuple[List[Dict], List[Dict]]:
+    """Plotly ``shapes`` and ``annotations`` for collapsed event markers."""
+    line = {**EVENT_LINE, **(line or {})}
+    shapes, annotations = [], []
+    for row in markers.itertuples(index=False):
+        x = row.x.isoformat() if isinstance(row.x, pd.Timestamp) else row.x
+        shapes.append(
+            {"type": "line", "xref": "x", "yref": "paper", "x0": x, "x1": x,
+             "y0": 0, "y1": 1, "line": line}
+        )
+        text = row.label if row.n_events == 1 else f"{row.label} ({row.n_events})"
+        annotations.append(
+            {"x": x, "xref": "x", "y": 1, "yref": "paper", "text": text,
+             "showarrow": False, "xanchor": "left", "yanchor": "bottom",
+             "textangle": -30, "font": {"size": 10}}
+        )
+    return shapes, annotations
+
+
+def add_event_markers(
+    fig,
+    events: pd.DataFrame,
+    x: str = "year",
+    label: str = "category",
+    min_gap: Optional[float] = None,
+    line: Optional[Dict] = None,
+):
+    """
+    Draw ``events`` on ``fig`` as vertical lines with labels.
+
+    Overlapping events are collapsed (``collapse_events``) and every
+    marker is added in a single ``update_layout`` call, instead of one
+    ``add_vline`` (and one layout validation) per event.
+    """
+    markers = collapse_events(events, x, label, min_gap=min_gap)
+    shapes, annotations = event_layout(markers, line)
+    if shapes:
+        fig.update_layout(
+            shapes=list(fig.layout.shapes or ()) + shapes,
+            annotations=list(fig.layout.annotations or ()) + annotations,
+        )
+    return fig
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from fi_forecasting.dashboard.reshape import reshape_forecasts
+from fi_forecasting.dashboard.views import (
+    MANIFEST_NAME,
+    DashboardViews,
+    dashboard_config,
+    load_views,
+)
+from fi_forecasting.data.cache import hash_file
+from fi_forecasting.pipeline.stages import output_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WATCH_INTERVAL = 5.0
+
+
+def dashboard_paths() -> Dict[str, Path]:
+    """
+    Files the dashboard reads, resolved through the settings.
+
+    The views entry points at the views manifest, which the pipeline
+    writes last, so it doubles as the "outputs published" marker.
+    """
+    return {
+        "enriched": output_path("enriched"),
+        "forecasts": output_path("forecasts"),
+        "views": output_path("views") / MANIFEST_NAME,
+    }
+
+
+# ---------------------------------------------------------------------
+# Loaders
+# ---------------------------------------------------------------------
+
+def read_enriched(path: Path) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    df["observation_date"] = pd.to_datetime(
+        df["observation_date"], errors="coerce", format="mixed"
+    )
+    df["year"] = df["observation_date"].dt.year
+    return df
+
+
+def read_forecast_table(path: Path) -> pd.DataFrame:
+    """The wide forecast outputs file, with its year column named ``year``."""
+    df = pd.read_csv(path)
+    # The year index is written without a header by older exports
+    if str(df.columns[0]).startswith("Unnamed"):
+        df = df.rename(columns={df.columns[0]: "year"})
+    return df
+
+
+def read_forecasts(path: Path) -> pd.DataFrame:
+    """Forecast outputs in the long dashboard layout (see ``reshape_forecasts``)."""
+    return reshape_forecasts(read_forecast_table(path))
+
+
+def read_views(path: Path) -> DashboardViews:
+    return load_views(path.parent)
+
+
+LOADERS: Dict[str, Callable[[Path], Any]] = {
+    "enriched": read_enriched,
+    "forecasts": read_forecasts,
+    "views": read_views,
+}
+
+
+# ---------------------------------------------------------------------
+# Shared store
+# ---------------------------------------------------------------------
+
+@dataclass
+class _Entry:
+    stat: Tuple[int, int]
+    digest: str
+    value: Any
+
+
+def _stat(path: Path) -> Tuple[int, int]:
+    st = path.stat()
+    return (st.st_size, st.st_mtime_ns)
+
+
+class DataStore:
+    """
+    Process-wide cache of the dashboard datasets.
+
+    Each dataset is parsed once and the same object is handed to every
+    session and rerun (pandas copy-on-write keeps a session's edits from
+    leaking into the shared frame). ``get`` revalidates with a ``stat``
+    call: an unchanged size/mtime returns the cached object; a changed
+    one triggers a content hash, and the file is only re-parsed when the
+    hash differs, so a pipeline run that rewrites identical outputs
+    costs one hash, not a reload.
+
+    Example
+    -------
+    >>> store = DataStore()
+    >>> store.start_watcher()
+    >>> forecasts = store.get("forecasts")
+    """
+
+    def __init__(
+        self,
+        paths: Optional[Dict[str, Path]] = None,
+        loaders: Optional[Dict[str, Callable[[Path], Any]]] = None,
+    ):
+        self.paths = dict(paths or dashboard_paths())
+        self.loaders = {**LOADERS, **(loaders or {})}
+        self.version = 0
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.RLock()
+        self._stop: Optional[threading.Event] = None
+
+    def get(self, name: str) -> Any:
+        """
+        Current value of dataset ``name``.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the dataset file does not exist and nothing is cached.
+        """
+        path = Path(self.paths[name])
+        with self._lock:
+            entry = self._entries.get(name)
+            try:
+                stat = _stat(path)
+            except FileNotFoundError:
+                if entry is not None:
+                    return entry.value
+                raise
+            if entry is not None and entry.stat == stat:
+                return entry.value
+
+            digest = hash_file(path)
+            if entry is not None and entry.digest == digest:
+                entry.stat = stat
+                return entry.value
+
+            value = self.loaders[name](path)
+            self._entries[name] = _Entry(stat, digest, value)
+            self.version += 1
+            logger.info("Loaded dashboard dataset '%s' from %s", name, path)
+            return value
+
+    def refresh(self) -> int:
+        """Revalidate every dataset loaded so far; returns ``version``."""
+        for name in list(self._entries):
+            try:
+                self.get(name)
+            except Exception as exc:   # keep serving the last good copy
+                logger.warning(
+                    "Could not refresh dashboard dataset '%s': %s", name, exc
+                )
+        return self.version
+
+    # -------------------------
+    # Watcher
+    # -------------------------
+
+    def start_watcher(self, interval: Optional[float] = None) -> None:
+        """
+        Poll the dataset files in a daemon thread and reload changed
+        ones in the background, so a rerun after a pipeline run finds
+        the new data already parsed. Idempotent.
+        """
+        if self._stop is not None:
+            return
+        interval = float(
+            interval
+            or dashboard_config().get("watch_interval_seconds", DEFAULT_WATCH_INTERVAL)
+        )
+        self._stop = threading.Event()
+
+        def loop(stop: threading.Event) -> None:
+            while not stop.wait(interval):
+                self.refresh()
+
+        threading.Thread(
+            target=loop, args=(self._stop,), name="dashboard-data-watcher", daemon=True
+        ).start()
+
+    def stop_watcher(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import logging
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from fi_forecasting.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+BOUND_TOKENS = ("lower", "upper")
+DEFAULT_SCENARIO = "base"
+LONG_COLUMNS = [
+    "year",
+    "indicator_code",
+    "scenario",
+    "forecast",
+    "lower_ci",
+    "upper_ci",
+]
+
+
+def configured_scenarios() -> List[str]:
+    """Scenario names of ``forecast.scenarios`` (config order)."""
+    return list((settings.get("forecast", {}) or {}).get("scenarios", {}) or [])
+
+
+# ---------------------------------------------------------------------
+# Column grammar
+# ---------------------------------------------------------------------
+
+def parse_forecast_columns(
+    columns: Iterable[str],
+    scenarios: Optional[Sequence[str]] = None,
+    bounds: Sequence[str] = BOUND_TOKENS,
+) -> pd.DataFrame:
+    """
+    Split wide forecast columns into (indicator, token).
+
+    The grammar is ``<INDICATOR>`` (a bare indicator column),
+    ``<INDICATOR>_<scenario>`` and ``<INDICATOR>_<lower|upper>``.
+    Indicator codes contain underscores themselves, so a suffix counts
+    as a token when it is a bound, a known scenario (``scenarios``,
+    default ``forecast.scenarios``) or when the remaining prefix is an
+    indicator seen elsewhere in the header (a bare column or a bound
+    column). Anything else is a bare indicator column.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per column: column, indicator_code, token and kind
+        (``"scenario"``, ``"lower"``, ``"upper"`` or ``"bare"``).
+    """
+    columns = [str(c) for c in columns]
+    scenarios = set(configured_scenarios() if scenarios is None else scenarios)
+    bounds = tuple(bounds)
+
+    splits = {c: c.rsplit("_", 1) if "_" in c else [c, None] for c in columns}
+    known = {p for p, t in splits.values() if t in bounds}
+    bare_candidates = set(columns)
+
+    rows = []
+    for column in columns:
+        prefix, token = splits[column]
+        if token in bounds:
+            rows.append((column, prefix, token, token))
+        elif token is not None and (
+            token in scenarios or prefix in known or prefix in bare_candidates
+        ):
+            rows.append((column, prefix, token, "scenario"))
+        else:
+            rows.append((column, column, None, "bare"))
+    return pd.DataFrame(rows, columns=["column", "indicator_code", "token", "kind"])
+
+
+# ---------------------------------------------------------------------
+# Reshaping
+# ---------------------------------------------------------------------
+
+def reshape_forecasts(
+    forecasts: pd.DataFrame,
+    year_col: str = "year",
+    scenarios: Optional[Sequence[str]] = None,
+    bare_scenario: str = DEFAULT_SCENARIO,
+) -> pd.DataFrame:
+    """
+    Wide forecast table -> long ``year | indicator_code | scenario |
+    forecast | lower_ci | upper_ci``.
+
+    The header is parsed once (``parse_forecast_columns``); the scenario
+    block is melted by reshaping its (years x columns) value array, and
+    the bounds are joined through a column indexer from each scenario
+    column to its indicator's ``_lower`` / ``_upper`` column, so the
+    cost is linear in the size of the table. Bare indicator columns are
+    used as the ``bare_scenario`` forecast of indicators that have no
+    explicit scenario columns.
+
+    Parameters
+    ----------
+    forecasts : pd.DataFrame
+        Wide table; years in ``year_col`` or in the index.
+    scenarios : sequence of str, optional
+        Known scenario tokens (defaults to ``forecast.scenarios``).
+
+    Returns
+    -------
+    pd.DataFrame
+        Rows ordered by year, then indicator and scenario in header order.
+    """
+    if year_col in forecasts.columns:
+        wide = forecasts.set_index(year_col)
+    else:
+        wide = forecasts.rename_axis(year_col)
+    grammar = parse_forecast_columns(wide.columns, scenarios=scenarios)
+
+    explicit = grammar[grammar["kind"] == "scenario"]
+    bare = grammar[
+        (grammar["kind"] == "bare")
+        & ~grammar["indicator_code"].isin(explicit["indicator_code"])
+    ].assign(token=bare_scenario)
+    series = pd.concat([explicit, bare], ignore_index=True)
+    if series.empty:
+        return pd.DataFrame(columns=LONG_COLUMNS)
+
+    # Header order: indicators as first seen, scenarios as first seen
+    indicators = pd.Index(pd.unique(grammar["indicator_code"]))
+    tokens = pd.Index(pd.unique(series["token"]))
+    series = series.assign(
+        _i=indicators.get_indexer(series["indicator_code"]),
+        _s=tokens.get_indexer(series["token"]),
+    ).sort_values(["_i", "_s"], kind="stable")
+
+    years = wide.index.to_numpy()
+    n_years, n_series = len(years), len(series)
+    values = wide[series["column"].tolist()].to_numpy(dtype=float)
+
+    out = {
+        "year": np.repeat(years, n_series),
+        "indicator_code": np.tile(
+            series["indicator_code"].to_numpy(dtype=object), n_years
+        ),
+        "scenario": np.tile(series["token"].to_numpy(dtype=object), n_years),
+        "forecast": values.ravel(),
+    }
+    for kind, name in zip(BOUND_TOKENS, ("lower_ci", "upper_ci")):
+        cols = grammar[grammar["kind"] == kind]
+        lookup = pd.Index(cols["indicator_code"]).get_indexer(series["indicator_code"])
+        block = wide[cols["column"].tolist()].to_numpy(dtype=float)
+        block = np.concatenate([block, np.full((n_years, 1), np.nan)], axis=1)
+        out[name] = block[:, np.where(lookup >= 0, lookup, block.shape[1] - 1)].ravel()
+
+    return pd.DataFrame(out, columns=LONG_COLUMNS)
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from fi_forecasting.core.settings import settings
+from fi_forecasting.utils.paths import ensure_dir
+
+logger = logging.getLogger(__name__)
+
+VIEW_NAMES = ("trends", "trends_detail", "kpis", "events")
+DEFAULT_DIMENSIONS = ("gender", "location", "region")
+ALL_LABEL = "all"
+MANIFEST_NAME = "manifest.json"
+
+
+def dashboard_config() -> Dict:
+    """The ``dashboard`` section of the merged config."""
+    return settings.get("dashboard", {}) or {}
+
+
+def _observation_dates(df: pd.DataFrame) -> pd.Series:
+    dates = pd.to_datetime(df["observation_date"], errors="coerce", format="mixed")
+    if "event_date" in df.columns:
+        events = pd.to_datetime(df["event_date"], errors="coerce", format="mixed")
+        dates = dates.fillna(events)
+    return dates
+
+
+# ---------------------------------------------------------------------
+# View builders
+# ---------------------------------------------------------------------
+
+def _aggregate(obs: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    grouped = obs.groupby(keys, observed=True, sort=True)["value_numeric"]
+    out = grouped.agg(["mean", "min", "max", "count"]).reset_index()
+    return out.rename(columns={"mean": "value", "count": "n_obs"})
+
+
+def trend_views(
+    df: pd.DataFrame,
+    dimensions: Sequence[str] = DEFAULT_DIMENSIONS,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Year x indicator aggregates of observations.
+
+    Returns
+    -------
+    (pd.DataFrame, pd.DataFrame)
+        ``trends``: indicator_code, year, value (mean), min, max, n_obs,
+        pooling every row of an indicator and year (the Overview and
+        Trends charts). ``trends_detail``: the same per combination of
+        the ``dimensions`` present (e.g. gender, region); missing
+        dimension values are labelled ``"all"``.
+    """
+    obs = df
+    if "record_type" in obs.columns:
+        obs = obs[obs["record_type"].astype(object) == "observation"]
+    year = _observation_dates(obs).dt.year
+    values = pd.to_numeric(obs["value_numeric"], errors="coerce")
+    obs = pd.DataFrame(
+        {
+            "indicator_code": obs["indicator_code"].astype(object).to_numpy(),
+            "year": year.to_numpy(),
+            "value_numeric": values.to_numpy(),
+            **{
+                d: obs[d].astype(object).fillna(ALL_LABEL).to_numpy()
+                for d in dimensions
+                if d in obs.columns
+            },
+        }
+    ).dropna(subset=["indicator_code", "year", "value_numeric"])
+    obs["year"] = obs["year"].astype(int)
+
+    dims = [d for d in dimensions if d in obs.columns]
+    trends = _aggregate(obs, ["indicator_code", "year"])
+    detail = _aggregate(obs, ["indicator_code", *dims, "year"])
+    return trends, detail
+
+
+def kpi_view(trends: pd.DataFrame) -> pd.DataFrame:
+    """
+    Latest-year snapshot per indicator from the ``trends`` view.
+
+    Columns: indicator_code, year, value, prev_year, prev_value, change.
+    """
+    if trends.empty:
+        columns = ["indicator_code", "year", "value", "prev_year", "prev_value"]
+        return pd.DataFrame(columns=columns + ["change"])
+    ordered = trends.sort_values(["indicator_code", "year"])
+    prev = ordered.groupby("indicator_code", sort=False)[["year", "value"]].shift(1)
+    ordered = ordered.assign(prev_year=prev["year"], prev_value=prev["value"])
+    latest = ordered.groupby("indicator_code", sort=True).tail(1)
+    out = latest[["indicator_code", "year", "value", "prev_year", "prev_value"]].copy()
+    out["change"] = out["value"] - out["prev_value"]
+    return out.reset_index(drop=True)
+
+
+def event_view(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Event timeline sorted by date.
+
+    Columns: record_id, date, year, category, indicator, indicator_code.
+    """
+    if "record_type" in df.columns:
+        events = df[df["record_type"].astype(object) == "event"]
+    else:
+        events = df.iloc[:0]
+    dates = _observation_dates(events)
+
+    def optional(col: str) -> Optional[np.ndarray]:
+        return events[col].astype(object).to_numpy() if col in events else None
+
+    out = pd.DataFrame(
+        {
+            "record_id": events["record_id"].astype(object).to_numpy(),
+            "date": dates.to_numpy(),
+            "category": optional("category"),
+            "indicator": optional("indicator"),
+            "indicator_code": events["indicator_code"].astype(object).to_numpy(),
+        }
+    ).dropna(subset=["date"])
+    out.insert(2, "year", out["date"].dt.year.astype(int))
+    return out.sort_values("date", kind="stable").reset_index(drop=True)
+
+
+def build_views(
+    df: pd.DataFrame,
+    dimensions: Optional[Sequence[str]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Every dashboard view from the cleaned unified dataset.
+
+    ``dimensions`` defaults to ``dashboard.dimensions`` in the config.
+    """
+    if dimensions is None:
+        dimensions = dashboard_config().get("dimensions", DEFAULT_DIMENSIONS)
+    trends, detail = trend_views(df, dimensions)
+    return {
+        "trends": trends,
+        "trends_detail": detail,
+        "kpis": kpi_view(trends),
+        "events": event_view(df),
+    }
+
+
+# ---------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------
+
+def save_views(views: Dict[str, pd.DataFrame], directory: Union[str, Path]) -> Path:
+    """
+    Write each view to ``<directory>/<name>.parquet`` plus a manifest
+    (build time and row counts).
+    """
+    directory = ensure_dir(Path(directory))
+    for name, frame in views.items():
+        frame.to_parquet(directory / f"{name}.parquet", index=False)
+    manifest = {
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+        "views": {name: len(frame) for name, frame in views.items()},
+    }
+    tmp = directory / f"{MANIFEST_NAME}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    tmp.replace(directory / MANIFEST_NAME)
+    return directory
+
+
+def load_views(directory: Union[str, Path]) -> "DashboardViews":
+    """
+    Read views written by ``save_views``.
+
+    Raises
+    ------
+    FileNotFoundError
+        If a view file is missing.
+    """
+    directory = Path(directory)
+    frames = {}
+    for name in VIEW_NAMES:
+        path = directory / f"{name}.parquet"
+        if not path.exists():
+            raise FileNotFoundError(f"Dashboard view not found: {path}")
+        frames[name] = pd.read_parquet(path)
+    return DashboardViews(**frames)
+
+
+# ---------------------------------------------------------------------
+# Lookups
+# ---------------------------------------------------------------------
+
+@dataclass
+class DashboardViews:
+    """
+    Prebuilt dashboard tables with indexed lookups.
+
+    Trend rows are stored sorted by (indicator, year) with the row range
+    of each indicator precomputed, so selecting indicators and a year
+    range slices a small table instead of scanning the dataset.
+    """
+
+    trends: pd.DataFrame
+    trends_detail: pd.DataFrame
+    kpis: pd.DataFrame
+    events: pd.DataFrame
+    _ranges: Dict[str, Tuple[int, int]] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        trends = self.trends.sort_values(["indicator_code", "year"], kind="stable")
+        self.trends = trends.reset_index(drop=True)
+        codes = self.trends["indicator_code"].to_numpy(dtype=object)
+        if len(codes):
+            starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+            stops = np.r_[starts[1:], len(codes)]
+            self._ranges = {codes[s]: (int(s), int(e)) for s, e in zip(starts, stops)}
+        self.kpis = self.kpis.set_index("indicator_code", drop=False)
+        events = self.events.sort_values("date", kind="stable")
+        self.events = events.reset_index(drop=True)
+
+    @classmethod
+    def from_data(cls, df: pd.DataFrame, **kwargs) -> "DashboardViews":
+        return cls(**build_views(df, **kwargs))
+
+    @property
+    def indicators(self) -> List[str]:
+        return list(self._ranges)
+
+    @property
+    def year_range(self) -> Tuple[int, int]:
+        years = self.trends["year"]
+        return (int(years.min()), int(years.max())) if len(years) else (0, 0)
+
+    def trend(
+        self,
+        indicators: Optional[Iterable[str]] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Trend rows of ``indicators`` (default: all) within [start, end]."""
+        if indicators is None:
+            codes = self.indicators
+        else:
+            codes = [c for c in indicators if c in self._ranges]
+        years = self.trends["year"].to_numpy()
+        positions = []
+        for code in codes:
+            first, stop = self._ranges[code]
+            segment = years[first:stop]
+            lo, hi = first, stop
+            if start is not None:
+                lo += int(np.searchsorted(segment, start, side="left"))
+            if end is not None:
+                hi = first + int(np.searchsorted(segment, end, side="right"))
+            positions.append(np.arange(lo, max(lo, hi)))
+        rows = np.concatenate(positions) if positions else np.array([], dtype=int)
+        return self.trends.take(rows)
+
+    def kpi(self, indicator: str) -> Optional[pd.Series]:
+        """Latest-year snapshot of ``indicator``; None if it has no data."""
+        if indicator not in self.kpis.index:
+            return None
+        return self.kpis.loc[indicator]
+
+    def events_between(
+        self, start: Optional[int] = None, end: Optional[int] = None
+    ) -> pd.DataFrame:
+        """Events whose year falls within [start, end]."""
+        years = self.events["year"].to_numpy()
+        lo, hi = 0, len(years)
+        if start is not None:
+            lo = int(np.searchsorted(years, start, side="left"))
+        if end is not None:
+            hi = int(np.searchsorted(years, end, side="right"))
+        return self.events.iloc[lo:hi]
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-import re
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Mapping, Optional, Tuple
+import numpy as np
 import pandas as pd
 import logging
 
+from fi_forecasting.utils.profiling import instrument
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------
@@ -13,151 +15,224 @@ logger = logging.getLogger(__name__)
 
 MIN_TEXT_LEN = 3
 
+ACCESS_KEYWORDS: Tuple[str, ...] = ("account", "agent")
+
+# (start_row, name column) per sheet, shared by extractors and the
+# rejected-rows report
+SHEET_LAYOUTS: Dict[str, Tuple[int, int]] = {
+    "alternative_baselines": (7, 1),
+    "direct_correlation": (8, 1),
+    "indirect_correlation": (8, 1),
+    "market_nuances": (6, 1),
+}
+
+_EMPTY_COLUMNS: Dict[str, List[str]] = {
+    "alternative_sources": ["source_name", "source_type", "source_url"],
+    "indicators": [
+        "indicator",
+        "indicator_code",
+        "correlation",
+        "why_matters",
+        "source",
+        "pillar",
+    ],
+    "market_notes": ["theme", "what_to_watch", "market_impact"],
+}
+
+
+def _body(df: pd.DataFrame, start_row: int) -> pd.DataFrame:
+    """Rows from ``start_row`` on (positional; the guide has a RangeIndex)."""
+    return df.iloc[start_row:]
+
 
-def _safe_get(row: pd.Series, idx: int) -> Optional[Any]:
-    """Safely extract a value from a row by index."""
-    try:
-        val = row.iloc[idx]
-        return val if pd.notna(val) else None
-    except IndexError:
-        return None
+def _column(body: pd.DataFrame, idx: int) -> pd.Series:
+    """Positional column, or an all-missing column if it does not exist."""
+    if idx < body.shape[1]:
+        return body.iloc[:, idx]
+    return pd.Series(None, index=body.index, dtype=object)
 
 
-def _is_valid_text(value: Any, min_len: int = MIN_TEXT_LEN) -> bool:
-    return isinstance(value, str) and len(value.strip()) >= min_len
+def _is_str(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_string_dtype(values) and values.dtype != object:
+        return values.notna()
+    return values.map(type).eq(str)
 
 
+def _valid_text_mask(values: pd.Series, min_len: int = MIN_TEXT_LEN) -> pd.Series:
+    """Vectorized ``isinstance(v, str) and len(v.strip()) >= min_len``."""
+    is_str = _is_str(values)
+    lengths = values.where(is_str).astype(object).str.strip().str.len()
+    return is_str & lengths.ge(min_len).fillna(False).astype(bool)
 
-def _generate_code(prefix: str, name: str, max_len: int = 25) -> str:
+
+def _generate_codes(prefix: str, names: pd.Series, max_len: int = 25) -> pd.Series:
     """
-    Generate a normalized indicator code.
+    Generate normalized indicator codes for a column of names.
     Example: DIR_MOBILE_MONEY_USERS
     """
-    cleaned = re.sub(r"[^A-Za-z0-9]+", "_", name.upper()).strip("_")
-    code = f"{prefix}_{cleaned}"
-    return code[:max_len].rstrip("_")
+    cleaned = (
+        names.str.upper()
+        .str.replace(r"[^A-Za-z0-9]+", "_", regex=True)
+        .str.strip("_")
+    )
+    return (prefix + "_" + cleaned).str[:max_len].str.rstrip("_")
 
 
+def _pillar_from_keywords(names: pd.Series) -> pd.Series:
+    is_access = names.str.lower().str.contains("|".join(ACCESS_KEYWORDS), regex=True)
+    return pd.Series(
+        np.where(is_access, "ACCESS", "USAGE"), index=names.index, dtype=object
+    )
 
-def _iterate_rows(
-    df: pd.DataFrame,
-    start_row: int,
-    handler: Callable[[pd.Series], Optional[Dict[str, Any]]],
-) -> List[Dict[str, Any]]:
-    """Generic row iterator with row handler."""
-    results: List[Dict[str, Any]] = []
 
-    for idx, row in df.iterrows():
-        if idx < start_row:
-            continue
+def _to_records_frame(columns: Mapping[str, pd.Series]) -> pd.DataFrame:
+    """Assemble output columns, with missing values as ``None``."""
+    out = pd.DataFrame(dict(columns)).astype(object)
+    return out.where(out.notna(), None).reset_index(drop=True)
 
-        try:
-            item = handler(row)
-            if item:
-                results.append(item)
-        except Exception as exc:
-            logger.warning(
-    "Skipping row %s in %s due to error: %s",
-    idx,
-    handler.__name__,
-    exc,
-)
 
+def rejected_rows(
+    df: pd.DataFrame,
+    start_row: int,
+    name_col: int = 1,
+    min_len: int = MIN_TEXT_LEN,
+) -> pd.DataFrame:
+    """
+    Report the rows an extractor skips, with the reason.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns ``row`` (original index label), ``value`` and ``reason``
+        (``missing``, ``not_text`` or ``too_short``).
+    """
+    body = _body(df, start_row)
+    names = _column(body, name_col)
+
+    missing = names.isna()
+    not_text = ~missing & ~_is_str(names)
+    too_short = ~missing & ~not_text & ~_valid_text_mask(names, min_len)
+
+    reason = pd.Series(
+        np.select(
+            [missing, not_text, too_short],
+            ["missing", "not_text", "too_short"],
+            default="",
+        ),
+        index=body.index,
+    )
+    rejected = reason.ne("")
+
+    return pd.DataFrame(
+        {
+            "row": body.index[rejected],
+            "value": names[rejected].astype(object).to_numpy(),
+            "reason": reason[rejected].to_numpy(),
+        }
+    )
+
+
+def _select_valid(
+    df: pd.DataFrame, start_row: int, name_col: int, label: str
+) -> Tuple[pd.DataFrame, pd.Series]:
+    body = _body(df, start_row)
+    names = _column(body, name_col)
+    mask = _valid_text_mask(names)
+
+    n_rejected = int((~mask).sum())
+    if n_rejected:
+        logger.debug(
+            "%s: kept %d row(s), rejected %d (see rejected_rows)",
+            label,
+            int(mask.sum()),
+            n_rejected,
+        )
 
-    return results
+    body = body[mask.to_numpy()]
+    return body, names[mask].astype(object)
 
 
 # ---------------------------------------------------------------------
 # Sheet processors
 # ---------------------------------------------------------------------
 
-def extract_alternative_sources(df: pd.DataFrame) -> List[Dict[str, Any]]:
+def extract_alternative_sources(df: pd.DataFrame) -> pd.DataFrame:
     """Extract alternative baseline sources (Sheet A)."""
+    start_row, name_col = SHEET_LAYOUTS["alternative_baselines"]
+    body, names = _select_valid(df, start_row, name_col, "alternative_sources")
 
-    def handler(row: pd.Series) -> Optional[Dict[str, Any]]:
-        name = _safe_get(row, 1)
-        if not _is_valid_text(name):
-            return None
+    if body.empty:
+        return pd.DataFrame(columns=_EMPTY_COLUMNS["alternative_sources"])
 
-        return {
-            "source_name": name.strip(),
-            "source_type": _safe_get(row, 2),
-            "source_url": _safe_get(row, 6),
+    return _to_records_frame(
+        {
+            "source_name": names.str.strip(),
+            "source_type": _column(body, 2),
+            "source_url": _column(body, 6),
         }
-
-    return _iterate_rows(df, start_row=7, handler=handler)
+    )
+
+
+def _extract_indicators(
+    df: pd.DataFrame, sheet: str, prefix: str, pillar: Optional[str]
+) -> pd.DataFrame:
+    start_row, name_col = SHEET_LAYOUTS[sheet]
+    body, names = _select_valid(df, start_row, name_col, sheet)
+
+    if body.empty:
+        return pd.DataFrame(columns=_EMPTY_COLUMNS["indicators"])
+
+    return _to_records_frame(
+        {
+            "indicator": names.str.strip(),
+            "indicator_code": _generate_codes(prefix, names),
+            "correlation": _column(body, 2),
+            "why_matters": _column(body, 3),
+            "source": _column(body, 4),
+            "pillar": (
+                _pillar_from_keywords(names)
+                if pillar is None
+                else pd.Series(pillar, index=body.index, dtype=object)
+            ),
+        }
+    )
 
 
-def extract_direct_indicators(df: pd.DataFrame) -> List[Dict[str, Any]]:
+def extract_direct_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """Extract direct correlation indicators (Sheet B)."""
+    return _extract_indicators(df, "direct_correlation", "DIR", pillar=None)
 
-    def handler(row: pd.Series) -> Optional[Dict[str, Any]]:
-        name = _safe_get(row, 1)
-        if not _is_valid_text(name):
-            return None
 
-        pillar = (
-            "ACCESS"
-            if any(k in name.lower() for k in ("account", "agent"))
-            else "USAGE"
-        )
-
-        return {
-            "indicator": name.strip(),
-            "indicator_code": _generate_code("DIR", name),
-            "correlation": _safe_get(row, 2),
-            "why_matters": _safe_get(row, 3),
-            "source": _safe_get(row, 4),
-            "pillar": pillar,
-        }
-
-    return _iterate_rows(df, start_row=8, handler=handler)
-
-
-def extract_indirect_indicators(df: pd.DataFrame) -> List[Dict[str, Any]]:
+def extract_indirect_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """Extract indirect/proxy indicators (Sheet C)."""
+    return _extract_indicators(df, "indirect_correlation", "IND", pillar="ACCESS")
 
-    def handler(row: pd.Series) -> Optional[Dict[str, Any]]:
-        name = _safe_get(row, 1)
-        if not _is_valid_text(name):
-            return None
-
-        return {
-            "indicator": name.strip(),
-            "indicator_code": _generate_code("IND", name),
-            "correlation": _safe_get(row, 2),
-            "why_matters": _safe_get(row, 3),
-            "source": _safe_get(row, 4),
-            "pillar": "ACCESS",
-        }
-
-    return _iterate_rows(df, start_row=8, handler=handler)
 
-
-def extract_market_nuances(df: pd.DataFrame) -> List[Dict[str, Any]]:
+def extract_market_nuances(df: pd.DataFrame) -> pd.DataFrame:
     """Extract market nuances (Sheet D)."""
+    start_row, name_col = SHEET_LAYOUTS["market_nuances"]
+    body, themes = _select_valid(df, start_row, name_col, "market_nuances")
 
-    def handler(row: pd.Series) -> Optional[Dict[str, Any]]:
-        theme = _safe_get(row, 1)
-        if not _is_valid_text(theme):
-            return None
+    if body.empty:
+        return pd.DataFrame(columns=_EMPTY_COLUMNS["market_notes"])
 
-        return {
-            "theme": theme.strip(),
-            "what_to_watch": _safe_get(row, 2),
-            "market_impact": _safe_get(row, 3),
+    return _to_records_frame(
+        {
+            "theme": themes.str.strip(),
+            "what_to_watch": _column(body, 2),
+            "market_impact": _column(body, 3),
         }
-
-    return _iterate_rows(df, start_row=6, handler=handler)
+    )
 
 
 # ---------------------------------------------------------------------
 # Orchestrator
 # ---------------------------------------------------------------------
 
+@instrument
 def process_additional_data_points(
     sheets: Dict[str, pd.DataFrame]
-) -> Dict[str, List[Dict[str, Any]]]:
+) -> Dict[str, pd.DataFrame]:
     """
     Process all Additional Data Points sheets.
 
@@ -166,15 +241,21 @@ def process_additional_data_points(
     - direct_correlation
     - indirect_correlation
     - market_nuances
+
+    Each output is a DataFrame with one row per extracted record.
     """
 
     if not sheets:
         logger.info("No additional data sheets provided.")
         return {
-            "alternative_sources": [],
-            "direct_indicators": [],
-            "indirect_indicators": [],
-            "market_notes": [],
+            "alternative_sources": pd.DataFrame(
+                columns=_EMPTY_COLUMNS["alternative_sources"]
+            ),
+            "direct_indicators": pd.DataFrame(columns=_EMPTY_COLUMNS["indicators"]),
+            "indirect_indicators": pd.DataFrame(
+                columns=_EMPTY_COLUMNS["indicators"]
+            ),
+            "market_notes": pd.DataFrame(columns=_EMPTY_COLUMNS["market_notes"]),
         }
 
     return {
@@ -191,3 +272,20 @@ def process_additional_data_points(
             sheets.get("market_nuances", pd.DataFrame())
         ),
     }
+
+
+def report_rejected_rows(sheets: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Rejected-row report across all Additional Data Points sheets.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns ``sheet``, ``row``, ``value`` and ``reason``.
+    """
+    frames = []
+    for sheet, (start_row, name_col) in SHEET_LAYOUTS.items():
+        report = rejected_rows(sheets.get(sheet, pd.DataFrame()), start_row, name_col)
+        frames.append(report.assign(sheet=sheet))
+
+    return pd.concat(frames, ignore_index=True)[["sheet", "row", "value", "reason"]]
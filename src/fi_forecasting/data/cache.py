@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence
+
+import pandas as pd
+
+from fi_forecasting.utils.paths import ensure_dir
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------
+
+CACHE_DIRNAME = ".frame_cache"
+_HASH_CHUNK = 1 << 20
+
+
+# ---------------------------------------------------------------------
+# Workbook fingerprint
+# ---------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class SourceFingerprint:
+    """
+    Identity of a source file as seen by the cache.
+
+    ``size`` and ``mtime_ns`` are cheap to obtain and are used to decide
+    whether the (expensive) content hash must be recomputed.
+    """
+
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    def key(self, extra: Sequence[str] = ()) -> str:
+        payload = "|".join([self.sha256, str(self.size), *map(str, extra)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 hex digest of a file, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ---------------------------------------------------------------------
+# Cache statistics
+# ---------------------------------------------------------------------
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    invalidations: int = 0
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+# ---------------------------------------------------------------------
+# Frame cache
+# ---------------------------------------------------------------------
+
+@dataclass
+class FrameCache:
+    """
+    Columnar on-disk cache for DataFrames derived from a source file.
+
+    Entries are written as Parquet (falling back to pickle when a frame
+    holds mixed-type object columns that Arrow cannot represent) and
+    keyed on the source fingerprint plus caller-supplied key parts, such
+    as the configured sheet names. A small JSON manifest next to the
+    entries remembers the last seen size/mtime/hash of each source so
+    the content hash is only recomputed when the file was touched.
+    """
+
+    cache_dir: Path
+    stats: CacheStats = field(default_factory=CacheStats)
+
+    @property
+    def _manifest_path(self) -> Path:
+        return self.cache_dir / "manifest.json"
+
+    # -------------------------
+    # Manifest
+    # -------------------------
+
+    def _read_manifest(self) -> Dict[str, Dict]:
+        try:
+            with self._manifest_path.open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest: Dict[str, Dict]) -> None:
+        ensure_dir(self.cache_dir)
+        tmp = self._manifest_path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        tmp.replace(self._manifest_path)
+
+    def fingerprint(self, source: Path) -> SourceFingerprint:
+        """
+        Fingerprint ``source``, reusing the stored content hash when the
+        file size and mtime are unchanged since it was last hashed.
+        """
+        source = Path(source).resolve()
+        stat = source.stat()
+        manifest = self._read_manifest()
+        known = manifest.get(str(source), {})
+
+        if known.get("size") == stat.st_size and known.get(
+            "mtime_ns"
+        ) == stat.st_mtime_ns:
+            return SourceFingerprint(stat.st_size, stat.st_mtime_ns, known["sha256"])
+
+        fp = SourceFingerprint(stat.st_size, stat.st_mtime_ns, hash_file(source))
+        if known and known.get("sha256") != fp.sha256:
+            self.stats.invalidations += 1
+            self._evict(known.get("entries", []))
+            known = {}
+
+        manifest[str(source)] = {
+            "size": fp.size,
+            "mtime_ns": fp.mtime_ns,
+            "sha256": fp.sha256,
+            "entries": known.get("entries", []),
+        }
+        try:
+            self._write_manifest(manifest)
+        except OSError as exc:
+            logger.warning("Could not update cache manifest: %s", exc)
+        return fp
+
+    def _register_entry(self, source: Path, entry: Path) -> None:
+        manifest = self._read_manifest()
+        record = manifest.get(str(Path(source).resolve()))
+        if record is None:
+            return
+        if entry.name not in record["entries"]:
+            record["entries"].append(entry.name)
+            self._write_manifest(manifest)
+
+    def _evict(self, names: Sequence[str]) -> None:
+        for name in names:
+            (self.cache_dir / name).unlink(missing_ok=True)
+
+    # -------------------------
+    # Entries
+    # -------------------------
+
+    def _entry_path(self, key: str) -> Optional[Path]:
+        for suffix in (".parquet", ".pkl"):
+            path = self.cache_dir / f"{key}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def _write_entry(self, key: str, df: pd.DataFrame) -> Path:
+        ensure_dir(self.cache_dir)
+        path = self.cache_dir / f"{key}.parquet"
+        try:
+            df.to_parquet(path, index=False)
+            return path
+        except Exception as exc:
+            # Arrow rejects object columns mixing e.g. str and datetime,
+            # and pyarrow itself may be unavailable
+            logger.debug("Parquet write failed (%s); using pickle", exc)
+            path.unlink(missing_ok=True)
+            path = path.with_suffix(".pkl")
+            df.to_pickle(path)
+            return path
+
+    @staticmethod
+    def _read_entry(path: Path) -> pd.DataFrame:
+        if path.suffix != ".parquet":
+            return pd.read_pickle(path)
+
+        import pyarrow.parquet as pq
+
+        df = pd.read_parquet(path)
+
+        # Newer pandas infers the string dtype on read; restore the
+        # object columns recorded in the pandas metadata so a cache hit
+        # is indistinguishable from a fresh parse.
+        meta = pq.read_schema(path).pandas_metadata or {}
+        object_cols = [
+            c["name"]
+            for c in meta.get("columns", [])
+            if c.get("numpy_type") == "object" and c.get("name") in df.columns
+        ]
+        for col in object_cols:
+            if df[col].dtype != object:
+                df[col] = df[col].astype(object)
+        return df
+
+    def get_or_build(
+        self,
+        source: Path,
+        build: Callable[[], pd.DataFrame],
+        key_parts: Sequence[str] = (),
+    ) -> pd.DataFrame:
+        """
+        Return the cached frame for ``source`` or build and store it.
+
+        Parameters
+        ----------
+        source : Path
+            File the frame is derived from.
+        build : callable
+            Zero-argument function producing the frame on a miss.
+        key_parts : sequence of str
+            Extra values that change the derived frame (sheet names,
+            reader options) and therefore belong in the cache key.
+        """
+        fp = self.fingerprint(source)
+        key = fp.key(key_parts)
+        entry = self._entry_path(key)
+
+        if entry is not None:
+            try:
+                df = self._read_entry(entry)
+                self.stats.hits += 1
+                logger.debug("Frame cache hit for %s (%s)", Path(source).name, key)
+                return df
+            except Exception as exc:
+                self.stats.errors += 1
+                logger.warning("Discarding unreadable cache entry %s: %s", entry, exc)
+                entry.unlink(missing_ok=True)
+
+        self.stats.misses += 1
+        df = build()
+
+        try:
+            entry = self._write_entry(key, df)
+            self._register_entry(source, entry)
+            self.stats.writes += 1
+        except OSError as exc:
+            self.stats.errors += 1
+            logger.warning("Could not write frame cache for %s: %s", source, exc)
+
+        return df
+
+    def clear(self) -> None:
+        """Remove every cached entry and the manifest."""
+        if not self.cache_dir.exists():
+            return
+        for path in self.cache_dir.iterdir():
+            if path.suffix in {".parquet", ".pkl", ".json", ".tmp"}:
+                path.unlink(missing_ok=True)
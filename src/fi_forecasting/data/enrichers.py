@@ -1,115 +1,139 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from typing import Dict, Callable, List
+from typing import Dict, Callable
 
 from fi_forecasting.data.additional_parsers import process_additional_data_points
 from fi_forecasting.data.guide_ingestion import (
-    add_indicator_definitions,
-    add_guide_observations,
+    stage_indicator_definitions,
+    stage_guide_observations,
 )
+from fi_forecasting.data.records import IdAllocator, RecordBuffer
+from fi_forecasting.utils.profiling import instrument
+
+INDICATOR_DEF_PREFIX = "IND_DEF_"
+GUIDE_OBS_PREFIX = "OBS_GUIDE_"
+
+# First indicator definition is IND_DEF_01001 on a fresh dataset
+DEFAULT_ID_FLOORS: Dict[str, int] = {INDICATOR_DEF_PREFIX: 1000}
+
+
+def new_id_allocator(df_unified: pd.DataFrame) -> IdAllocator:
+    """
+    Seed an ID allocator from the record_ids of ``df_unified``.
+
+    Pass the returned allocator to successive ``enrich_dataset`` calls
+    on a growing dataset so IDs are never re-derived from the data.
+    """
+    ids = df_unified["record_id"] if "record_id" in df_unified else []
+    return IdAllocator.from_ids(ids, floors=DEFAULT_ID_FLOORS)
+
+
+def _column(df: pd.DataFrame, name: str, default=None) -> pd.Series:
+    if name in df.columns:
+        return df[name]
+    return pd.Series(default, index=df.index, dtype=object)
 
 
 def _build_indicator_definitions(
-    indicators: List[Dict],
+    indicators: pd.DataFrame,
     category: str,
-    start_idx: int,
-) -> List[Dict]:
-    records = []
-    idx = start_idx
-
-    for ind in indicators:
-        idx += 1
-        records.append(
-            {
-                "record_id": f"IND_DEF_{idx:05d}",
-                "record_type": "indicator_definition",
-                "pillar": ind["pillar"],
-                "indicator": ind["indicator"],
-                "indicator_code": ind["indicator_code"],
-                "indicator_direction": (
-                    "positive"
-                    if "positive" in str(ind.get("correlation", "")).lower()
-                    else "negative"
-                ),
-                "source_name": ind.get("source", "Multiple"),
-                "confidence": "medium",
-                "category": category,
-                "notes": ind.get("why_matters"),
-                "collected_by": "Data Scientist",
-                "collection_date": datetime.now().strftime("%Y-%m-%d"),
-            }
-        )
+    allocator: IdAllocator,
+) -> pd.DataFrame:
+    correlation = _column(indicators, "correlation").astype(str).str.lower()
+
+    return pd.DataFrame(
+        {
+            "record_id": allocator.allocate(INDICATOR_DEF_PREFIX, len(indicators)),
+            "record_type": "indicator_definition",
+            "pillar": indicators["pillar"].to_numpy(),
+            "indicator": indicators["indicator"].to_numpy(),
+            "indicator_code": indicators["indicator_code"].to_numpy(),
+            "indicator_direction": np.where(
+                correlation.str.contains("positive"), "positive", "negative"
+            ),
+            "source_name": _column(indicators, "source", "Multiple").to_numpy(),
+            "confidence": "medium",
+            "category": category,
+            "notes": _column(indicators, "why_matters").to_numpy(),
+            "collected_by": "Data Scientist",
+            "collection_date": datetime.now().strftime("%Y-%m-%d"),
+        }
+    )
+
 
-    return records
+def _build_guide_observations(
+    indicators: pd.DataFrame,
+    allocator: IdAllocator,
+) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "record_id": allocator.allocate(GUIDE_OBS_PREFIX, len(indicators)),
+            "record_type": "observation",
+            "pillar": indicators["pillar"].to_numpy(),
+            "indicator": indicators["indicator"].to_numpy(),
+            "indicator_code": indicators["indicator_code"].to_numpy(),
+            "value_numeric": np.nan,
+            "observation_date": None,
+            "source_name": _column(indicators, "source").to_numpy(),
+            "confidence": "medium",
+            "notes": _column(indicators, "why_matters").to_numpy(),
+        }
+    )
 
 
+@instrument
 def enrich_dataset(
     df_unified: pd.DataFrame,
     additional_data: Dict,
     log_fn: Callable | None = None,
+    id_allocator: IdAllocator | None = None,
 ) -> pd.DataFrame:
     """
     Task-1 enrichment orchestrator.
+
+    New records are staged in a ``RecordBuffer`` and appended to
+    ``df_unified`` with a single concat. ``IND_DEF_*`` and
+    ``OBS_GUIDE_*`` IDs come from ``id_allocator``; when enriching one
+    dataset with several guide versions, create it once with
+    ``new_id_allocator`` and pass it to every call.
     """
+    allocator = id_allocator or new_id_allocator(df_unified)
 
     parsed = process_additional_data_points(additional_data)
 
-    direct = parsed.get("direct_indicators", [])
-    indirect = parsed.get("indirect_indicators", [])
+    direct = parsed["direct_indicators"]
+    indirect = parsed["indirect_indicators"]
+
+    buffer = RecordBuffer()
 
     # -------------------------
     # Indicator definitions
     # -------------------------
-    existing_defs = df_unified.query(
-        "record_type == 'indicator_definition'"
-    )
-
-    start_idx = (
-        existing_defs["record_id"]
-        .str.extract(r"(\d+)$")[0]
-        .astype(float)
-        .max()
-    )
-    start_idx = int(start_idx) if pd.notna(start_idx) else 1000
-
-    indicator_defs = (
-        _build_indicator_definitions(direct, "direct_correlation", start_idx)
-        + _build_indicator_definitions(indirect, "indirect_correlation", start_idx + 100)
-    )
-
-    df_enriched = add_indicator_definitions(
-        df_enriched=df_unified,
-        indicator_defs=indicator_defs,
-        log_fn=log_fn,
-    )
+    for indicators, category in (
+        (direct, "direct_correlation"),
+        (indirect, "indirect_correlation"),
+    ):
+        if indicators.empty:
+            continue
+        stage_indicator_definitions(
+            buffer,
+            _build_indicator_definitions(indicators, category, allocator),
+            log_fn=log_fn,
+        )
 
     # -------------------------
     # Guide-derived observations (placeholders)
     # -------------------------
-    guide_observations = []
-
-    for ind in direct + indirect:
-        guide_observations.append(
-            {
-                "record_id": f"OBS_GUIDE_{ind['indicator_code']}",
-                "record_type": "observation",
-                "pillar": ind["pillar"],
-                "indicator": ind["indicator"],
-                "indicator_code": ind["indicator_code"],
-                "value_numeric": None,
-                "observation_date": None,
-                "source_name": ind.get("source"),
-                "confidence": "medium",
-                "notes": ind.get("why_matters"),
-            }
-        )
+    guide_indicators = pd.concat([direct, indirect], ignore_index=True)
 
-    df_enriched = add_guide_observations(
-        df_enriched=df_enriched,
-        observations=guide_observations,
-        log_fn=log_fn,
-    )
+    if not guide_indicators.empty:
+        stage_guide_observations(
+            buffer,
+            _build_guide_observations(guide_indicators, allocator),
+            log_fn=log_fn,
+        )
 
-    return df_enriched
+    return buffer.materialize(df_unified)
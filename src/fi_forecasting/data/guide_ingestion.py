@@ -2,7 +2,11 @@ from __future__ import annotations
 
 import pandas as pd
 from datetime import datetime
-from typing import List, Dict, Callable
+from typing import List, Dict, Callable, Union
+
+from fi_forecasting.data.records import RecordBuffer
+
+Records = Union[List[Dict], pd.DataFrame]
 
 
 def _now() -> str:
@@ -11,36 +15,43 @@ def _now() -> str:
 
 def append_records(
     df: pd.DataFrame,
-    records: List[Dict],
+    records: Records,
 ) -> pd.DataFrame:
     """
-    Append a list of record dicts to a DataFrame safely.
+    Append a list of record dicts (or a DataFrame) to a DataFrame safely.
     """
-    if not records:
-        return df
-
-    return pd.concat(
-        [df, pd.DataFrame.from_records(records)],
-        ignore_index=True,
-    )
+    buffer = RecordBuffer()
+    buffer.add(records)
+    return buffer.materialize(df)
 
 
 # -------------------------------------------------
 # Indicator definitions ingestion
 # -------------------------------------------------
 
-def add_indicator_definitions(
-    df_enriched: pd.DataFrame,
-    indicator_defs: List[Dict],
+def stage_indicator_definitions(
+    buffer: RecordBuffer,
+    indicator_defs: Records,
     log_fn: Callable | None = None,
 ) -> pd.DataFrame:
     """
-    Add indicator_definition records to the dataset.
+    Stage indicator_definition records in ``buffer``.
+
+    Returns the staged batch; nothing is concatenated until the buffer
+    is materialized. A ``log_fn`` exposing ``log_records`` (such as
+    ``EnrichmentLog``) receives the whole batch in one call; any other
+    callable is invoked once per record.
     """
-    df_enriched = append_records(df_enriched, indicator_defs)
+    batch = buffer.add(indicator_defs)
 
-    if log_fn:
-        for ind in indicator_defs:
+    if log_fn is not None and hasattr(log_fn, "log_records"):
+        log_fn.log_records(
+            batch,
+            record_type="indicator_definition",
+            source="Additional Data Points Guide",
+        )
+    elif log_fn is not None:
+        for ind in batch.to_dict("records"):
             log_fn(
                 record_id=ind["record_id"],
                 record_type="indicator_definition",
@@ -50,38 +61,48 @@ def add_indicator_definitions(
                 justification=ind.get("notes"),
             )
 
-    return df_enriched
+    return batch
+
+
+def add_indicator_definitions(
+    df_enriched: pd.DataFrame,
+    indicator_defs: Records,
+    log_fn: Callable | None = None,
+) -> pd.DataFrame:
+    """
+    Add indicator_definition records to the dataset.
+    """
+    buffer = RecordBuffer()
+    stage_indicator_definitions(buffer, indicator_defs, log_fn=log_fn)
+    return buffer.materialize(df_enriched)
 
 
 # -------------------------------------------------
 # Guide-derived observations ingestion
 # -------------------------------------------------
 
-def add_guide_observations(
-    df_enriched: pd.DataFrame,
-    observations: List[Dict],
+def stage_guide_observations(
+    buffer: RecordBuffer,
+    observations: Records,
     collected_by: str = "Data Scientist",
     log_fn: Callable | None = None,
 ) -> pd.DataFrame:
     """
-    Add observations derived from the Additional Data Points Guide.
-    """
-
-    enriched_obs = []
+    Stage observations derived from the Additional Data Points Guide.
 
-    for obs in observations:
-        enriched_obs.append(
-            {
-                **obs,
-                "collected_by": obs.get("collected_by", collected_by),
-                "collection_date": obs.get("collection_date", _now()),
-            }
-        )
-
-    df_enriched = append_records(df_enriched, enriched_obs)
+    ``collected_by`` and ``collection_date`` are filled in where the
+    observations do not provide them.
+    """
+    batch = buffer.add(
+        observations,
+        collected_by=collected_by,
+        collection_date=_now(),
+    )
 
-    if log_fn:
-        for obs in enriched_obs:
+    if log_fn is not None and hasattr(log_fn, "log_records"):
+        log_fn.log_records(batch, record_type="observation")
+    elif log_fn is not None:
+        for obs in batch.to_dict("records"):
             log_fn(
                 record_id=obs["record_id"],
                 record_type="observation",
@@ -91,6 +112,20 @@ def add_guide_observations(
                 justification=obs.get("notes"),
             )
 
-    return df_enriched
+    return batch
 
 
+def add_guide_observations(
+    df_enriched: pd.DataFrame,
+    observations: Records,
+    collected_by: str = "Data Scientist",
+    log_fn: Callable | None = None,
+) -> pd.DataFrame:
+    """
+    Add observations derived from the Additional Data Points Guide.
+    """
+    buffer = RecordBuffer()
+    stage_guide_observations(
+        buffer, observations, collected_by=collected_by, log_fn=log_fn
+    )
+    return buffer.materialize(df_enriched)
@@ -4,9 +4,68 @@ from typing import Dict, Optional
 import pandas as pd
 
 from fi_forecasting.core.settings import settings
+from fi_forecasting.data.cache import CACHE_DIRNAME, CacheStats, FrameCache
+from fi_forecasting.data.schema import UnifiedSchema, apply_schema
+from fi_forecasting.data.workbook_reader import read_workbook
+from fi_forecasting.utils.profiling import instrument
 
+_unified_cache: Optional[FrameCache] = None
 
-def load_unified_excel() -> pd.DataFrame:
+
+def get_unified_cache() -> FrameCache:
+    """
+    Return the frame cache used by ``load_unified_excel``.
+
+    Cache entries live under the configured ``data/interim`` path.
+    """
+    global _unified_cache
+    if _unified_cache is None:
+        interim = settings.paths["data"].get("interim", settings.root / "data/interim")
+        _unified_cache = FrameCache(interim / CACHE_DIRNAME)
+    return _unified_cache
+
+
+def unified_cache_stats() -> CacheStats:
+    """Hit/miss statistics of the unified dataset cache."""
+    return get_unified_cache().stats
+
+
+def _read_unified_excel(
+    path: Path,
+    main_sheet: str,
+    impact_sheet: Optional[str],
+) -> pd.DataFrame:
+    wanted = [main_sheet] + ([impact_sheet] if impact_sheet else [])
+    frames = read_workbook(path, wanted, optional=wanted).frames
+
+    if main_sheet not in frames:
+        raise ValueError(
+            f"Main sheet '{main_sheet}' not found in {path.name}"
+        )
+
+    df_main = frames[main_sheet]
+
+    if df_main.empty:
+        raise ValueError("Main unified sheet is empty")
+
+    # Impact sheet is optional
+    df_impact = frames.get(impact_sheet)
+    if df_impact is None:
+        df_impact = pd.DataFrame(columns=df_main.columns)
+
+    # Align schemas deterministically
+    all_columns = sorted(set(df_main.columns).union(df_impact.columns))
+    df_main = df_main.reindex(columns=all_columns)
+    df_impact = df_impact.reindex(columns=all_columns)
+
+    return pd.concat([df_main, df_impact], ignore_index=True)
+
+
+@instrument
+def load_unified_excel(
+    use_cache: bool = True,
+    path: Optional[Path] = None,
+) -> pd.DataFrame:
     """
     Load the unified Ethiopia financial inclusion Excel dataset.
 
@@ -16,6 +75,22 @@ def load_unified_excel() -> pd.DataFrame:
 
     Both sheets are aligned to a unified schema and concatenated.
 
+    The result is converted to the compact dtypes of ``UnifiedSchema``
+    (dates, categoricals, downcast numerics) and cached on disk (see
+    ``get_unified_cache``), keyed on the workbook size, mtime and content
+    hash plus the configured sheet names and schema, so repeated loads
+    skip the Excel parse and any change to the workbook invalidates the
+    entry.
+
+    Parameters
+    ----------
+    use_cache : bool, default True
+        Read from / write to the on-disk cache. Set to False to force a
+        fresh parse without touching the cache.
+    path : Path, optional
+        Workbook to read instead of the configured ``unified_excel``
+        path (same sheet names), e.g. a synthetic benchmark workbook.
+
     Returns
     -------
     pd.DataFrame
@@ -29,7 +104,7 @@ def load_unified_excel() -> pd.DataFrame:
         If the main sheet is missing or empty.
     """
     cfg = settings.get("datasets", {}).get("unified_excel", {})
-    path = settings.root / cfg.get("path", "")
+    path = Path(path) if path is not None else settings.root / cfg.get("path", "")
     main_sheet = cfg.get("main_sheet")
     impact_sheet = cfg.get("impact_sheet")
 
@@ -39,33 +114,23 @@ def load_unified_excel() -> pd.DataFrame:
     if not main_sheet:
         raise ValueError("Main sheet name not configured for unified_excel")
 
-    xls = pd.ExcelFile(path)
-
-    if main_sheet not in xls.sheet_names:
-        raise ValueError(
-            f"Main sheet '{main_sheet}' not found in {path.name}"
-        )
+    schema = UnifiedSchema.from_settings()
 
-    df_main = pd.read_excel(xls, sheet_name=main_sheet)
-
-    if df_main.empty:
-        raise ValueError("Main unified sheet is empty")
-
-    # Impact sheet is optional
-    if impact_sheet and impact_sheet in xls.sheet_names:
-        df_impact = pd.read_excel(xls, sheet_name=impact_sheet)
-    else:
-        df_impact = pd.DataFrame(columns=df_main.columns)
+    def build() -> pd.DataFrame:
+        return apply_schema(_read_unified_excel(path, main_sheet, impact_sheet), schema)
 
-    # Align schemas deterministically
-    all_columns = sorted(set(df_main.columns).union(df_impact.columns))
-    df_main = df_main.reindex(columns=all_columns)
-    df_impact = df_impact.reindex(columns=all_columns)
+    if not use_cache:
+        return build()
 
-    return pd.concat([df_main, df_impact], ignore_index=True)
+    return get_unified_cache().get_or_build(
+        path,
+        build,
+        key_parts=("unified_excel", main_sheet, impact_sheet or "", schema.signature()),
+    )
 
 
-def load_reference_codes_excel() -> pd.DataFrame:
+@instrument
+def load_reference_codes_excel(parallel: bool = False) -> pd.DataFrame:
     """
     Load reference codes from an Excel file.
 
@@ -73,6 +138,13 @@ def load_reference_codes_excel() -> pd.DataFrame:
     - Single-sheet Excel
     - Multi-sheet Excel (concatenated)
 
+    All sheets are read from a single workbook handle.
+
+    Parameters
+    ----------
+    parallel : bool, default False
+        Parse large sheets in a process pool.
+
     Returns
     -------
     pd.DataFrame
@@ -84,14 +156,10 @@ def load_reference_codes_excel() -> pd.DataFrame:
     if not path.exists():
         raise FileNotFoundError(f"Reference codes Excel not found: {path}")
 
-    xls = pd.ExcelFile(path)
+    workbook = read_workbook(path, parallel=parallel)
+    workbook.log()
 
-    frames = [
-        pd.read_excel(xls, sheet_name=sheet)
-        for sheet in xls.sheet_names
-    ]
-
-    df = pd.concat(frames, ignore_index=True)
+    df = pd.concat(workbook.frames.values(), ignore_index=True)
 
     if df.empty:
         raise ValueError("Reference codes Excel contains no data")
@@ -99,7 +167,19 @@ def load_reference_codes_excel() -> pd.DataFrame:
     return df
 
 
-def load_additional_data_guide() -> Optional[Dict[str, pd.DataFrame]]:
+GUIDE_SHEETS = (
+    "alternative_baselines",
+    "direct_correlation",
+    "indirect_correlation",
+    "market_nuances",
+)
+
+
+@instrument
+def load_additional_data_guide(
+    parallel: bool = False,
+    path: Optional[Path] = None,
+) -> Optional[Dict[str, pd.DataFrame]]:
     """
     Load the Additional Data Points Guide Excel.
 
@@ -109,22 +189,29 @@ def load_additional_data_guide() -> Optional[Dict[str, pd.DataFrame]]:
     2 - Indirect Correlation
     3 - Market Nuances
 
+    The four sheets are read positionally from a single workbook handle.
+
+    Parameters
+    ----------
+    parallel : bool, default False
+        Parse large sheets in a process pool.
+    path : Path, optional
+        Workbook to read instead of the configured guide.
+
     Returns
     -------
     dict[str, pd.DataFrame] or None
         Dictionary of guide sheets, or None if file not found.
     """
     cfg = settings.get("datasets", {}).get("additional_data_guide", {})
-    path = settings.root / cfg.get("path", "")
+    path = Path(path) if path is not None else settings.root / cfg.get("path", "")
 
     if not path.exists():
         return None
 
-    xls = pd.ExcelFile(path)
+    workbook = read_workbook(
+        path, list(range(len(GUIDE_SHEETS))), parallel=parallel
+    )
+    workbook.log()
 
-    return {
-        "alternative_baselines": pd.read_excel(xls, sheet_name=0),
-        "direct_correlation": pd.read_excel(xls, sheet_name=1),
-        "indirect_correlation": pd.read_excel(xls, sheet_name=2),
-        "market_nuances": pd.read_excel(xls, sheet_name=3),
-    }
+    return dict(zip(GUIDE_SHEETS, workbook.frames.values()))
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import pandas as pd
+
+RecordBatch = Union[pd.DataFrame, Sequence[Mapping], Mapping[str, Sequence]]
+
+
+# -------------------------------------------------
+# Record ID allocation
+# -------------------------------------------------
+
+class IdAllocator:
+    """
+    Allocate sequential record IDs per prefix.
+
+    Keeps a high-water mark for every prefix (``"IND_DEF_"``,
+    ``"OBS_GUIDE_"``, ...) so new IDs never collide with IDs already
+    seen or handed out, without rescanning the dataset. Reuse one
+    allocator across enrichment runs that grow the same dataset.
+
+    Example
+    -------
+    >>> alloc = IdAllocator(floors={"IND_DEF_": 1000})
+    >>> alloc.allocate("IND_DEF_", 2)
+    ['IND_DEF_01001', 'IND_DEF_01002']
+    """
+
+    def __init__(
+        self,
+        width: int = 5,
+        floors: Optional[Mapping[str, int]] = None,
+    ):
+        self.width = width
+        self._high: Dict[str, int] = dict(floors or {})
+
+    @classmethod
+    def from_ids(
+        cls,
+        ids: Iterable[str],
+        width: int = 5,
+        floors: Optional[Mapping[str, int]] = None,
+    ) -> "IdAllocator":
+        """Seed high-water marks from existing IDs in one vectorized pass."""
+        allocator = cls(width=width, floors=floors)
+        allocator.observe(ids)
+        return allocator
+
+    def observe(self, ids: Iterable[str]) -> None:
+        """Raise high-water marks to cover ``ids`` (``<prefix><digits>``)."""
+        ids = pd.Series(ids, dtype=object).dropna().astype(str)
+        if ids.empty:
+            return
+
+        parts = ids.str.extract(r"^(?P<prefix>.*?)(?P<num>\d+)$").dropna()
+        if parts.empty:
+            return
+
+        highs = parts["num"].astype("int64").groupby(parts["prefix"]).max()
+        for prefix, value in highs.items():
+            self._high[prefix] = max(self._high.get(prefix, 0), int(value))
+
+    def peek(self, prefix: str) -> int:
+        """Current high-water mark for ``prefix`` (0 if unseen)."""
+        return self._high.get(prefix, 0)
+
+    def allocate(self, prefix: str, n: int = 1) -> List[str]:
+        """Reserve and return the next ``n`` IDs for ``prefix``."""
+        start = self._high.get(prefix, 0)
+        self._high[prefix] = start + n
+        return [f"{prefix}{i:0{self.width}d}" for i in range(start + 1, start + n + 1)]
+
+
+# -------------------------------------------------
+# Record buffer
+# -------------------------------------------------
+
+class RecordBuffer:
+    """
+    Collect record batches and materialize them with a single concat.
+
+    Each batch is normalized to a DataFrame when added, so the final
+    ``materialize`` costs one ``pd.concat`` regardless of how many
+    batches were staged.
+    """
+
+    def __init__(self):
+        self._batches: List[pd.DataFrame] = []
+
+    def __len__(self) -> int:
+        return sum(len(b) for b in self._batches)
+
+    @property
+    def batches(self) -> List[pd.DataFrame]:
+        return list(self._batches)
+
+    def add(self, batch: RecordBatch, **defaults) -> pd.DataFrame:
+        """
+        Stage a batch of records.
+
+        Parameters
+        ----------
+        batch : DataFrame, list of dicts or dict of columns
+            Records to stage.
+        **defaults
+            Column defaults, applied to records that lack the column or
+            carry a missing value for it.
+
+        Returns
+        -------
+        pd.DataFrame
+            The staged batch.
+        """
+        if isinstance(batch, pd.DataFrame):
+            frame = batch
+        elif isinstance(batch, Mapping):
+            frame = pd.DataFrame(batch)
+        else:
+            frame = pd.DataFrame.from_records(list(batch))
+
+        if defaults:
+            frame = frame.assign(
+                **{
+                    k: frame[k].fillna(v) if k in frame.columns else v
+                    for k, v in defaults.items()
+                }
+            )
+
+        if not frame.empty:
+            self._batches.append(frame)
+        return frame
+
+    def to_frame(self) -> pd.DataFrame:
+        """All staged records as one DataFrame."""
+        if not self._batches:
+            return pd.DataFrame()
+        return pd.concat(self._batches, ignore_index=True)
+
+    def materialize(self, base: pd.DataFrame) -> pd.DataFrame:
+        """Append every staged batch to ``base`` in one concat."""
+        if not self._batches:
+            return base
+        return pd.concat([base, *self._batches], ignore_index=True)
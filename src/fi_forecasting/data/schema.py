@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fi_forecasting.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------
+# Schema definition
+# ---------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class UnifiedSchema:
+    """
+    Dtype policy for unified-dataset frames.
+
+    Parameters
+    ----------
+    date_columns : sequence of str
+        Parsed to ``datetime64``.
+    numeric_columns : sequence of str
+        Coerced to numbers (unparseable values become NaN).
+    categorical_columns : sequence of str
+        Stored as ``category``.
+    sparse_threshold : float
+        Other text columns with at least this share of missing values
+        are stored as ``category`` (a few small codes instead of one
+        object pointer per row).
+    max_category_ratio : float
+        Other text columns whose distinct/non-null ratio is at or below
+        this value are stored as ``category`` as well.
+    downcast_numeric : bool
+        Downcast integers to the smallest type and floats to float32
+        when that is lossless.
+    """
+
+    date_columns: Tuple[str, ...] = ()
+    numeric_columns: Tuple[str, ...] = ()
+    categorical_columns: Tuple[str, ...] = ()
+    sparse_threshold: float = 0.5
+    max_category_ratio: float = 0.5
+    downcast_numeric: bool = True
+
+    @classmethod
+    def from_settings(cls, **overrides) -> "UnifiedSchema":
+        """Build the schema from ``data.unified`` in ``config/data.yaml``."""
+        cfg = settings.get("data", {}).get("unified", {})
+        return cls(
+            date_columns=tuple(cfg.get("date_columns", ())),
+            numeric_columns=tuple(cfg.get("numeric_columns", ())),
+            categorical_columns=tuple(cfg.get("categorical_columns", ())),
+            **overrides,
+        )
+
+    def signature(self) -> str:
+        """Stable string identifying the policy (for cache keys)."""
+        return "|".join(
+            [
+                ",".join(self.date_columns),
+                ",".join(self.numeric_columns),
+                ",".join(self.categorical_columns),
+                f"{self.sparse_threshold}:{self.max_category_ratio}",
+                str(self.downcast_numeric),
+            ]
+        )
+
+
+# ---------------------------------------------------------------------
+# Column converters
+# ---------------------------------------------------------------------
+
+def _to_datetime(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    parsed = pd.to_datetime(values, errors="coerce", format="ISO8601")
+    retry = parsed.isna() & values.notna()
+    if retry.any():
+        # Non-ISO strings (e.g. "Dec 2024"); parse only those rows
+        parsed[retry] = pd.to_datetime(values[retry], errors="coerce", format="mixed")
+    return parsed
+
+
+def _to_category(values: pd.Series) -> pd.Series:
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values
+    return values.astype("category")
+
+
+def _is_text(values: pd.Series) -> bool:
+    return pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)
+
+
+def _downcast(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_bool_dtype(values):
+        return values
+    if pd.api.types.is_integer_dtype(values):
+        return pd.to_numeric(values, downcast="integer")
+    if pd.api.types.is_float_dtype(values) and values.dtype != np.float32:
+        arr = values.to_numpy()
+        small = arr.astype(np.float32)
+        finite = ~np.isnan(arr)
+        if np.array_equal(small[finite].astype(arr.dtype), arr[finite]):
+            return pd.Series(small, index=values.index, name=values.name)
+    return values
+
+
+def _compact_text(values: pd.Series, schema: UnifiedSchema) -> pd.Series:
+    n = len(values)
+    if n == 0:
+        return values
+    non_null = values.notna()
+    n_valid = int(non_null.sum())
+    if n_valid == 0 or 1 - n_valid / n >= schema.sparse_threshold:
+        return values.astype("category")
+    try:
+        distinct = values.nunique(dropna=True)
+    except TypeError:
+        # Unhashable cells (lists, dicts); leave the column alone
+        return values
+    if distinct / n_valid <= schema.max_category_ratio:
+        return values.astype("category")
+    return values
+
+
+# ---------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-column memory (deep) and dtype before/after a conversion, with a
+    ``TOTAL`` row.
+    """
+    cols = list(after.columns)
+    mem_before = before.memory_usage(deep=True, index=False).reindex(cols)
+    mem_after = after.memory_usage(deep=True, index=False).reindex(cols)
+    report = pd.DataFrame(
+        {
+            "column": cols,
+            "dtype_before": [
+                str(before[c].dtype) if c in before else None for c in cols
+            ],
+            "dtype_after": [str(after[c].dtype) for c in cols],
+            "bytes_before": mem_before.to_numpy(),
+            "bytes_after": mem_after.to_numpy(),
+        }
+    )
+    total = pd.DataFrame(
+        {
+            "column": ["TOTAL"],
+            "dtype_before": [None],
+            "dtype_after": [None],
+            "bytes_before": [report["bytes_before"].sum()],
+            "bytes_after": [report["bytes_after"].sum()],
+        }
+    )
+    report = pd.concat([report, total], ignore_index=True)
+    report["ratio"] = report["bytes_before"] / report["bytes_after"].replace(0, np.nan)
+    return report
+
+
+def apply_schema(
+    df: pd.DataFrame,
+    schema: Optional[UnifiedSchema] = None,
+    return_report: bool = False,
+    skip: Sequence[str] = (),
+):
+    """
+    Convert a unified-dataset frame to the configured compact dtypes.
+
+    - ``date_columns`` -> ``datetime64`` (unparseable values become NaT)
+    - ``numeric_columns`` -> numbers (unparseable values become NaN)
+    - ``categorical_columns`` -> ``category``
+    - numeric columns -> smallest lossless integer / float32
+    - remaining sparse or low-cardinality text -> ``category``
+
+    Columns that are absent are ignored. The input frame is not modified.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Frame to convert.
+    schema : UnifiedSchema, optional
+        Defaults to ``UnifiedSchema.from_settings()``.
+    return_report : bool, default False
+        Also return the ``memory_report`` of the conversion.
+    skip : sequence of str
+        Columns to leave untouched.
+
+    Returns
+    -------
+    pd.DataFrame or (pd.DataFrame, pd.DataFrame)
+    """
+    schema = schema or UnifiedSchema.from_settings()
+    dates = set(schema.date_columns)
+    numerics = set(schema.numeric_columns)
+    categoricals = set(schema.categorical_columns)
+
+    converted = {}
+    for col in df.columns:
+        if col in skip:
+            continue
+        values = df[col]
+        if col in dates:
+            converted[col] = _to_datetime(values)
+        elif col in categoricals:
+            converted[col] = _to_category(values)
+        elif col in numerics and not pd.api.types.is_numeric_dtype(values):
+            values = pd.to_numeric(values, errors="coerce")
+            converted[col] = _downcast(values) if schema.downcast_numeric else values
+        elif pd.api.types.is_numeric_dtype(values):
+            if schema.downcast_numeric:
+                converted[col] = _downcast(values)
+        elif _is_text(values):
+            converted[col] = _compact_text(values, schema)
+
+    out = df.copy(deep=False)
+    for col, values in converted.items():
+        out[col] = values
+
+    if not return_report:
+        return out
+
+    report = memory_report(df, out)
+    total = report.iloc[-1]
+    logger.info(
+        "Schema applied: %.1f MB -> %.1f MB",
+        total["bytes_before"] / 1e6,
+        total["bytes_after"] / 1e6,
+    )
+    return out, report
+
+
+def fill_unknown(values: pd.Series, fill: str = "unknown") -> pd.Series:
+    """``fillna(fill)`` that also works for categorical columns."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        if fill not in values.cat.categories:
+            values = values.cat.add_categories([fill])
+    return values.fillna(fill)
@@ -1,6 +1,8 @@
 import pandas as pd
 from pathlib import Path
 
+from fi_forecasting.data.validation_engine import ValidationPlan
+
 
 def load_reference_codes(path: Path) -> pd.DataFrame:
     """
@@ -22,16 +24,14 @@ def validate_against_reference_codes(
 ) -> None:
     """
     Validate categorical fields using reference_codes table.
+
+    Raises on the first failing field. Use
+    ``validation_engine.ValidationPlan`` for a report of every violation.
     """
-    for field in reference_df["field"].unique():
-        valid = set(
-            reference_df.loc[
-                reference_df["field"] == field, "valid_value"
-            ]
-        )
-        observed = set(df[field].dropna())
-        invalid = observed - valid
-        if invalid:
-            raise ValueError(
-                f"Invalid values for {field}: {sorted(invalid)}"
-            )
+    plan = ValidationPlan.compile(
+        reference_df=reference_df,
+        required_columns=(),
+        record_types=None,
+        non_null={},
+    )
+    plan.run(df).raise_if_failed()
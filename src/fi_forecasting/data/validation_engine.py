@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from fi_forecasting.data.validators import REQUIRED_COLUMNS, VALID_RECORD_TYPES
+from fi_forecasting.utils.profiling import instrument
+
+MAX_SAMPLE_VALUES = 20
+
+
+# ---------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------
+
+@dataclass
+class Violation:
+    """All rows failing one rule on one column."""
+
+    rule: str
+    column: Optional[str]
+    message: str
+    rows: np.ndarray = field(default_factory=lambda: np.array([], dtype=object))
+    values: List = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.rows)
+
+
+@dataclass
+class ValidationReport:
+    """
+    Outcome of running a ``ValidationPlan``.
+
+    Every violation is kept (not just the first), with the offending row
+    labels and a sample of invalid values.
+    """
+
+    n_rows: int = 0
+    violations: List[Violation] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per violation with counts and sample values."""
+        return pd.DataFrame(
+            [
+                {
+                    "rule": v.rule,
+                    "column": v.column,
+                    "count": v.count,
+                    "message": v.message,
+                    "sample_values": v.values[:MAX_SAMPLE_VALUES],
+                }
+                for v in self.violations
+            ],
+            columns=["rule", "column", "count", "message", "sample_values"],
+        )
+
+    def rows(self) -> pd.DataFrame:
+        """Long frame of (rule, column, row) for every failing row."""
+        frames = [
+            pd.DataFrame({"rule": v.rule, "column": v.column, "row": v.rows})
+            for v in self.violations
+            if v.count
+        ]
+        if not frames:
+            return pd.DataFrame(columns=["rule", "column", "row"])
+        return pd.concat(frames, ignore_index=True)
+
+    def raise_if_failed(self) -> None:
+        """Raise ``ValueError`` describing the first violation, if any."""
+        if self.violations:
+            raise ValueError(self.violations[0].message)
+
+    def merge(self, other: "ValidationReport") -> "ValidationReport":
+        """Combine reports from consecutive chunks of one dataset."""
+        merged: Dict[tuple, Violation] = {
+            (v.rule, v.column): Violation(
+                v.rule, v.column, v.message, v.rows, list(v.values)
+            )
+            for v in self.violations
+        }
+        for v in other.violations:
+            key = (v.rule, v.column)
+            if key not in merged:
+                merged[key] = Violation(
+                    v.rule, v.column, v.message, v.rows, list(v.values)
+                )
+                continue
+            current = merged[key]
+            current.rows = np.concatenate([current.rows, v.rows])
+            current.values = list(dict.fromkeys([*current.values, *v.values]))
+            if current.rule == "allowed_values":
+                current.message = _membership_message(current.column, current.values)
+
+        timings = dict(self.timings)
+        for rule, seconds in other.timings.items():
+            timings[rule] = timings.get(rule, 0.0) + seconds
+
+        return ValidationReport(
+            n_rows=self.n_rows + other.n_rows,
+            violations=list(merged.values()),
+            timings=timings,
+            seconds=self.seconds + other.seconds,
+        )
+
+
+def _membership_message(column: str, values: Sequence) -> str:
+    shown = sorted(map(str, values))
+    return f"Invalid values for {column}: {shown}"
+
+
+# ---------------------------------------------------------------------
+# Compiled plan
+# ---------------------------------------------------------------------
+
+def _invalid_mask(values: pd.Series, allowed: pd.Index) -> np.ndarray:
+    """Non-null values of ``values`` that are not in ``allowed``."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Check each category once, then broadcast through the codes
+        bad_categories = ~values.cat.categories.isin(allowed)
+        codes = values.cat.codes.to_numpy()
+        return (codes >= 0) & bad_categories[np.maximum(codes, 0)]
+    return (values.notna() & ~values.isin(allowed)).to_numpy()
+
+
+@dataclass
+class ValidationPlan:
+    """
+    Validation rules compiled once and applied in a vectorized pass.
+
+    Parameters
+    ----------
+    required_columns : sequence of str
+        Columns that must be present.
+    allowed_values : mapping of column -> pd.Index
+        Categorical membership rules; null values are allowed.
+    non_null : mapping of record_type -> columns
+        Columns that must be non-null for rows of that record type.
+
+    Example
+    -------
+    >>> plan = ValidationPlan.compile(reference_df=ref_codes)
+    >>> report = plan.run(df)
+    >>> report.to_frame()
+    """
+
+    required_columns: Sequence[str] = ()
+    allowed_values: Mapping[str, pd.Index] = field(default_factory=dict)
+    non_null: Mapping[str, Sequence[str]] = field(default_factory=dict)
+
+    @classmethod
+    def compile(
+        cls,
+        reference_df: Optional[pd.DataFrame] = None,
+        required_columns: Sequence[str] = tuple(REQUIRED_COLUMNS),
+        record_types: Optional[Iterable[str]] = VALID_RECORD_TYPES,
+        non_null: Optional[Mapping[str, Sequence[str]]] = None,
+    ) -> "ValidationPlan":
+        """
+        Build a plan from the reference-codes table and schema rules.
+
+        ``reference_df`` must have ``field`` and ``valid_value`` columns;
+        its allowed values are grouped once per field. ``record_types``
+        adds a membership rule for ``record_type`` unless the reference
+        table already covers that field.
+        """
+        allowed: Dict[str, pd.Index] = {}
+
+        if reference_df is not None and not reference_df.empty:
+            grouped = reference_df.groupby("field", sort=False)["valid_value"]
+            for name, values in grouped:
+                allowed[name] = pd.Index(values.dropna().unique())
+
+        if record_types is not None and "record_type" not in allowed:
+            allowed["record_type"] = pd.Index(sorted(record_types))
+
+        if non_null is None:
+            non_null = {"observation": ["value_numeric"]}
+
+        return cls(
+            required_columns=tuple(required_columns),
+            allowed_values=allowed,
+            non_null={k: tuple(v) for k, v in non_null.items()},
+        )
+
+    # -------------------------
+    # Execution
+    # -------------------------
+
+    def run(self, df: pd.DataFrame) -> ValidationReport:
+        """Run every rule against ``df`` and collect all violations."""
+        start = time.perf_counter()
+        report = ValidationReport(n_rows=len(df))
+        index = df.index.to_numpy()
+
+        def timed(rule: str, t0: float) -> None:
+            report.timings[rule] = report.timings.get(rule, 0.0) + (
+                time.perf_counter() - t0
+            )
+
+        # Required columns
+        t0 = time.perf_counter()
+        missing = [c for c in self.required_columns if c not in df.columns]
+        if missing:
+            report.violations.append(
+                Violation(
+                    "required_columns",
+                    None,
+                    f"Missing required columns: {sorted(missing)}",
+                    values=sorted(missing),
+                )
+            )
+        timed("required_columns", t0)
+
+        # Categorical membership
+        t0 = time.perf_counter()
+        for column, allowed in self.allowed_values.items():
+            if column not in df.columns:
+                if column not in self.required_columns:
+                    report.violations.append(
+                        Violation(
+                            "missing_column",
+                            column,
+                            f"Column '{column}' is missing",
+                        )
+                    )
+                continue
+
+            mask = _invalid_mask(df[column], allowed)
+            if mask.any():
+                invalid = df[column].to_numpy()[mask]
+                values = list(pd.unique(invalid))
+                report.violations.append(
+                    Violation(
+                        "allowed_values",
+                        column,
+                        _membership_message(column, values),
+                        rows=index[mask],
+                        values=values,
+                    )
+                )
+        timed("allowed_values", t0)
+
+        # Conditional non-null
+        t0 = time.perf_counter()
+        if self.non_null and "record_type" in df.columns:
+            record_type = df["record_type"]
+            for rtype, columns in self.non_null.items():
+                is_type = (record_type == rtype).to_numpy()
+                if not is_type.any():
+                    continue
+                for column in columns:
+                    if column not in df.columns:
+                        continue
+                    mask = is_type & df[column].isna().to_numpy()
+                    if mask.any():
+                        report.violations.append(
+                            Violation(
+                                "non_null",
+                                column,
+                                f"{rtype.capitalize()} records contain null {column}",
+                                rows=index[mask],
+                            )
+                        )
+        timed("non_null", t0)
+
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def run_chunks(self, chunks: Iterable[pd.DataFrame]) -> ValidationReport:
+        """
+        Validate an iterable of frames (e.g. ``pd.read_csv(chunksize=...)``)
+        and merge the per-chunk reports.
+        """
+        report = ValidationReport()
+        for chunk in chunks:
+            report = report.merge(self.run(chunk))
+        return report
+
+    def run_chunked(
+        self, df: pd.DataFrame, chunk_size: int = 1_000_000
+    ) -> ValidationReport:
+        """Validate ``df`` in slices of ``chunk_size`` rows."""
+        return self.run_chunks(
+            df.iloc[start:start + chunk_size]
+            for start in range(0, max(len(df), 1), chunk_size)
+        )
+
+
+@instrument
+def validate_dataset(
+    df: pd.DataFrame,
+    reference_df: Optional[pd.DataFrame] = None,
+    chunk_size: Optional[int] = None,
+) -> ValidationReport:
+    """
+    Run the default unified-dataset checks and return the full report.
+
+    Covers required columns, record types, non-null observation values
+    and, when ``reference_df`` is given, reference-code membership.
+    """
+    plan = ValidationPlan.compile(reference_df=reference_df)
+    if chunk_size:
+        return plan.run_chunked(df, chunk_size)
+    return plan.run(df)
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import logging
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SheetRef = Union[str, int]
+
+# Sheets whose uncompressed XML is at least this large are parsed in a
+# worker process when ``parallel=True``; smaller sheets are cheaper to
+# parse inline than to ship to a pool.
+PARALLEL_MIN_BYTES = 2 * 1024 * 1024
+
+_NS = {
+    "main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+_REL_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+
+
+# ---------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------
+
+@dataclass
+class SheetStats:
+    sheet: str
+    rows: int
+    columns: int
+    seconds: float
+    xml_bytes: Optional[int] = None
+    parallel: bool = False
+
+
+@dataclass
+class WorkbookRead:
+    """Frames read from one workbook together with per-sheet timings."""
+
+    path: Path
+    frames: Dict[str, pd.DataFrame]
+    stats: List[SheetStats] = field(default_factory=list)
+    open_seconds: float = 0.0
+    total_seconds: float = 0.0
+
+    def report(self) -> pd.DataFrame:
+        """Per-sheet timings and row counts, slowest sheet first."""
+        df = pd.DataFrame([s.__dict__ for s in self.stats])
+        if df.empty:
+            return df
+        return df.sort_values("seconds", ascending=False, ignore_index=True)
+
+    def log(self, level: int = logging.INFO) -> None:
+        for s in sorted(self.stats, key=lambda s: s.seconds, reverse=True):
+            logger.log(
+                level,
+                "%s[%s]: %d rows x %d cols in %.3fs%s",
+                self.path.name,
+                s.sheet,
+                s.rows,
+                s.columns,
+                s.seconds,
+                " (pool)" if s.parallel else "",
+            )
+        logger.log(
+            level,
+            "%s: %d sheet(s) in %.3fs (open %.3fs)",
+            self.path.name,
+            len(self.stats),
+            self.total_seconds,
+            self.open_seconds,
+        )
+
+
+# ---------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------
+
+def sheet_xml_sizes(path: Path) -> Dict[str, int]:
+    """
+    Map sheet names to the uncompressed size of their XML part.
+
+    Reads only the workbook manifest from the zip container, so it is
+    cheap even for large workbooks. Returns an empty dict for files that
+    are not OOXML workbooks.
+    """
+    try:
+        with zipfile.ZipFile(path) as zf:
+            workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+            rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+            targets = {
+                r.get("Id"): r.get("Target").lstrip("/")
+                for r in rels.findall("rel:Relationship", _NS)
+            }
+            sizes: Dict[str, int] = {}
+            for sheet in workbook.findall("main:sheets/main:sheet", _NS):
+                target = targets.get(sheet.get(_REL_ID), "")
+                member = target if target.startswith("xl/") else f"xl/{target}"
+                try:
+                    sizes[sheet.get("name")] = zf.getinfo(member).file_size
+                except KeyError:
+                    continue
+            return sizes
+    except (zipfile.BadZipFile, KeyError, ET.ParseError, OSError):
+        return {}
+
+
+def _parse_sheet(path: str, sheet: str, read_kwargs: Dict) -> tuple:
+    """Worker entry point: parse a single sheet and time it."""
+    start = time.perf_counter()
+    df = pd.read_excel(path, sheet_name=sheet, **read_kwargs)
+    return df, time.perf_counter() - start
+
+
+def _resolve_sheets(
+    available: Sequence[str],
+    sheets: Optional[Sequence[SheetRef]],
+    optional: Sequence[str] = (),
+) -> List[str]:
+    if sheets is None:
+        return list(available)
+
+    resolved = []
+    for ref in sheets:
+        if ref in optional and ref not in available:
+            continue
+        if isinstance(ref, int):
+            try:
+                resolved.append(available[ref])
+            except IndexError:
+                raise ValueError(
+                    f"Sheet index {ref} out of range ({len(available)} sheets)"
+                ) from None
+        elif ref in available:
+            resolved.append(ref)
+        else:
+            raise ValueError(f"Sheet '{ref}' not found")
+    return resolved
+
+
+# ---------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------
+
+def read_workbook(
+    path: Path,
+    sheets: Optional[Sequence[SheetRef]] = None,
+    *,
+    optional: Sequence[str] = (),
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    parallel_min_bytes: int = PARALLEL_MIN_BYTES,
+    **read_kwargs,
+) -> WorkbookRead:
+    """
+    Read several sheets of an Excel workbook in one pass.
+
+    The workbook is opened once and every requested sheet is parsed from
+    that handle, mirroring ``pd.read_excel(sheet_name=None)`` while
+    recording a timing and row count per sheet. With ``parallel=True``
+    sheets whose XML part exceeds ``parallel_min_bytes`` are parsed in a
+    process pool while the remaining sheets are parsed inline.
+
+    Parameters
+    ----------
+    path : Path
+        Workbook to read.
+    sheets : sequence of str or int, optional
+        Sheet names or positions to read. ``None`` reads every sheet.
+    optional : sequence of str
+        Sheet names that are skipped, rather than raising, when absent.
+    parallel : bool, default False
+        Parse large sheets in worker processes.
+    max_workers : int, optional
+        Pool size; defaults to the number of large sheets.
+    parallel_min_bytes : int
+        Minimum uncompressed sheet XML size for pool parsing.
+    **read_kwargs
+        Forwarded to ``pd.read_excel`` / ``ExcelFile.parse``.
+
+    Returns
+    -------
+    WorkbookRead
+        Frames keyed by sheet name, in request order, plus statistics.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the workbook does not exist.
+    ValueError
+        If a requested, non-optional sheet is missing.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Workbook not found: {path}")
+
+    total_start = time.perf_counter()
+
+    with pd.ExcelFile(path) as xls:
+        open_seconds = time.perf_counter() - total_start
+        names = _resolve_sheets(xls.sheet_names, sheets, optional)
+
+        sizes = sheet_xml_sizes(path) if parallel else {}
+        pooled = [n for n in names if sizes.get(n, 0) >= parallel_min_bytes]
+        if len(pooled) < 2 and len(names) == len(pooled):
+            # A single large sheet gains nothing from a pool
+            pooled = []
+
+        frames: Dict[str, pd.DataFrame] = {}
+        stats: Dict[str, SheetStats] = {}
+
+        executor = None
+        futures = {}
+        if pooled:
+            executor = ProcessPoolExecutor(max_workers=max_workers or len(pooled))
+            futures = {
+                name: executor.submit(_parse_sheet, str(path), name, read_kwargs)
+                for name in pooled
+            }
+
+        try:
+            for name in names:
+                if name in futures:
+                    continue
+                start = time.perf_counter()
+                df = xls.parse(name, **read_kwargs)
+                frames[name] = df
+                stats[name] = SheetStats(
+                    name, len(df), df.shape[1], time.perf_counter() - start,
+                    sizes.get(name),
+                )
+
+            for name, future in futures.items():
+                df, seconds = future.result()
+                frames[name] = df
+                stats[name] = SheetStats(
+                    name, len(df), df.shape[1], seconds, sizes.get(name), True
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    result = WorkbookRead(
+        path=path,
+        frames={name: frames[name] for name in names},
+        stats=[stats[name] for name in names],
+        open_seconds=open_seconds,
+        total_seconds=time.perf_counter() - total_start,
+    )
+    result.log(logging.DEBUG)
+    return result
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from fi_forecasting.core.settings import settings
+from fi_forecasting.utils.profiling import instrument
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------
+
+def forecast_config() -> dict:
+    """The ``forecast`` section of the merged config (may be empty)."""
+    return settings.get("forecast", {}) or {}
+
+
+def default_horizon() -> List[int]:
+    """Forecast years from ``forecast.horizon`` in ``config/forecast.yaml``."""
+    return list(forecast_config().get("horizon", [2025, 2026, 2027]))
+
+
+# ---------------------------------------------------------------------
+# Panel construction
+# ---------------------------------------------------------------------
+
+@instrument
+def year_panel(
+    df: pd.DataFrame,
+    group_cols: Sequence[str] = ("indicator_code",),
+    date_col: str = "observation_date",
+    value_col: str = "value_numeric",
+    indicators: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Pivot long observations to a (year x series) panel of yearly means.
+
+    Series are identified by ``group_cols``; with more than one group
+    column the panel columns are a MultiIndex (e.g. indicator x region x
+    gender). Missing years stay NaN and are masked out by ``fit_trends``.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Long observations.
+    group_cols : sequence of str
+        Series keys.
+    indicators : sequence of str, optional
+        Restrict to these ``indicator_code`` values.
+
+    Returns
+    -------
+    pd.DataFrame
+        Indexed by integer year, one column per series.
+    """
+    group_cols = list(group_cols)
+    missing = [c for c in group_cols + [date_col, value_col] if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns in dataset: {missing}")
+
+    data = df
+    if indicators is not None:
+        data = data[data["indicator_code"].isin(indicators)]
+
+    dates = data[date_col]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, errors="coerce", format="mixed")
+
+    data = pd.DataFrame(
+        {
+            **{c: data[c] for c in group_cols},
+            "year": dates.dt.year,
+            value_col: pd.to_numeric(data[value_col], errors="coerce"),
+        }
+    ).dropna(subset=["year", value_col])
+    data["year"] = data["year"].astype(int)
+
+    panel = (
+        data.groupby(["year"] + group_cols, observed=True)[value_col]
+        .mean()
+        .unstack(group_cols)
+        .sort_index()
+    )
+    return panel
+
+
+# ---------------------------------------------------------------------
+# Fit result
+# ---------------------------------------------------------------------
+
+def _powers(t: np.ndarray, degree: int) -> np.ndarray:
+    """Stack ``t**0 .. t**degree`` along a new last axis."""
+    return np.stack([t ** k for k in range(degree + 1)], axis=-1)
+
+
+@dataclass
+class TrendFit:
+    """
+    Polynomial trends fitted jointly for every series of a panel.
+
+    Time enters each series' design centered on that series' mean
+    observed year (``center``), which keeps the normal equations well
+    conditioned. ``params[:, 0]`` is therefore the fitted level at the
+    center and ``params[:, 1]`` the yearly slope.
+
+    Attributes
+    ----------
+    series : pd.Index
+        Panel columns, one per fitted series.
+    periods : np.ndarray
+        Years of the fitting panel.
+    degree : int
+        Polynomial degree (1 = linear trend).
+    params : np.ndarray
+        (n_series, degree + 1) coefficients; NaN for series with too few
+        observations.
+    center : np.ndarray
+        Per-series time origin.
+    n_obs : np.ndarray
+        Observed years per series.
+    sigma2 : np.ndarray
+        Residual variance ``SSR / (n_obs - degree - 1)``; NaN when there
+        are no residual degrees of freedom.
+    cov_unscaled : np.ndarray
+        (n_series, p, p) ``(X'X)^-1``; multiply by ``sigma2`` for the
+        parameter covariance.
+    residuals : np.ndarray
+        (n_periods, n_series) in-sample residuals, NaN where unobserved.
+    """
+
+    series: pd.Index
+    periods: np.ndarray
+    degree: int
+    params: np.ndarray
+    center: np.ndarray
+    n_obs: np.ndarray
+    sigma2: np.ndarray
+    cov_unscaled: np.ndarray
+    residuals: np.ndarray
+
+    @property
+    def dof(self) -> np.ndarray:
+        return self.n_obs - (self.degree + 1)
+
+    @property
+    def residual_std(self) -> np.ndarray:
+        return np.sqrt(self.sigma2)
+
+    def _design(self, periods: Sequence[float]) -> np.ndarray:
+        t = np.asarray(periods, dtype=float)[:, None] - self.center[None, :]
+        return _powers(t, self.degree)
+
+    def predict(self, periods: Sequence[float], return_se: bool = False):
+        """
+        Trend values for ``periods`` (years), one column per series.
+
+        With ``return_se=True`` also returns the standard error of the
+        fitted mean at each period.
+        """
+        periods = np.asarray(periods)
+        X = self._design(periods)
+        mean = np.einsum("tnp,np->tn", X, self.params)
+        pred = pd.DataFrame(
+            mean, index=pd.Index(periods, name="year"), columns=self.series
+        )
+        if not return_se:
+            return pred
+
+        var = np.einsum("tnp,npq,tnq->tn", X, self.cov_unscaled, X) * self.sigma2
+        se = pd.DataFrame(np.sqrt(var), index=pred.index, columns=self.series)
+        return pred, se
+
+    def fitted(self) -> pd.DataFrame:
+        """In-sample trend values over the fitting periods."""
+        return self.predict(self.periods)
+
+    def residual_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            self.residuals,
+            index=pd.Index(self.periods, name="year"),
+            columns=self.series,
+        )
+
+    def params_frame(self) -> pd.DataFrame:
+        """Coefficients and fit statistics, one row per series."""
+        names = ["level", "slope"] + [f"t{k}" for k in range(2, self.degree + 1)]
+        out = pd.DataFrame(
+            self.params, index=self.series, columns=names[: self.degree + 1]
+        )
+        out["center"] = self.center
+        out["n_obs"] = self.n_obs
+        out["sigma2"] = self.sigma2
+        return out
+
+
+# ---------------------------------------------------------------------
+# Fitting
+# ---------------------------------------------------------------------
+
+@instrument
+def fit_trends(
+    panel: pd.DataFrame,
+    degree: Optional[int] = None,
+    min_obs: Optional[int] = None,
+) -> TrendFit:
+    """
+    Fit a polynomial time trend to every column of ``panel`` at once.
+
+    All series are solved together: the masked design and the per-series
+    normal equations are built with ``einsum`` and inverted as one stack
+    with ``np.linalg.pinv``, so the cost is a handful of array passes
+    over the (years x series) matrix instead of one model per series.
+    Missing years are excluded per series.
+
+    Parameters
+    ----------
+    panel : pd.DataFrame
+        Indexed by year, one column per series (see ``year_panel``).
+    degree : int, optional
+        Polynomial degree; defaults to ``forecast.trend.degree`` or 1.
+    min_obs : int, optional
+        Series with fewer observations get NaN parameters. Defaults to
+        ``degree + 1``.
+
+    Returns
+    -------
+    TrendFit
+    """
+    if degree is None:
+        degree = int(forecast_config().get("trend", {}).get("degree", 1))
+    p = degree + 1
+    min_obs = p if min_obs is None else max(int(min_obs), p)
+
+    periods = np.asarray(panel.index, dtype=float)
+    Y = panel.to_numpy(dtype=float)
+    mask = np.isfinite(Y)
+    W = mask.astype(float)
+    Y0 = np.where(mask, Y, 0.0)
+
+    n_obs = mask.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        center = (W * periods[:, None]).sum(axis=0) / n_obs
+    center = np.where(n_obs > 0, center, 0.0)
+
+    t = periods[:, None] - center[None, :]
+    X = _powers(t, degree)                                  # (T, N, p)
+
+    gram = np.einsum("tn,tnp,tnq->npq", W, X, X)            # (N, p, p)
+    xty = np.einsum("tn,tnp,tn->np", W, X, Y0)              # (N, p)
+    cov_unscaled = np.linalg.pinv(gram)
+    params = np.einsum("npq,nq->np", cov_unscaled, xty)
+
+    fitted = np.einsum("tnp,np->tn", X, params)
+    residuals = np.where(mask, Y - fitted, np.nan)
+
+    dof = n_obs - p
+    ssr = np.nansum(residuals ** 2, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sigma2 = np.where(dof > 0, ssr / dof, np.nan)
+
+    short = n_obs < min_obs
+    if short.any():
+        logger.debug(
+            "%d of %d series have fewer than %d observations; left unfitted",
+            int(short.sum()), len(n_obs), min_obs,
+        )
+        params[short] = np.nan
+        sigma2[short] = np.nan
+        residuals[:, short] = np.nan
+
+    return TrendFit(
+        series=panel.columns,
+        periods=np.asarray(panel.index),
+        degree=degree,
+        params=params,
+        center=center,
+        n_obs=n_obs,
+        sigma2=sigma2,
+        cov_unscaled=cov_unscaled,
+        residuals=residuals,
+    )
+
+
+@instrument
+def forecast_trends(
+    panel: pd.DataFrame,
+    horizon: Optional[Sequence[int]] = None,
+    degree: Optional[int] = None,
+    min_obs: Optional[int] = None,
+):
+    """
+    Fit every series once and forecast ``horizon`` years.
+
+    Returns
+    -------
+    (pd.DataFrame, TrendFit)
+        Point forecasts (horizon x series) and the fit, which carries the
+        residual variances and parameters needed for intervals.
+    """
+    fit = fit_trends(panel, degree=degree, min_obs=min_obs)
+    horizon = default_horizon() if horizon is None else list(horizon)
+    return fit.predict(horizon), fit
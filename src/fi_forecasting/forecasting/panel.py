@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.special import stdtrit
+
+from fi_forecasting.forecasting.forecaster import (
+    default_horizon,
+    fit_trends,
+    forecast_config,
+    year_panel,
+)
+from fi_forecasting.utils.profiling import instrument
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEYS = ("indicator_code", "region", "gender")
+ALL_LABEL = "all"
+DEFAULT_LEVEL = 0.95
+# Below this many series the vectorized fit beats pool start-up
+DEFAULT_PARALLEL_MIN_SERIES = 5_000
+MIN_CHUNK_SERIES = 256
+
+
+def panel_config() -> Dict:
+    """The ``forecast.panel`` section of the merged config."""
+    return forecast_config().get("panel", {}) or {}
+
+
+# ---------------------------------------------------------------------
+# Panel construction
+# ---------------------------------------------------------------------
+
+def disaggregated_panel(
+    df: pd.DataFrame,
+    keys: Optional[Sequence[str]] = None,
+    indicators: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    (year x series) panel with one column per (indicator x region x
+    gender) combination observed.
+
+    ``keys`` defaults to ``forecast.panel.keys``. Missing key values,
+    and key columns absent from ``df``, are labelled ``"all"``, so
+    national rows (no region) form their own series rather than being
+    dropped.
+    """
+    keys = list(keys or panel_config().get("keys", DEFAULT_KEYS))
+    labels = {}
+    for k in keys:
+        if k == "indicator_code":
+            continue
+        if k in df.columns:
+            labels[k] = df[k].astype(object).fillna(ALL_LABEL)
+        else:
+            labels[k] = ALL_LABEL
+    data = df.assign(**labels)
+    return year_panel(data, group_cols=keys, indicators=indicators)
+
+
+# ---------------------------------------------------------------------
+# Block fitting (runs in the workers)
+# ---------------------------------------------------------------------
+
+class _FitArgs(NamedTuple):
+    periods: np.ndarray
+    horizon: np.ndarray
+    degree: int
+    min_obs: Optional[int]
+    level: float
+
+
+# Per-series outputs laid out (horizon x series); the rest are series-first
+_HORIZON_OUTPUTS = ("forecast", "half_width")
+
+
+def _fit_block(Y: np.ndarray, args: _FitArgs) -> Dict[str, np.ndarray]:
+    """Fit the (periods x series) block ``Y`` and forecast the horizon."""
+    fit = fit_trends(
+        pd.DataFrame(Y, index=args.periods), degree=args.degree, min_obs=args.min_obs
+    )
+    mean, se = fit.predict(args.horizon, return_se=True)
+    with np.errstate(invalid="ignore"):
+        dof = fit.dof.astype(float)
+        q = np.where(dof > 0, stdtrit(np.maximum(dof, 1), 0.5 + args.level / 2), np.nan)
+        half = q[None, :] * np.sqrt(se.to_numpy() ** 2 + fit.sigma2[None, :])
+    return {
+        "forecast": mean.to_numpy(),
+        "half_width": half,
+        "params": fit.params,
+        "center": fit.center,
+        "n_obs": fit.n_obs,
+        "sigma2": fit.sigma2,
+    }
+
+
+def _empty_block(n_series: int, n_horizon: int, degree: int) -> Dict[str, np.ndarray]:
+    return {
+        "forecast": np.full((n_horizon, n_series), np.nan),
+        "half_width": np.full((n_horizon, n_series), np.nan),
+        "params": np.full((n_series, degree + 1), np.nan),
+        "center": np.full(n_series, np.nan),
+        "n_obs": np.zeros(n_series, dtype=int),
+        "sigma2": np.full(n_series, np.nan),
+    }
+
+
+def _fit_isolated(
+    Y: np.ndarray, offset: int, args: _FitArgs
+) -> Tuple[Dict[str, np.ndarray], List[Tuple[int, str]]]:
+    """
+    Fit a block, isolating failures to the series that cause them.
+
+    Series with infinite values are rejected up front; if the block fit
+    still raises, it is refitted one series at a time and only the
+    failing series are left empty. Errors are ``(series position,
+    message)`` pairs.
+    """
+    errors: List[Tuple[int, str]] = []
+    bad = np.isinf(Y).any(axis=0)
+    if bad.any():
+        errors += [(offset + int(j), "non-finite values") for j in np.flatnonzero(bad)]
+        Y = np.where(bad[None, :], np.nan, Y)
+    try:
+        result = _fit_block(Y, args)
+    except Exception:
+        parts = []
+        for j in range(Y.shape[1]):
+            try:
+                parts.append(_fit_block(Y[:, j:j + 1], args))
+            except Exception as exc:
+                errors.append((offset + j, repr(exc)))
+                parts.append(_empty_block(1, len(args.horizon), args.degree))
+        result = _concat_blocks(parts)
+    if bad.any():
+        # Fitted arrays may be read-only views, so mask into fresh ones.
+        for name in _HORIZON_OUTPUTS:
+            result[name] = np.where(bad[None, :], np.nan, result[name])
+        result["params"] = np.where(bad[:, None], np.nan, result["params"])
+        result["sigma2"] = np.where(bad, np.nan, result["sigma2"])
+    return result, errors
+
+
+def _concat_blocks(parts: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    out = {}
+    for name in parts[0]:
+        axis = 1 if name in _HORIZON_OUTPUTS else 0
+        out[name] = np.concatenate([p[name] for p in parts], axis=axis)
+    return out
+
+
+# Worker state, set once per process by ``_attach``: the shared panel
+# and the fit arguments, so tasks only carry their series range.
+_WORKER: Dict[str, Any] = {}
+
+
+def _attach(name: str, shape: Tuple[int, int], fit_args: _FitArgs) -> None:
+    shm = SharedMemory(name=name)
+    _WORKER["shm"] = shm      # keep the mapping alive
+    _WORKER["Yt"] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    _WORKER["args"] = fit_args
+
+
+def _fit_range(bounds: Tuple[int, int]):
+    lo, hi = bounds
+    Y = np.ascontiguousarray(_WORKER["Yt"][lo:hi].T)
+    return bounds, _fit_isolated(Y, lo, _WORKER["args"])
+
+
+# ---------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------
+
+_FIT_COLUMNS = ("level", "slope", "center", "n_obs", "sigma2", "status")
+
+
+@dataclass
+class PanelForecast:
+    """
+    Forecasts of every series of a disaggregated panel.
+
+    Attributes
+    ----------
+    forecasts : pd.DataFrame
+        Long frame: the panel keys, year, forecast, lower, upper; one
+        row per (series, horizon year).
+    fits : pd.DataFrame
+        One row per series: keys, level, slope, center, n_obs, sigma2
+        and status (``ok``, ``unfitted`` for too few observations, or
+        ``failed``).
+    errors : pd.DataFrame
+        Keys and error message of each failed series.
+    """
+
+    forecasts: pd.DataFrame
+    fits: pd.DataFrame
+    errors: pd.DataFrame
+
+    @property
+    def keys(self) -> List[str]:
+        """Columns identifying a series."""
+        return [c for c in self.fits.columns if c not in _FIT_COLUMNS]
+
+    def wide(self, value: str = "forecast") -> pd.DataFrame:
+        """(year x series) table of ``value``."""
+        return self.forecasts.pivot(index="year", columns=self.keys, values=value)
+
+
+def _chunks(
+    n_series: int, workers: int, chunk_size: Optional[int]
+) -> List[Tuple[int, int]]:
+    size = chunk_size or max(MIN_CHUNK_SERIES, math.ceil(n_series / (workers * 4)))
+    return [(lo, min(lo + size, n_series)) for lo in range(0, n_series, size)]
+
+
+@instrument
+def forecast_panel(
+    panel: pd.DataFrame,
+    horizon: Optional[Sequence[int]] = None,
+    degree: Optional[int] = None,
+    min_obs: Optional[int] = None,
+    level: Optional[float] = None,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> PanelForecast:
+    """
+    Fit and forecast every column of a disaggregated panel.
+
+    The series are split into contiguous ranges. Small panels (fewer
+    than ``forecast.panel.parallel_min_series`` series) are fitted
+    inline, since ``fit_trends`` already solves a block of series in
+    one vectorized pass. Larger ones are fitted in a process pool: the
+    panel is copied once into shared memory, which every worker maps at
+    start-up, and tasks carry only their series range, so no data is
+    pickled per task and the work scales with the number of workers.
+
+    A failing series (e.g. infinite values) is refitted in isolation
+    and reported in ``errors``; a failed task is retried inline. Other
+    series are unaffected.
+
+    Parameters
+    ----------
+    panel : pd.DataFrame
+        Year-indexed panel, e.g. from ``disaggregated_panel``.
+    horizon : sequence of int, optional
+        Forecast years; defaults to ``forecast.horizon``.
+    degree, min_obs : int, optional
+        As for ``fit_trends``.
+    level : float, optional
+        Prediction interval coverage (default ``forecast.panel.level``,
+        0.95); t-based, from the fit's mean standard error and residual
+        variance.
+    workers : int, optional
+        Pool size (default ``forecast.panel.workers`` or the CPU count);
+        1 fits inline.
+    chunk_size : int, optional
+        Series per task (default: about four tasks per worker).
+
+    Returns
+    -------
+    PanelForecast
+    """
+    cfg = panel_config()
+    horizon = np.asarray(default_horizon() if horizon is None else list(horizon))
+    if degree is None:
+        degree = int(forecast_config().get("trend", {}).get("degree", 1))
+    level = float(level or cfg.get("level", DEFAULT_LEVEL))
+    workers = int(workers or cfg.get("workers") or os.cpu_count() or 1)
+    min_parallel = int(cfg.get("parallel_min_series", DEFAULT_PARALLEL_MIN_SERIES))
+
+    periods = np.asarray(panel.index, dtype=float)
+    Yt = np.ascontiguousarray(panel.to_numpy(dtype=np.float64).T)   # (series x periods)
+    n_series, H = Yt.shape[0], len(horizon)
+    fit_args = _FitArgs(periods, horizon, degree, min_obs, level)
+
+    forecast = np.full((H, n_series), np.nan)
+    half = np.full((H, n_series), np.nan)
+    params = np.full((n_series, degree + 1), np.nan)
+    center = np.full(n_series, np.nan)
+    n_obs = np.zeros(n_series, dtype=int)
+    sigma2 = np.full(n_series, np.nan)
+    errors: List[Tuple[int, str]] = []
+
+    def store(bounds: Tuple[int, int], result: Dict[str, np.ndarray], errs) -> None:
+        lo, hi = bounds
+        forecast[:, lo:hi] = result["forecast"]
+        half[:, lo:hi] = result["half_width"]
+        params[lo:hi] = result["params"]
+        center[lo:hi] = result["center"]
+        n_obs[lo:hi] = result["n_obs"]
+        sigma2[lo:hi] = result["sigma2"]
+        errors.extend(errs)
+
+    def inline(bounds: Tuple[int, int]) -> None:
+        lo, hi = bounds
+        store(bounds, *_fit_isolated(np.ascontiguousarray(Yt[lo:hi].T), lo, fit_args))
+
+    parallel = workers > 1 and n_series >= min_parallel
+    if not parallel:
+        chunks = [(0, n_series)] if n_series else []
+        for bounds in chunks:
+            inline(bounds)
+    else:
+        chunks = _chunks(n_series, workers, chunk_size)
+        shm = SharedMemory(create=True, size=max(Yt.nbytes, 1))
+        try:
+            np.ndarray(Yt.shape, dtype=np.float64, buffer=shm.buf)[:] = Yt
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(chunks)),
+                initializer=_attach,
+                initargs=(shm.name, Yt.shape, fit_args),
+            ) as executor:
+                futures = {
+                    executor.submit(_fit_range, bounds): bounds for bounds in chunks
+                }
+                for future in as_completed(futures):
+                    try:
+                        bounds, (result, errs) = future.result()
+                        store(bounds, result, errs)
+                    except Exception as exc:
+                        logger.warning(
+                            "Panel task %s failed (%s); refitting inline",
+                            futures[future], exc,
+                        )
+                        inline(futures[future])
+        finally:
+            shm.close()
+            shm.unlink()
+
+    logger.info(
+        "Forecast %d series x %d year(s) (%s, %d chunk(s)); %d failed",
+        n_series, H, f"{min(workers, len(chunks))} workers" if parallel else "inline",
+        len(chunks), len(errors),
+    )
+    return _assemble(
+        panel.columns, horizon, forecast, half, params, center, n_obs, sigma2, errors
+    )
+
+
+def _key_frame(series: pd.Index) -> pd.DataFrame:
+    if isinstance(series, pd.MultiIndex):
+        return series.to_frame(index=False)
+    return pd.DataFrame({series.name or "series": np.asarray(series)})
+
+
+def _assemble(
+    series, horizon, forecast, half, params, center, n_obs, sigma2, errors
+) -> PanelForecast:
+    n_series, H = len(series), len(horizon)
+
+    keys = _key_frame(series)
+    out = keys.loc[keys.index.repeat(H)].reset_index(drop=True)
+    out["year"] = np.tile(horizon, n_series)
+    out["forecast"] = forecast.T.ravel()
+    out["lower"] = (forecast - half).T.ravel()
+    out["upper"] = (forecast + half).T.ravel()
+
+    failed = np.zeros(n_series, dtype=bool)
+    failed[[i for i, _ in errors]] = True
+    fitted = np.isfinite(params).all(axis=1)
+    fits = keys.assign(
+        level=params[:, 0],
+        slope=params[:, 1] if params.shape[1] > 1 else np.nan,
+        center=center,
+        n_obs=n_obs,
+        sigma2=sigma2,
+        status=np.where(failed, "failed", np.where(fitted, "ok", "unfitted")),
+    )
+
+    err = keys.iloc[[i for i, _ in errors]].reset_index(drop=True)
+    err["error"] = [message for _, message in errors]
+    return PanelForecast(forecasts=out, fits=fits, errors=err)
@@ -0,0 +1,452 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+from fi_forecasting.forecasting.forecaster import forecast_config
+from fi_forecasting.forecasting.panel import (
+    ALL_LABEL,
+    DEFAULT_KEYS,
+    PanelForecast,
+    panel_config,
+)
+from fi_forecasting.utils.profiling import instrument
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("bottom_up", "top_down", "ols", "wls_struct", "mint")
+AGGREGATIONS = ("sum", "mean")
+DEFAULT_METHOD = "mint"
+DEFAULT_AGGREGATION = "sum"
+# Columns that index the reconciled values besides the series keys
+DEFAULT_BY = ("scenario", "year")
+# Ridge on S'W^-1 S for bottom series without a base forecast, relative
+# to their diagonal entry, so ones only known through a shared total
+# stay solvable
+_RIDGE = 1e-10
+
+
+def reconciliation_config() -> Dict:
+    """The ``forecast.reconciliation`` section of the merged config."""
+    return forecast_config().get("reconciliation", {}) or {}
+
+
+# ---------------------------------------------------------------------
+# Hierarchy
+# ---------------------------------------------------------------------
+
+@dataclass
+class Hierarchy:
+    """
+    Summing structure of a set of (indicator x dimension...) series.
+
+    Attributes
+    ----------
+    series : pd.MultiIndex
+        Every series, in row order of ``S``.
+    bottom : np.ndarray
+        Row position of each bottom series, in column order of ``S``.
+    S : scipy.sparse.csr_matrix
+        (n_series x n_bottom) summing matrix. Bottom rows are unit
+        vectors; aggregate rows hold ones (``sum``) or weights adding
+        up to one (``mean``).
+    top : np.ndarray
+        For each bottom series, the row of the national series it is
+        disaggregated from, or its own row when there is none.
+    """
+
+    series: pd.MultiIndex
+    bottom: np.ndarray
+    S: sparse.csr_matrix
+    top: np.ndarray
+
+    @property
+    def n_aggregates(self) -> int:
+        return len(self.series) - len(self.bottom)
+
+    def aggregate(self, bottom_values: np.ndarray) -> np.ndarray:
+        """Coherent values of every series from (n_bottom x k) bottom values."""
+        return self.S @ bottom_values
+
+    def incoherence(self, values: np.ndarray) -> float:
+        """Largest gap between a series and the aggregate of its bottom series."""
+        values = np.asarray(values, dtype=float)
+        gaps = np.abs(values - self.aggregate(values[self.bottom]))
+        return float(np.nanmax(gaps, initial=0.0))
+
+
+def _depth(levels: pd.Series) -> pd.Series:
+    return levels.apply(lambda code: bin(int(code)).count("1"))
+
+
+def _bottom_weights(bottoms: pd.DataFrame, weights: Optional[pd.Series]) -> np.ndarray:
+    if weights is None:
+        return np.ones(len(bottoms))
+    names = list(weights.index.names)
+    if len(names) == 1:
+        lookup = bottoms[names[0]]
+    else:
+        lookup = pd.MultiIndex.from_frame(bottoms[names])
+    w = weights.reindex(lookup).to_numpy(dtype=float)
+    missing = int((~np.isfinite(w)).sum())
+    if missing:
+        raise ValueError(f"weights missing for {missing} bottom series")
+    return w
+
+
+def build_hierarchy(
+    series: pd.MultiIndex,
+    aggregation: Optional[str] = None,
+    weights: Optional[pd.Series] = None,
+) -> Hierarchy:
+    """
+    Sparse summing matrix of a set of disaggregated series.
+
+    The first level of ``series`` is the indicator; the remaining ones
+    (region, gender, ...) are dimensions where ``"all"`` marks a total.
+    For each indicator the bottom level is the most detailed
+    combination of dimensions present (ties go to the one with the most
+    series) among those the indicator has at least two categories of,
+    and every series whose dimensions are a coarser
+    combination of it, e.g. ``(region, all)`` or ``(all, all)`` above
+    ``(region, gender)``, aggregates the bottom series it matches.
+    Series outside that structure, or aggregates matching no bottom
+    series, stand alone as their own one-node tree.
+
+    ``S`` is built from (row, column, weight) triplets, so it holds one
+    entry per bottom series per level above it and never a dense block.
+
+    Parameters
+    ----------
+    series : pd.MultiIndex
+        Series keys; ``(indicator_code, region, gender)`` for a panel.
+    aggregation : {"sum", "mean"}, optional
+        How bottom series add up to a total; defaults to
+        ``forecast.reconciliation.aggregation``. Use ``mean`` for rates
+        such as the share of adults with an account.
+    weights : pd.Series, optional
+        Weights of the bottom series for ``mean`` aggregation (e.g.
+        adult population), indexed by any subset of the key levels.
+        Equal weights by default.
+
+    Returns
+    -------
+    Hierarchy
+    """
+    if not aggregation:
+        aggregation = reconciliation_config().get("aggregation", DEFAULT_AGGREGATION)
+    if aggregation not in AGGREGATIONS:
+        raise ValueError(
+            f"aggregation must be one of {AGGREGATIONS}, got {aggregation!r}"
+        )
+    if series.has_duplicates:
+        raise ValueError("series keys must be unique")
+
+    frame = series.to_frame(index=False)
+    ind, dims = frame.columns[0], list(frame.columns[1:])
+    detail = frame[dims].astype(object).fillna(ALL_LABEL).ne(ALL_LABEL).to_numpy()
+    frame["_row"] = np.arange(len(frame))
+    frame["_level"] = detail.astype(int) @ (1 << np.arange(len(dims), dtype=int))
+
+    # Bottom level of each indicator. A dimension only splits a total
+    # when the indicator has two or more categories in it; a lone
+    # "female" series is not a breakdown of the "all" one.
+    categories = frame[dims].astype(object).where(detail).groupby(frame[ind]).nunique()
+    bits = 1 << np.arange(len(dims), dtype=int)
+    splits = (categories.to_numpy() >= 2).astype(int) @ bits
+    splits = pd.Series(splits, index=categories.index)
+    counts = frame.groupby([ind, "_level"], sort=False).size()
+    counts = counts.rename("_n").reset_index()
+    counts["_depth"] = _depth(counts["_level"])
+    allowed = counts[ind].map(splits).to_numpy(dtype=int)
+    counts = counts[(counts["_level"] & ~allowed) == 0]
+    best = (
+        counts.sort_values(["_depth", "_n", "_level"], ascending=[False, False, True])
+        .drop_duplicates(ind)
+        .set_index(ind)["_level"]
+    )
+    # Indicators with no usable level get level 0: all series standalone
+    frame["_bottom_level"] = frame[ind].map(best).fillna(0).to_numpy(dtype=int)
+    is_bottom = (frame["_level"] == frame["_bottom_level"]).to_numpy()
+    below = ((frame["_level"] & frame["_bottom_level"]) == frame["_level"]).to_numpy()
+
+    bottoms = frame[is_bottom].reset_index(drop=True)
+    bottoms["_col"] = np.arange(len(bottoms))
+    bottoms["_w"] = _bottom_weights(bottoms, weights) if aggregation == "mean" else 1.0
+
+    # (aggregate row, bottom column, weight) triplets, one merge per
+    # (bottom level, aggregate level) pair
+    links: List[pd.DataFrame] = []
+    for (bottom_level, level), agg in frame[below & ~is_bottom].groupby(
+        ["_bottom_level", "_level"], sort=False
+    ):
+        on = [ind] + [d for k, d in enumerate(dims) if level >> k & 1]
+        kids = bottoms.loc[bottoms["_level"] == bottom_level, on + ["_col", "_w"]]
+        links.append(agg[on + ["_row"]].merge(kids, on=on)[["_row", "_col", "_w"]])
+    links = pd.concat(links, ignore_index=True) if links else pd.DataFrame(
+        {"_row": np.empty(0, int), "_col": np.empty(0, int), "_w": np.empty(0)}
+    )
+    if aggregation == "mean" and len(links):
+        links["_w"] = links["_w"] / links.groupby("_row")["_w"].transform("sum")
+
+    # Everything else is a bottom series of its own
+    covered = np.zeros(len(frame), dtype=bool)
+    covered[bottoms["_row"].to_numpy()] = True
+    covered[links["_row"].to_numpy()] = True
+    alone = np.flatnonzero(~covered)
+    bottom = np.concatenate([bottoms["_row"].to_numpy(), alone])
+    n_bottom = len(bottom)
+
+    rows = np.concatenate([bottom, links["_row"].to_numpy()])
+    cols = np.concatenate([np.arange(n_bottom), links["_col"].to_numpy()])
+    vals = np.concatenate([np.ones(n_bottom), links["_w"].to_numpy(dtype=float)])
+    S = sparse.csr_matrix((vals, (rows, cols)), shape=(len(frame), n_bottom))
+
+    # Top-down parent: the national series, when it aggregates the bottom
+    national = frame.loc[(frame["_level"] == 0).to_numpy() & covered & ~is_bottom]
+    national = national.set_index(ind)["_row"]
+    top = bottom.copy()
+    parent = bottoms[ind].map(national).to_numpy(dtype=float)
+    has_parent = np.isfinite(parent)
+    top[np.flatnonzero(has_parent)] = parent[has_parent].astype(int)
+
+    logger.info(
+        "Hierarchy: %d series, %d bottom (%d standalone), %d aggregate; "
+        "S has %d entries",
+        len(frame), n_bottom, len(alone), len(frame) - n_bottom, S.nnz,
+    )
+    return Hierarchy(series=series, bottom=bottom, S=S, top=top)
+
+
+def historical_proportions(hierarchy: Hierarchy, history: pd.DataFrame) -> np.ndarray:
+    """
+    Average historical proportions of each bottom series in its top series.
+
+    ``p_j`` is the mean over years of ``y_j / y_top(j)``, rescaled so the
+    top series' row of ``S`` maps the proportions back to one. Bottom
+    series never observed alongside their top get a zero share;
+    standalone series keep their own forecast.
+
+    Parameters
+    ----------
+    hierarchy : Hierarchy
+    history : pd.DataFrame
+        (year x series) observations, columns keyed like the hierarchy.
+    """
+    values = history.reindex(columns=hierarchy.series).to_numpy(dtype=float)
+    b, t = hierarchy.bottom, hierarchy.top
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = values[:, b] / values[:, t]
+    ratio[~np.isfinite(ratio)] = np.nan
+    seen = np.isfinite(ratio).sum(axis=0)
+    p = np.where(seen > 0, np.nansum(ratio, axis=0) / np.maximum(seen, 1), 0.0)
+
+    own = b == t
+    p[own] = 1.0
+    unseen = int((~own & (seen == 0)).sum())
+    if unseen:
+        logger.warning(
+            "%d bottom series have no history alongside their total", unseen
+        )
+
+    share = np.asarray(hierarchy.S[t, np.arange(len(b))]).ravel() * p
+    total = np.bincount(t, weights=share, minlength=len(hierarchy.series))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total[t] > 0, p / total[t], np.nan)
+
+
+# ---------------------------------------------------------------------
+# Reconciliation
+# ---------------------------------------------------------------------
+
+def _variances(hierarchy: Hierarchy, sigma2: np.ndarray) -> np.ndarray:
+    """Residual variances, filling unusable ones with their indicator's largest."""
+    var = pd.Series(np.where(sigma2 > 0, sigma2, np.nan))
+    indicator = hierarchy.series.get_level_values(0)
+    var = var.fillna(var.groupby(np.asarray(indicator)).transform("max"))
+    return var.fillna(1.0).to_numpy()
+
+
+def reconcile_matrix(
+    hierarchy: Hierarchy,
+    Y: np.ndarray,
+    method: str = DEFAULT_METHOD,
+    sigma2: Optional[np.ndarray] = None,
+    proportions: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Reconcile (n_series x k) base forecasts in one batched solve.
+
+    ``k`` spans every horizon year, scenario and value column at once:
+    all methods are linear maps ``S P`` applied to the whole block.
+
+    - ``bottom_up``: ``S y_bottom``.
+    - ``top_down``: bottom series are ``proportions`` of their top
+      series' forecast (see ``historical_proportions``).
+    - ``ols`` / ``wls_struct`` / ``mint``: ``S (S'W^-1 S)^-1 S'W^-1 y``
+      with ``W`` the identity, the structural variances
+      (``sum_j S_ij^2``) or the residual variances ``sigma2``, i.e.
+      MinT with a diagonal covariance.
+
+    ``S'W^-1 S`` is sparse and block diagonal by indicator, so it is
+    factorized once with SuperLU and the cost grows with the number of
+    series. Series with any missing base forecast get zero weight in
+    the least-squares methods and are inferred from the rest of their
+    tree; bottom series no observed forecast covers stay missing.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+    S = hierarchy.S
+    Y = np.asarray(Y, dtype=float)
+    if Y.ndim == 1:
+        Y = Y[:, None]
+    if S.shape[1] == 0:
+        return Y.copy()
+
+    if method == "bottom_up":
+        return S @ Y[hierarchy.bottom]
+    if method == "top_down":
+        if proportions is None:
+            raise ValueError("top_down reconciliation needs historical proportions")
+        return S @ (proportions[:, None] * Y[hierarchy.top])
+
+    if method == "ols":
+        var = np.ones(S.shape[0])
+    elif method == "wls_struct":
+        var = np.asarray(S.multiply(S).sum(axis=1)).ravel()
+    else:
+        if sigma2 is None:
+            raise ValueError(
+                "mint reconciliation needs the residual variance of every series"
+            )
+        var = _variances(hierarchy, np.asarray(sigma2, dtype=float))
+
+    observed = np.isfinite(Y).all(axis=1)
+    precision = np.where(observed, 1.0 / var, 0.0)
+    Y0 = np.where(observed[:, None], Y, 0.0)
+
+    StW = (S.T @ sparse.diags(precision)).tocsr()
+    A = (StW @ S).tocsc()
+    diagonal = A.diagonal()
+    supported = diagonal > 0
+    # Only bottom series without a forecast of their own can leave A singular
+    ridge = np.where(supported, diagonal, 1.0)
+    ridge[observed[hierarchy.bottom]] = 0.0
+    A = A + sparse.diags(_RIDGE * ridge, format="csc")
+    bottom = splu(A).solve(np.asarray(StW @ Y0))
+    bottom[~supported] = np.nan
+    return S @ bottom
+
+
+@instrument
+def reconcile(
+    forecasts: pd.DataFrame,
+    method: Optional[str] = None,
+    keys: Optional[Sequence[str]] = None,
+    by: Optional[Sequence[str]] = None,
+    value_cols: Sequence[str] = ("forecast",),
+    sigma2: Optional[pd.Series] = None,
+    history: Optional[pd.DataFrame] = None,
+    aggregation: Optional[str] = None,
+    weights: Optional[pd.Series] = None,
+) -> pd.DataFrame:
+    """
+    Make long-format forecasts add up across the region / gender hierarchy.
+
+    The frame is pivoted to one row per series and one column per
+    (value, scenario, year), reconciled with ``reconcile_matrix`` in a
+    single solve and melted back.
+
+    Parameters
+    ----------
+    forecasts : pd.DataFrame
+        Long frame with the series ``keys``, the ``by`` columns and the
+        ``value_cols``, e.g. ``PanelForecast.forecasts``.
+    method : str, optional
+        One of ``METHODS``; defaults to ``forecast.reconciliation.method``.
+    keys : sequence of str, optional
+        Series keys, indicator first; defaults to ``forecast.panel.keys``.
+    by : sequence of str, optional
+        Columns spanning the forecasts of one series; defaults to
+        whichever of ``scenario`` and ``year`` are present.
+    value_cols : sequence of str
+        Columns to reconcile.
+    sigma2 : pd.Series, optional
+        Residual variance per series (indexed by ``keys``); for ``mint``.
+    history : pd.DataFrame, optional
+        (year x series) observations; for ``top_down``.
+    aggregation, weights
+        See ``build_hierarchy``.
+
+    Returns
+    -------
+    pd.DataFrame
+        The rows of ``forecasts`` with keys, ``by``, the reconciled
+        ``value_cols`` and the base values as ``<col>_base``.
+    """
+    cfg = reconciliation_config()
+    method = method or cfg.get("method", DEFAULT_METHOD)
+    keys = list(keys or panel_config().get("keys", DEFAULT_KEYS))
+    if by is None:
+        by = [c for c in DEFAULT_BY if c in forecasts.columns]
+    by = list(by)
+    value_cols = list(value_cols)
+
+    wide = forecasts.set_index(keys + by)[value_cols]
+    if by:
+        wide = wide.unstack(by)
+    hierarchy = build_hierarchy(wide.index, aggregation=aggregation, weights=weights)
+
+    var = None
+    if sigma2 is not None:
+        var = sigma2.reindex(wide.index).to_numpy(dtype=float)
+    proportions = None
+    if method == "top_down":
+        if history is None:
+            raise ValueError("top_down reconciliation needs the history panel")
+        proportions = historical_proportions(hierarchy, history)
+
+    base_values = wide.to_numpy(dtype=float)
+    values = reconcile_matrix(
+        hierarchy, base_values, method, sigma2=var, proportions=proportions
+    )
+    reconciled = pd.DataFrame(values, index=wide.index, columns=wide.columns)
+
+    def long(frame: pd.DataFrame) -> pd.DataFrame:
+        if by:
+            frame = frame.stack(by, future_stack=True)
+        return frame.reindex(pd.MultiIndex.from_frame(forecasts[keys + by]))
+
+    base = long(wide).add_suffix("_base")
+    out = long(reconciled).join(base).reset_index()
+    logger.info(
+        "Reconciled %d series x %d column(s) (%s); incoherence %.3g -> %.3g",
+        len(wide), wide.shape[1], method,
+        hierarchy.incoherence(base_values), hierarchy.incoherence(values),
+    )
+    return out[keys + by + [c for v in value_cols for c in (v, f"{v}_base")]]
+
+
+def reconcile_panel(
+    result: PanelForecast,
+    method: Optional[str] = None,
+    history: Optional[pd.DataFrame] = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Reconcile ``forecast_panel`` output, using its fitted residual
+    variances for ``mint``. ``history`` is the panel the forecasts were
+    fitted on, needed for ``top_down``.
+    """
+    keys = result.keys
+    sigma2 = result.fits.set_index(keys)["sigma2"]
+    return reconcile(
+        result.forecasts, method=method, keys=keys, sigma2=sigma2, history=history,
+        **kwargs,
+    )
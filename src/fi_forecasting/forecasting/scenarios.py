@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import itertools
+import logging
+from dataclasses import dataclass, field
+from typing import Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from fi_forecasting.forecasting.forecaster import forecast_config
+from fi_forecasting.impact.impact_links import resolve_indicator_codes
+from fi_forecasting.impact.lag_models import (
+    direction_signs,
+    fill_link_defaults,
+    magnitude_values,
+)
+from fi_forecasting.utils.profiling import instrument
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------
+# Scenario specification
+# ---------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class ScenarioSpec:
+    """
+    One what-if: how event effects are scaled, shifted and switched.
+
+    Parameters
+    ----------
+    name : str
+        Scenario label.
+    magnitude_scale : float
+        Multiplier applied to every link effect.
+    magnitude_values : mapping of level -> float
+        Overrides of ``events.magnitude_values`` (e.g. ``{"high": 0.2}``);
+        links of that magnitude level are rescaled by the ratio to the
+        configured value.
+    category_multipliers : mapping of category -> float
+        Extra multiplier per event category (``policy``, ...).
+    lag_shift_months : float
+        Added to every link's ``lag_months`` (negative = sooner).
+    disabled_events : sequence of str
+        Event record_ids switched off.
+    """
+
+    name: str
+    magnitude_scale: float = 1.0
+    magnitude_values: Mapping[str, float] = field(default_factory=dict)
+    category_multipliers: Mapping[str, float] = field(default_factory=dict)
+    lag_shift_months: float = 0.0
+    disabled_events: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, name: str, cfg: Optional[Mapping] = None) -> "ScenarioSpec":
+        cfg = dict(cfg or {})
+        return cls(
+            name=name,
+            magnitude_scale=float(cfg.get("magnitude_scale", 1.0)),
+            magnitude_values=dict(cfg.get("magnitude_values", {})),
+            category_multipliers=dict(cfg.get("category_multipliers", {})),
+            lag_shift_months=float(cfg.get("lag_shift_months", 0.0)),
+            disabled_events=tuple(cfg.get("disabled_events", ())),
+        )
+
+
+def default_scenarios() -> List[ScenarioSpec]:
+    """Scenarios from ``forecast.scenarios`` (falls back to base only)."""
+    cfg = forecast_config().get("scenarios") or {"base": {}}
+    return [ScenarioSpec.from_dict(name, spec) for name, spec in cfg.items()]
+
+
+def scenario_grid(
+    magnitude_scale: Sequence[float] = (1.0,),
+    lag_shift_months: Sequence[float] = (0.0,),
+    disabled_events: Sequence[Sequence[str]] = ((),),
+    category_multipliers: Sequence[Mapping[str, float]] = ({},),
+) -> List[ScenarioSpec]:
+    """
+    Cartesian product of scenario parameters.
+
+    Example
+    -------
+    >>> specs = scenario_grid(magnitude_scale=[0.5, 1, 1.5],
+    ...                       lag_shift_months=[-6, 0, 6])
+    >>> len(specs)
+    9
+    """
+    specs = []
+    for scale, shift, off, cats in itertools.product(
+        magnitude_scale, lag_shift_months, disabled_events, category_multipliers
+    ):
+        parts = [f"x{scale:g}", f"lag{shift:+g}"]
+        if off:
+            parts.append("off:" + "+".join(off))
+        if cats:
+            parts.append(",".join(f"{k}x{v:g}" for k, v in sorted(cats.items())))
+        specs.append(
+            ScenarioSpec(
+                name="|".join(parts),
+                magnitude_scale=float(scale),
+                category_multipliers=dict(cats),
+                lag_shift_months=float(shift),
+                disabled_events=tuple(off),
+            )
+        )
+    return specs
+
+
+# ---------------------------------------------------------------------
+# Links
+# ---------------------------------------------------------------------
+
+@instrument
+def prepare_links(
+    df: pd.DataFrame,
+    magnitudes: Optional[Mapping[str, float]] = None,
+) -> pd.DataFrame:
+    """
+    Event -> indicator links with everything the engine needs.
+
+    Joins ``impact_link`` rows of a unified dataset to their parent
+    ``event`` rows (for the event date and category) and derives the
+    signed relative effect of each link: ``|impact_estimate| / 100``
+    when an estimate is given, otherwise the configured magnitude value,
+    signed by ``impact_direction``. Missing lags, magnitudes and response
+    shapes come from ``events.default_impacts`` for the event category.
+    Links whose event has no date are dropped.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns: event_id, indicator_code, category, magnitude,
+        event_date, event_year, lag_months, shape, effect.
+    """
+    magnitudes = magnitude_values() if magnitudes is None else dict(magnitudes)
+    links = df[df["record_type"] == "impact_link"]
+    events = df[df["record_type"] == "event"]
+
+    dates = pd.to_datetime(events["observation_date"], errors="coerce", format="mixed")
+    if "event_date" in events.columns:
+        dates = dates.fillna(
+            pd.to_datetime(events["event_date"], errors="coerce", format="mixed")
+        )
+    event_info = (
+        pd.DataFrame(
+            {
+                "event_id": events["record_id"].astype(object).to_numpy(),
+                "event_date": dates.to_numpy(),
+                "category": events["category"].astype(object).to_numpy(),
+            }
+        )
+        .dropna(subset=["event_date"])
+        .drop_duplicates("event_id")
+        .set_index("event_id")
+    )
+
+    event_id = links["parent_id"].astype(object).to_numpy()
+    indicator = resolve_indicator_codes(links)
+
+    event_date = pd.to_datetime(event_info["event_date"].reindex(event_id).to_numpy())
+    magnitude = links["impact_magnitude"].astype(object).str.lower()
+    lag = pd.to_numeric(links["lag_months"], errors="coerce")
+    out = fill_link_defaults(
+        pd.DataFrame(
+            {
+                "event_id": event_id,
+                "indicator_code": indicator.to_numpy(),
+                "category": event_info["category"].reindex(event_id).to_numpy(),
+                "magnitude": magnitude.to_numpy(),
+                "event_date": event_date,
+                "event_year": event_date.year.to_numpy(dtype=float),
+                "lag_months": lag.to_numpy(),
+            }
+        )
+    )
+    out["lag_months"] = out["lag_months"].fillna(0.0)
+
+    estimate = pd.to_numeric(links["impact_estimate"], errors="coerce").abs()
+    estimate = estimate.to_numpy() / 100
+    level = out["magnitude"].map(magnitudes).to_numpy(dtype=float)
+    sign = (
+        links["impact_direction"].astype(object).str.lower()
+        .map(direction_signs()).fillna(0.0).to_numpy()
+    )
+    out["effect"] = sign * np.nan_to_num(np.where(np.isnan(estimate), level, estimate))
+
+    undated = out["event_date"].isna()
+    if undated.any():
+        logger.debug("Dropping %d link(s) to undated events", int(undated.sum()))
+    return out[~undated].reset_index(drop=True)
+
+
+# ---------------------------------------------------------------------
+# Scenario cube
+# ---------------------------------------------------------------------
+
+@dataclass
+class ScenarioCube:
+    """
+    Scenario x indicator x year forecasts.
+
+    ``forecast = baseline * (1 + effect)``, with ``effect`` the summed
+    relative effect of the active event links.
+    """
+
+    scenarios: List[ScenarioSpec]
+    indicators: pd.Index
+    years: np.ndarray
+    baseline: np.ndarray          # (n_ind, H)
+    effect: np.ndarray            # (S, n_ind, H)
+
+    @property
+    def forecast(self) -> np.ndarray:
+        return self.baseline[None] * (1.0 + self.effect)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long format: scenario, indicator_code, year, baseline, effect, forecast."""
+        S, n_ind, H = self.effect.shape
+        return pd.DataFrame(
+            {
+                "scenario": np.repeat([s.name for s in self.scenarios], n_ind * H),
+                "indicator_code": np.tile(np.repeat(np.asarray(self.indicators), H), S),
+                "year": np.tile(self.years, S * n_ind),
+                "baseline": np.tile(self.baseline.ravel(), S),
+                "effect": self.effect.ravel(),
+                "forecast": self.forecast.ravel(),
+            }
+        )
+
+    def parameters(self) -> pd.DataFrame:
+        """One row per scenario with its parameters."""
+        return pd.DataFrame(
+            [
+                {
+                    "scenario": s.name,
+                    "magnitude_scale": s.magnitude_scale,
+                    "magnitude_values": dict(s.magnitude_values),
+                    "category_multipliers": dict(s.category_multipliers),
+                    "lag_shift_months": s.lag_shift_months,
+                    "disabled_events": list(s.disabled_events),
+                }
+                for s in self.scenarios
+            ]
+        )
+
+
+def _lookup_table(
+    specs: Sequence[ScenarioSpec],
+    keys: np.ndarray,
+    values_of,
+    default: Mapping[str, float],
+) -> np.ndarray:
+    """
+    (S, n_links) multipliers: ``values_of(spec)[key] / default[key]``
+    for each link key, 1 where the scenario does not override the key.
+    """
+    uniq, codes = np.unique(keys.astype(str), return_inverse=True)
+    table = np.ones((len(specs), len(uniq)))
+    for s, spec in enumerate(specs):
+        overrides = values_of(spec)
+        for k, key in enumerate(uniq):
+            if key in overrides:
+                base = default.get(key, 1.0) or 1.0
+                table[s, k] = overrides[key] / base
+    return table[:, codes]
+
+
+@instrument
+def run_scenarios(
+    baseline: pd.DataFrame,
+    links: pd.DataFrame,
+    scenarios: Optional[Iterable[ScenarioSpec]] = None,
+    magnitudes: Optional[Mapping[str, float]] = None,
+) -> ScenarioCube:
+    """
+    Evaluate every scenario for every indicator and year in one pass.
+
+    Each scenario becomes a row of per-link multipliers and lag shifts;
+    link activity (``year >= event_year + ceil(lag / 12)``, the same step
+    rule as the forecasting notebook) is a boolean (S, n_links, H) array
+    and the per-indicator effect is a single contraction of the scaled
+    link effects with the (n_ind, n_links) link -> indicator incidence
+    matrix.
+
+    Parameters
+    ----------
+    baseline : pd.DataFrame
+        Point forecasts indexed by year, one column per indicator (e.g.
+        from ``forecast_trends``).
+    links : pd.DataFrame
+        Output of ``prepare_links``.
+    scenarios : iterable of ScenarioSpec, optional
+        Defaults to ``default_scenarios()``.
+    magnitudes : mapping, optional
+        Reference magnitude values; defaults to the configured ones.
+
+    Returns
+    -------
+    ScenarioCube
+    """
+    specs = list(scenarios) if scenarios is not None else default_scenarios()
+    if not specs:
+        raise ValueError("At least one scenario is required")
+    magnitudes = magnitude_values() if magnitudes is None else dict(magnitudes)
+
+    indicators = baseline.columns
+    years = np.asarray(baseline.index, dtype=float)
+    base = baseline.to_numpy(dtype=float).T                 # (n_ind, H)
+
+    # Links to indicators outside the baseline cannot change it
+    col = indicators.get_indexer(links["indicator_code"])
+    links = links[col >= 0]
+    col = col[col >= 0]
+    n_links, n_ind = len(links), len(indicators)
+
+    effect0 = links["effect"].to_numpy(dtype=float)
+    event_year = links["event_year"].to_numpy(dtype=float)
+    lag = links["lag_months"].to_numpy(dtype=float)
+    event_ids = links["event_id"].astype(str).to_numpy()
+
+    # (S, n_links) scenario parameters
+    magnitude_scale = np.array([s.magnitude_scale for s in specs])[:, None]
+    scale = magnitude_scale * np.ones((1, n_links))
+    scale *= _lookup_table(specs, links["magnitude"].fillna("").to_numpy(),
+                           lambda s: s.magnitude_values, magnitudes)
+    scale *= _lookup_table(specs, links["category"].fillna("").to_numpy(),
+                           lambda s: s.category_multipliers, {})
+    enabled = np.array(
+        [~np.isin(event_ids, list(s.disabled_events)) for s in specs]
+    ).reshape(len(specs), n_links)
+    shift = np.array([s.lag_shift_months for s in specs])[:, None]
+
+    onset = event_year[None, :] + np.ceil(np.maximum(lag[None, :] + shift, 0) / 12)
+    active = years[None, None, :] >= onset[:, :, None]     # (S, n_links, H)
+    link_effect = (effect0[None, :] * scale * enabled)[:, :, None] * active
+
+    # Sum link effects per indicator: a sparse (n_ind x n_links) incidence
+    # applied to all scenarios and years at once, O(S * n_links * H)
+    incidence = sparse.csr_matrix(
+        (np.ones(n_links), (col, np.arange(n_links))), shape=(n_ind, n_links)
+    )
+    S, H = link_effect.shape[0], len(years)
+    per_link = link_effect.transpose(1, 0, 2).reshape(n_links, S * H)
+    effect = (incidence @ per_link).reshape(n_ind, S, H).transpose(1, 0, 2)
+
+    return ScenarioCube(
+        scenarios=specs,
+        indicators=indicators,
+        years=np.asarray(baseline.index),
+        baseline=base,
+        effect=effect,
+    )
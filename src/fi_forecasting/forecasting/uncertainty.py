@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fi_forecasting.forecasting.forecaster import TrendFit, default_horizon
+from fi_forecasting.utils.profiling import instrument
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("bootstrap", "parametric")
+DEFAULT_QUANTILES = (0.025, 0.5, 0.975)
+
+# Upper bound on the simulation arrays held at once per worker; series
+# are processed in blocks sized to stay under it.
+MAX_BLOCK_BYTES = 256 * 1024 * 1024
+
+
+# ---------------------------------------------------------------------
+# Scale
+# ---------------------------------------------------------------------
+
+def _noise_scale(fit: TrendFit) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Residual standard deviation per series, with a pooled fallback.
+
+    Series without residual degrees of freedom (e.g. two observations of
+    a linear trend) would otherwise get zero-width bands. They borrow the
+    median coefficient of variation (sigma / |level|) of the series that
+    do have residuals, scaled by their own level.
+
+    Returns
+    -------
+    (np.ndarray, np.ndarray)
+        Scale per series and a mask of series using the pooled scale.
+    """
+    sigma = np.sqrt(fit.sigma2)
+    level = np.abs(fit.params[:, 0]) if fit.params.size else np.array([])
+    fitted = np.isfinite(fit.params).all(axis=1)
+
+    own = np.isfinite(sigma)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cv = sigma / level
+    usable = own & np.isfinite(cv) & (level > 0)
+
+    pooled = fitted & ~own
+    if pooled.any():
+        if usable.any():
+            sigma = np.where(pooled, np.median(cv[usable]) * level, sigma)
+        else:
+            logger.warning(
+                "No series has residual degrees of freedom; "
+                "%d series get no interval", int(pooled.sum()),
+            )
+            pooled[:] = False
+    return sigma, pooled
+
+
+def _inflation(fit: TrendFit) -> np.ndarray:
+    """``sqrt(n / (n - p))`` per series, undoing in-sample residual shrinkage."""
+    dof = fit.dof
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(dof > 0, np.sqrt(fit.n_obs / dof), 1.0)
+
+
+def _compact_residuals(residuals: np.ndarray) -> np.ndarray:
+    """
+    Move each series' observed residuals to the top of its column, so
+    ``compact[floor(u * n_obs), n]`` resamples series ``n``.
+    """
+    order = np.argsort(~np.isfinite(residuals), axis=0, kind="stable")
+    return np.take_along_axis(residuals, order, axis=0)
+
+
+# ---------------------------------------------------------------------
+# Simulation kernels
+# ---------------------------------------------------------------------
+
+def _batched_sqrt(cov: np.ndarray) -> np.ndarray:
+    """Symmetric square roots of a (N, p, p) stack of PSD matrices."""
+    vals, vecs = np.linalg.eigh(cov)
+    vals = np.clip(vals, 0.0, None)
+    return vecs * np.sqrt(vals)[:, None, :]
+
+
+def _rademacher(rng: np.random.Generator, shape: Tuple[int, ...]) -> np.ndarray:
+    """Random +/-1 weights from packed random bytes."""
+    n = int(np.prod(shape))
+    bits = np.unpackbits(np.frombuffer(rng.bytes((n + 7) // 8), dtype=np.uint8))[:n]
+    return (bits.astype(np.float32) * 2 - 1).reshape(shape)
+
+
+def _resample(
+    rng: np.random.Generator, table: np.ndarray, counts: np.ndarray, shape
+) -> np.ndarray:
+    """
+    Draw ``shape[1:]`` values per row of ``table`` (B, T) from that row's
+    first ``counts`` entries, with replacement.
+    """
+    B = table.shape[0]
+    u = rng.integers(0, 1 << 16, size=shape, dtype=np.uint16).astype(np.uint32)
+    idx = (u * counts.astype(np.uint32)[:, None, None]) >> 16
+    idx += (np.arange(B, dtype=np.uint32) * table.shape[1])[:, None, None]
+    return np.take(table.ravel(), idx)
+
+
+def _simulate_block(
+    method: str,
+    n_draws: int,
+    seed: np.random.SeedSequence,
+    X_future: np.ndarray,
+    cov_unscaled: np.ndarray,
+    sigma: np.ndarray,
+    X_fit: np.ndarray,
+    residuals: np.ndarray,
+    compact: np.ndarray,
+    counts: np.ndarray,
+    use_parametric: np.ndarray,
+) -> np.ndarray:
+    """
+    Simulate deviations from the point forecast for one block of series.
+
+    Returns a float32 (series x draws x horizon) array; adding the point
+    forecast gives the simulated values. Series in ``use_parametric`` (no
+    residuals to resample) are simulated parametrically even under
+    ``method="bootstrap"``.
+    """
+    rng = np.random.default_rng(seed)
+    D = n_draws
+    H, B, p = X_future.shape
+    Xf = np.transpose(X_future, (1, 2, 0))                        # (B, p, H)
+
+    def parametric(rows: np.ndarray) -> np.ndarray:
+        # theta* ~ N(theta, sigma^2 (X'X)^-1); y* = X theta* + sigma * eps
+        root = _batched_sqrt(cov_unscaled[rows]) * sigma[rows, None, None]
+        M = np.matmul(np.transpose(root, (0, 2, 1)), Xf[rows]).astype(np.float32)
+        z = rng.standard_normal((len(rows), D, p), dtype=np.float32)
+        eps = rng.standard_normal((len(rows), D, H), dtype=np.float32)
+        return np.matmul(z, M) + sigma[rows, None, None].astype(np.float32) * eps
+
+    if method == "parametric":
+        return parametric(np.arange(B))
+
+    # Residual bootstrap. Parameter uncertainty comes from a wild
+    # bootstrap refit: e*_t = r_t * v_t with Rademacher v, and the
+    # closed-form refit theta* - theta = (X'X)^-1 X' e* is linear in v,
+    # so the forecast shift is one batched matmul v @ A. Forecast-year
+    # errors are resampled from each series' own residuals.
+    Xr = np.transpose(X_fit, (1, 0, 2)) * residuals.T[:, :, None]  # (B, T, p)
+    A = np.matmul(np.matmul(Xr, cov_unscaled), Xf).astype(np.float32)  # (B, T, H)
+    v = _rademacher(rng, (B, D, A.shape[1]))
+    dev = np.matmul(v, A)
+    dev += _resample(
+        rng, compact.T.astype(np.float32), np.maximum(counts, 1), (B, D, H)
+    )
+
+    if use_parametric.any():
+        rows = np.flatnonzero(use_parametric)
+        dev[rows] = parametric(rows)
+    return dev
+
+
+def _summarize_block(args) -> Tuple[np.ndarray, np.ndarray]:
+    """Worker entry point: simulate one block and reduce to quantiles."""
+    quantiles, kwargs = args
+    dev = _simulate_block(**kwargs)
+    q = np.quantile(dev, quantiles, axis=1).astype(float)          # (Q, B, H)
+    return q, dev.mean(axis=1, dtype=float)
+
+
+# ---------------------------------------------------------------------
+# Block planning
+# ---------------------------------------------------------------------
+
+def _block_size(n_draws: int, n_periods: int, horizon: int, max_bytes: int) -> int:
+    per_series = 4 * n_draws * (n_periods + 4 * horizon + 4)
+    return max(1, int(max_bytes // max(per_series, 1)))
+
+
+def _block_kwargs(
+    fit: TrendFit,
+    horizon: Sequence[float],
+    method: str,
+    n_draws: int,
+    seed: Optional[int],
+    max_bytes: int,
+) -> Tuple[List[Dict], np.ndarray, np.ndarray]:
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}'; expected one of {METHODS}")
+
+    sigma, pooled = _noise_scale(fit)
+    X_future = fit._design(horizon)
+    X_fit = fit._design(fit.periods)
+
+    residuals = fit.residuals * _inflation(fit)[None, :]
+    compact = _compact_residuals(residuals)
+    residuals = np.nan_to_num(residuals)
+    counts = fit.n_obs
+    use_parametric = pooled | (fit.dof <= 0)
+
+    # Unfitted series produce NaN paths; keep them out of the kernels
+    live = np.isfinite(fit.params).all(axis=1) & np.isfinite(sigma)
+
+    n_series = len(fit.series)
+    block = _block_size(n_draws, len(fit.periods), len(horizon), max_bytes)
+    starts = range(0, n_series, block)
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+
+    blocks = []
+    for start, child in zip(starts, seeds):
+        sl = slice(start, min(start + block, n_series))
+        keep = np.flatnonzero(live[sl]) + start
+        blocks.append(
+            {
+                "index": keep,
+                "kwargs": dict(
+                    method=method,
+                    n_draws=n_draws,
+                    seed=child,
+                    X_future=X_future[:, keep],
+                    cov_unscaled=fit.cov_unscaled[keep],
+                    sigma=sigma[keep],
+                    X_fit=X_fit[:, keep],
+                    residuals=residuals[:, keep],
+                    compact=compact[:, keep],
+                    counts=counts[keep],
+                    use_parametric=use_parametric[keep],
+                ),
+            }
+        )
+    return blocks, pooled, live
+
+
+# ---------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------
+
+def simulate_paths(
+    fit: TrendFit,
+    horizon: Optional[Sequence[int]] = None,
+    n_draws: int = 1000,
+    method: str = "bootstrap",
+    seed: Optional[int] = None,
+    max_bytes: int = MAX_BLOCK_BYTES,
+) -> np.ndarray:
+    """
+    Simulated future values as a (draws x series x horizon) array.
+
+    Materializes every draw; prefer ``prediction_intervals`` when only
+    quantiles are needed. Unfitted series are NaN.
+    """
+    horizon = default_horizon() if horizon is None else list(horizon)
+    blocks, _, _ = _block_kwargs(fit, horizon, method, n_draws, seed, max_bytes)
+    point = fit.predict(horizon).to_numpy().T                 # (N, H)
+    out = np.full((n_draws, len(fit.series), len(horizon)), np.nan)
+    for block in blocks:
+        index = block["index"]
+        if len(index):
+            dev = _simulate_block(**block["kwargs"])
+            out[:, index] = np.transpose(dev, (1, 0, 2)) + point[index][None]
+    return out
+
+
+@instrument
+def prediction_intervals(
+    fit: TrendFit,
+    horizon: Optional[Sequence[int]] = None,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    n_draws: int = 10_000,
+    method: str = "bootstrap",
+    seed: Optional[int] = 0,
+    max_bytes: int = MAX_BLOCK_BYTES,
+    n_jobs: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Simulated prediction quantiles for every series and horizon year.
+
+    Series are processed in blocks whose (draws x series x horizon)
+    working arrays stay under ``max_bytes``; each block is simulated
+    with broadcasting and immediately reduced to its quantiles, so peak
+    memory does not grow with the number of series. Every block gets its
+    own child of ``SeedSequence(seed)``, so results are reproducible and
+    identical with or without a process pool.
+
+    Methods
+    -------
+    bootstrap
+        Resample each series' (degrees-of-freedom inflated) residuals,
+        refit the trend in closed form and add resampled residuals to
+        the forecast years.
+    parametric
+        Draw trend parameters from their Gaussian sampling distribution
+        and add Gaussian noise with the residual variance.
+
+    Series without residual degrees of freedom use a pooled scale (see
+    ``_noise_scale``) and are simulated parametrically; they are flagged
+    in the ``pooled_scale`` column.
+
+    Parameters
+    ----------
+    fit : TrendFit
+        Output of ``fit_trends``.
+    horizon : sequence of int, optional
+        Forecast years; defaults to ``forecast.horizon``.
+    quantiles : sequence of float
+        Quantiles in [0, 1] to report.
+    n_draws : int
+        Simulated paths per series.
+    method : {"bootstrap", "parametric"}
+    seed : int, optional
+        Root seed.
+    max_bytes : int
+        Memory cap for one block's working arrays.
+    n_jobs : int, optional
+        Simulate blocks in a process pool of this size.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per (series, year) with the point forecast, the
+        simulation mean and one column per quantile.
+    """
+    horizon = default_horizon() if horizon is None else list(horizon)
+    quantiles = np.asarray(quantiles, dtype=float)
+    if ((quantiles < 0) | (quantiles > 1)).any():
+        raise ValueError("Quantiles must lie in [0, 1]")
+
+    blocks, pooled, live = _block_kwargs(fit, horizon, method, n_draws, seed, max_bytes)
+
+    n_series, H = len(fit.series), len(horizon)
+    q_out = np.full((len(quantiles), n_series, H), np.nan)
+    mean_out = np.full((n_series, H), np.nan)
+
+    jobs = [(quantiles, b["kwargs"]) for b in blocks if len(b["index"])]
+    targets = [b["index"] for b in blocks if len(b["index"])]
+
+    if n_jobs and n_jobs > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(_summarize_block, jobs))
+    else:
+        results = [_summarize_block(job) for job in jobs]
+
+    point = fit.predict(horizon).to_numpy().T                 # (N, H)
+    for index, (q, mean) in zip(targets, results):
+        q_out[:, index] = q + point[index][None]
+        mean_out[index] = mean + point[index]
+
+    logger.debug(
+        "Simulated %d draws for %d series in %d block(s) (%s)",
+        n_draws, int(live.sum()), len(jobs), method,
+    )
+
+    series = fit.series
+    keys = series.repeat(H)
+    if isinstance(series, pd.MultiIndex):
+        out = keys.to_frame(index=False)
+    else:
+        out = pd.DataFrame({series.name or "series": np.asarray(keys)})
+    out["year"] = np.tile(horizon, n_series)
+    out["forecast"] = point.ravel()
+    out["mean"] = mean_out.ravel()
+    for q, values in zip(quantiles, q_out):
+        out[f"q{q:g}"] = values.ravel()
+    out["pooled_scale"] = np.repeat(pooled, H)
+    return out
+
+
+def interval_columns(
+    intervals: pd.DataFrame,
+    lower: float = 0.025,
+    upper: float = 0.975,
+    series_col: str = "indicator_code",
+) -> pd.DataFrame:
+    """
+    Reshape ``prediction_intervals`` output to the year-indexed
+    ``<series>_lower`` / ``<series>_upper`` layout of the forecast
+    outputs file.
+    """
+    lo, hi = f"q{lower:g}", f"q{upper:g}"
+    missing = [c for c in (lo, hi) if c not in intervals.columns]
+    if missing:
+        raise ValueError(f"Quantiles not present in intervals: {missing}")
+
+    wide = intervals.pivot(index="year", columns=series_col, values=[lo, hi])
+    wide.columns = [
+        f"{code}_{'lower' if q == lo else 'upper'}" for q, code in wide.columns
+    ]
+    return wide
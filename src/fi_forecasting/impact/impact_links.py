@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import logging
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import take
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_INDICATOR = "UNKNOWN"
+
+
+# ---------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------
+
+def resolve_indicator_codes(links: pd.DataFrame) -> pd.Series:
+    """
+    Canonical indicator code of each link.
+
+    ``indicator_code`` is kept where present and ``related_indicator``
+    fills the rest, as the original link merge did. Frames with neither
+    column map to ``UNKNOWN``.
+    """
+    codes = None
+    for col in ("indicator_code", "related_indicator"):
+        if col in links.columns:
+            values = links[col].astype(object)
+            codes = values if codes is None else codes.where(codes.notna(), values)
+    if codes is None:
+        return pd.Series(UNKNOWN_INDICATOR, index=links.index, dtype=object)
+    return codes
+
+
+def take_rows(df: pd.DataFrame, positions: np.ndarray) -> Dict[str, object]:
+    """
+    Columns of ``df`` gathered at ``positions``; ``-1`` yields a missing
+    value (ints become float, as in a left merge).
+    """
+    out = {}
+    for col in df.columns:
+        values = df[col]
+        # numpy-backed columns go through as ndarrays: ``take`` on their
+        # NumpyExtensionArray wrapper is deprecated
+        if isinstance(values.dtype, np.dtype):
+            values = values.to_numpy()
+        else:
+            values = values.array
+        out[col] = take(values, positions, allow_fill=True)
+    return out
+
+
+class _GroupIndex:
+    """
+    Hash index from a key to the row positions holding it.
+
+    Rows are stored sorted by key code, so the rows of one key are a
+    contiguous slice of ``positions``.
+    """
+
+    def __init__(self, values: np.ndarray):
+        codes, uniques = pd.factorize(values, sort=False)
+        valid = np.flatnonzero(codes >= 0)
+        self.labels = pd.Index(uniques)
+        self.positions = valid[np.argsort(codes[valid], kind="stable")]
+        self.sizes = np.bincount(codes[valid], minlength=len(uniques))
+        self.starts = np.cumsum(self.sizes) - self.sizes
+
+    def __contains__(self, label) -> bool:
+        return label in self.labels
+
+    def get(self, label) -> np.ndarray:
+        """Row positions of ``label`` (empty when absent)."""
+        try:
+            code = self.labels.get_loc(label)
+        except KeyError:
+            return np.array([], dtype=np.intp)
+        start = self.starts[code]
+        return self.positions[start:start + self.sizes[code]]
+
+    def lookup(self, keys: np.ndarray):
+        """Per key: (start into ``positions``, number of matching rows)."""
+        codes = self.labels.get_indexer(keys)
+        if not len(self.labels):
+            empty = np.zeros(len(keys), dtype=np.intp)
+            return empty, empty
+        found = codes >= 0
+        safe = np.maximum(codes, 0)
+        starts = np.where(found, self.starts[safe], 0)
+        return starts, np.where(found, self.sizes[safe], 0)
+
+
+# ---------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------
+
+class ImpactLinkStore:
+    """
+    Impact links with hash indexes on the parent event and the indicator.
+
+    The canonical ``indicator_code`` of each link is resolved once when
+    links are loaded (see ``resolve_indicator_codes``). The indexes map
+    a ``parent_id`` or an indicator code to row positions, so "links of
+    these events" and "events affecting this indicator" are dictionary
+    lookups plus one ``take`` instead of a merge over every link.
+
+    Parameters
+    ----------
+    links : pd.DataFrame
+        Impact-link rows (``record_type == "impact_link"``).
+    key : sequence of str
+        Columns identifying a link for ``upsert``.
+
+    Example
+    -------
+    >>> store = ImpactLinkStore.from_unified(df)
+    >>> store.links_for_events(["EVT_0001", "EVT_0004"])
+    >>> store.events_for_indicator("ACC_OWNERSHIP")
+    """
+
+    def __init__(
+        self,
+        links: Optional[pd.DataFrame] = None,
+        key: Sequence[str] = ("record_id", "parent_id"),
+        event_col: str = "parent_id",
+    ):
+        self.key = tuple(key)
+        self.event_col = event_col
+        self._frame = self._canonical(pd.DataFrame() if links is None else links)
+        self._by_event: Optional[_GroupIndex] = None
+        self._by_indicator: Optional[_GroupIndex] = None
+
+    @classmethod
+    def from_unified(cls, df: pd.DataFrame, **kwargs) -> "ImpactLinkStore":
+        """Store built from the impact-link rows of a unified dataset."""
+        return cls(df[df["record_type"] == "impact_link"], **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    @staticmethod
+    def _canonical(links: pd.DataFrame) -> pd.DataFrame:
+        out = links.reset_index(drop=True)
+        out["indicator_code"] = resolve_indicator_codes(out).to_numpy()
+        return out
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """All links, with the canonical ``indicator_code``."""
+        return self._frame
+
+    # -------------------------
+    # Indexes
+    # -------------------------
+
+    @property
+    def by_event(self) -> _GroupIndex:
+        """``parent_id`` -> row positions."""
+        if self._by_event is None:
+            events = (
+                self._frame[self.event_col].to_numpy(dtype=object)
+                if self.event_col in self._frame.columns
+                else np.full(len(self._frame), None, dtype=object)
+            )
+            self._by_event = _GroupIndex(events)
+        return self._by_event
+
+    @property
+    def by_indicator(self) -> _GroupIndex:
+        """Canonical indicator code -> row positions."""
+        if self._by_indicator is None:
+            self._by_indicator = _GroupIndex(
+                self._frame["indicator_code"].to_numpy(dtype=object)
+            )
+        return self._by_indicator
+
+    @staticmethod
+    def _positions(index: _GroupIndex, labels: Iterable) -> np.ndarray:
+        parts = [index.get(label) for label in labels]
+        return np.concatenate(parts) if parts else np.array([], dtype=np.intp)
+
+    # -------------------------
+    # Queries
+    # -------------------------
+
+    def links_for_events(self, event_ids: Iterable) -> pd.DataFrame:
+        """Links whose ``parent_id`` is one of ``event_ids``, grouped by event."""
+        return self._frame.take(self._positions(self.by_event, event_ids))
+
+    def links_for_indicators(self, indicators: Iterable) -> pd.DataFrame:
+        """Links targeting any of ``indicators``."""
+        return self._frame.take(self._positions(self.by_indicator, indicators))
+
+    def events_for_indicator(self, indicator) -> np.ndarray:
+        """Distinct parent event ids of links targeting ``indicator``."""
+        positions = self.by_indicator.get(indicator)
+        if self.event_col not in self._frame.columns:
+            return np.array([], dtype=object)
+        return pd.unique(self._frame[self.event_col].to_numpy(dtype=object)[positions])
+
+    def indicators_for_event(self, event_id) -> np.ndarray:
+        """Distinct indicator codes linked to ``event_id``."""
+        positions = self.by_event.get(event_id)
+        return pd.unique(
+            self._frame["indicator_code"].to_numpy(dtype=object)[positions]
+        )
+
+    # -------------------------
+    # Updates
+    # -------------------------
+
+    def upsert(self, links: pd.DataFrame) -> None:
+        """
+        Insert or replace links in bulk.
+
+        Existing links whose ``key`` matches a new row are replaced;
+        the rest are appended. Indexes are rebuilt lazily on the next
+        query, so a batch of upserts costs one rebuild.
+        """
+        if links.empty:
+            return
+        if self._frame.empty:
+            merged = links
+        else:
+            key = [
+                c for c in self.key if c in self._frame.columns and c in links.columns
+            ]
+            if key:
+                old = pd.MultiIndex.from_frame(self._frame[key].astype(object))
+                new = pd.MultiIndex.from_frame(links[key].astype(object))
+                keep = ~old.isin(new)
+                new_rows = ~new.duplicated(keep="last")
+                merged = pd.concat(
+                    [self._frame[keep], links[new_rows]], ignore_index=True
+                )
+            else:
+                merged = pd.concat([self._frame, links], ignore_index=True)
+
+        self._frame = self._canonical(merged)
+        self._by_event = None
+        self._by_indicator = None
+
+    # -------------------------
+    # Joins
+    # -------------------------
+
+    def join_events(
+        self,
+        events: pd.DataFrame,
+        event_key: str = "record_id",
+        suffixes: Tuple[str, str] = ("_event", "_link"),
+    ) -> pd.DataFrame:
+        """
+        Left-join ``events`` to their links.
+
+        Produces the same rows, row order and columns as
+        ``events.merge(links, how="left", left_on=event_key,
+        right_on="parent_id", suffixes=suffixes)`` followed by the
+        canonical ``indicator_code`` column, but gathers each side with
+        positional ``take`` instead of a hash merge.
+        """
+        links = self._frame
+        start, counts = self.by_event.lookup(events[event_key].to_numpy(dtype=object))
+        reps = np.maximum(counts, 1)
+
+        ev_pos = np.repeat(np.arange(len(events)), reps)
+        offset = np.arange(reps.sum()) - np.repeat(np.cumsum(reps) - reps, reps)
+        matched = np.repeat(counts > 0, reps)
+        lk_pos = np.full(len(ev_pos), -1, dtype=np.intp)
+        hit = (np.repeat(start, reps) + offset)[matched]
+        lk_pos[matched] = self.by_event.positions[hit]
+
+        shared = set(events.columns) & set(links.columns)
+        left, right = suffixes
+        columns = {}
+        for col, values in take_rows(events, ev_pos).items():
+            columns[f"{col}{left}" if col in shared else col] = values
+        for col, values in take_rows(links, lk_pos).items():
+            columns[f"{col}{right}" if col in shared else col] = values
+
+        out = pd.DataFrame(columns)
+        out["indicator_code"] = columns[
+            f"indicator_code{right}" if "indicator_code" in shared else "indicator_code"
+        ]
+        return out
@@ -0,0 +1,377 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from fi_forecasting.utils.paths import ensure_parent
+
+logger = logging.getLogger(__name__)
+
+Label = Union[str, int]
+
+
+# ---------------------------------------------------------------------
+# Label index
+# ---------------------------------------------------------------------
+
+class _LabelIndex:
+    """
+    Append-only label -> position map.
+
+    Positions never change once assigned, so row/column numbers stay
+    valid while the matrix grows. Removed labels keep their slot (and get
+    it back if they are added again) until ``ImpactMatrix.compact``.
+    """
+
+    def __init__(self, labels: Iterable[Label] = ()):
+        self.labels: List[Label] = []
+        self.positions: Dict[Label, int] = {}
+        self.removed: set = set()
+        for label in labels:
+            self.add(label)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __contains__(self, label: Label) -> bool:
+        return label in self.positions and label not in self.removed
+
+    def add(self, label: Label) -> int:
+        pos = self.positions.get(label)
+        if pos is None:
+            pos = len(self.labels)
+            self.labels.append(label)
+            self.positions[label] = pos
+        self.removed.discard(label)
+        return pos
+
+    def add_many(self, labels: Sequence[Label]) -> np.ndarray:
+        """Positions for ``labels``, registering unseen ones in order."""
+        codes, uniques = pd.factorize(np.asarray(labels, dtype=object), sort=False)
+        return np.array([self.add(u) for u in uniques], dtype=np.int64)[codes]
+
+    def get(self, label: Label) -> int:
+        if label not in self:
+            raise KeyError(label)
+        return self.positions[label]
+
+    def remove(self, label: Label) -> int:
+        pos = self.get(label)
+        self.removed.add(label)
+        return pos
+
+    def active_mask(self) -> np.ndarray:
+        mask = np.ones(len(self.labels), dtype=bool)
+        for label in self.removed:
+            mask[self.positions[label]] = False
+        return mask
+
+
+# ---------------------------------------------------------------------
+# Sparse association matrix
+# ---------------------------------------------------------------------
+
+class ImpactMatrix:
+    """
+    Sparse event x indicator association matrix.
+
+    Backed by a CSR matrix with stable label -> row/column maps. Single
+    links and whole events are added to a small COO buffer in O(1) and
+    folded into the CSR matrix (one O(nnz) sum) on the next read, so
+    many small updates cost one rebuild. A CSC copy is kept for column
+    slices and dropped whenever the matrix changes. Duplicate
+    (event, indicator) entries are summed, like the ``pivot_table``
+    ``aggfunc="sum"`` it replaces.
+
+    Example
+    -------
+    >>> m = ImpactMatrix.from_links(effects)
+    >>> m.add_link("EVT_0100", "ACC_OWNERSHIP", 15.0)
+    >>> m.column("ACC_OWNERSHIP")
+    >>> m.save("models/impact_association_matrix.npz")
+    """
+
+    def __init__(
+        self,
+        events: Iterable[Label] = (),
+        indicators: Iterable[Label] = (),
+        matrix: Optional[sparse.spmatrix] = None,
+    ):
+        self._events = _LabelIndex(events)
+        self._indicators = _LabelIndex(indicators)
+        shape = (len(self._events), len(self._indicators))
+        self._csr = sparse.csr_matrix(
+            matrix if matrix is not None else shape, dtype=float
+        )
+        if self._csr.shape != shape:
+            raise ValueError(
+                f"Matrix shape {self._csr.shape} does not match labels {shape}"
+            )
+        self._pending: List[tuple] = []
+        self._csc: Optional[sparse.csc_matrix] = None
+
+    # -------------------------
+    # Construction
+    # -------------------------
+
+    @classmethod
+    def from_links(
+        cls,
+        df: pd.DataFrame,
+        event_col: str = "record_id_event",
+        indicator_col: str = "indicator_code",
+        value_col: str = "effect_value",
+    ) -> "ImpactMatrix":
+        """
+        Build from a long frame of (event, indicator, value) rows in
+        O(nnz). Rows with a missing event, indicator or value are
+        skipped.
+        """
+        data = df[[event_col, indicator_col, value_col]]
+        values = pd.to_numeric(data[value_col], errors="coerce").to_numpy(dtype=float)
+        valid = (
+            data[event_col].notna().to_numpy() & data[indicator_col].notna().to_numpy()
+        )
+        valid &= np.isfinite(values)
+
+        matrix = cls()
+        matrix.add_links(
+            data[event_col].to_numpy()[valid],
+            data[indicator_col].to_numpy()[valid],
+            values[valid],
+        )
+        return matrix
+
+    # -------------------------
+    # Shape and labels
+    # -------------------------
+
+    @property
+    def events(self) -> pd.Index:
+        """Active event labels, in row order."""
+        labels = np.asarray(self._events.labels, dtype=object)
+        return pd.Index(labels[self._events.active_mask()], name="event")
+
+    @property
+    def indicators(self) -> pd.Index:
+        """Active indicator labels, in column order."""
+        labels = np.asarray(self._indicators.labels, dtype=object)
+        return pd.Index(labels[self._indicators.active_mask()], name="indicator")
+
+    @property
+    def shape(self) -> tuple:
+        """(active events, active indicators), as in ``to_frame``."""
+        return (
+            len(self._events) - len(self._events.removed),
+            len(self._indicators) - len(self._indicators.removed),
+        )
+
+    def _slots(self) -> tuple:
+        """Storage shape: every label slot, removed ones included."""
+        return (len(self._events), len(self._indicators))
+
+    @property
+    def nnz(self) -> int:
+        return self.tocsr().nnz
+
+    def __contains__(self, event: Label) -> bool:
+        return event in self._events
+
+    def __repr__(self) -> str:
+        return (
+            f"ImpactMatrix({len(self.events)} events x {len(self.indicators)} "
+            f"indicators, nnz={self.nnz})"
+        )
+
+    # -------------------------
+    # Materialization
+    # -------------------------
+
+    def _changed(self) -> None:
+        self._csc = None
+
+    def tocsr(self) -> sparse.csr_matrix:
+        """
+        The CSR matrix with every pending update applied. It has a row
+        or column per label slot; removed slots stay (empty) until
+        ``compact``.
+        """
+        shape = self._slots()
+        if self._csr.shape != shape:
+            self._csr.resize(shape)
+        if self._pending:
+            rows, cols, vals = (np.concatenate(parts) for parts in zip(*self._pending))
+            self._pending = []
+            update = sparse.coo_matrix((vals, (rows, cols)), shape=shape).tocsr()
+            self._csr = (self._csr + update).tocsr()
+            self._csr.eliminate_zeros()
+        return self._csr
+
+    def tocsc(self) -> sparse.csc_matrix:
+        if self._csc is None or self._pending or self._csc.shape != self._slots():
+            self._csc = self.tocsr().tocsc()
+        return self._csc
+
+    # -------------------------
+    # Updates
+    # -------------------------
+
+    def add_links(
+        self,
+        events: Sequence[Label],
+        indicators: Sequence[Label],
+        values: Sequence[float],
+    ) -> None:
+        """Add (summing) many links at once."""
+        if len(events) == 0:
+            return
+        rows = self._events.add_many(events)
+        cols = self._indicators.add_many(indicators)
+        self._pending.append((rows, cols, np.asarray(values, dtype=float)))
+        self._changed()
+
+    def add_link(self, event: Label, indicator: Label, value: float) -> None:
+        """Add ``value`` to the (event, indicator) entry."""
+        row = self._events.add(event)
+        col = self._indicators.add(indicator)
+        self._pending.append(
+            (np.array([row]), np.array([col]), np.array([float(value)]))
+        )
+        self._changed()
+
+    def add_event(self, event: Label, effects: Mapping[Label, float]) -> None:
+        """Add one event with its indicator effects."""
+        self._events.add(event)
+        if effects:
+            self.add_links(
+                [event] * len(effects), list(effects), list(effects.values())
+            )
+
+    def remove_link(self, event: Label, indicator: Label) -> None:
+        """Drop the (event, indicator) entry."""
+        row = self._events.get(event)
+        col = self._indicators.get(indicator)
+        csr = self.tocsr()
+        start, stop = csr.indptr[row], csr.indptr[row + 1]
+        hit = np.flatnonzero(csr.indices[start:stop] == col)
+        if hit.size:
+            csr.data[start + hit] = 0.0
+            csr.eliminate_zeros()
+            self._changed()
+
+    def remove_event(self, event: Label) -> None:
+        """Drop an event row; its label slot is kept until ``compact``."""
+        row = self._events.get(event)
+        csr = self.tocsr()
+        csr.data[csr.indptr[row]:csr.indptr[row + 1]] = 0.0
+        csr.eliminate_zeros()
+        self._events.remove(event)
+        self._changed()
+
+    def compact(self) -> "ImpactMatrix":
+        """New matrix without removed events/indicators or empty slots."""
+        csr = self.tocsr()
+        rows = np.flatnonzero(self._events.active_mask())
+        cols = np.flatnonzero(self._indicators.active_mask())
+        return ImpactMatrix(self.events, self.indicators, csr[rows][:, cols])
+
+    # -------------------------
+    # Queries
+    # -------------------------
+
+    def row(self, event: Label) -> pd.Series:
+        """Non-zero effects of one event, indexed by indicator."""
+        csr = self.tocsr()
+        r = self._events.get(event)
+        start, stop = csr.indptr[r], csr.indptr[r + 1]
+        labels = np.asarray(self._indicators.labels, dtype=object)
+        labels = labels[csr.indices[start:stop]]
+        return pd.Series(
+            csr.data[start:stop], index=pd.Index(labels, name="indicator"), name=event
+        )
+
+    def column(self, indicator: Label) -> pd.Series:
+        """Non-zero effects on one indicator, indexed by event."""
+        csc = self.tocsc()
+        c = self._indicators.get(indicator)
+        start, stop = csc.indptr[c], csc.indptr[c + 1]
+        labels = np.asarray(self._events.labels, dtype=object)[csc.indices[start:stop]]
+        return pd.Series(
+            csc.data[start:stop], index=pd.Index(labels, name="event"), name=indicator
+        )
+
+    def rows(self, events: Sequence[Label]) -> sparse.csr_matrix:
+        """CSR slice for ``events`` (all indicator columns)."""
+        return self.tocsr()[[self._events.get(e) for e in events]]
+
+    def columns(self, indicators: Sequence[Label]) -> sparse.csc_matrix:
+        """CSC slice for ``indicators`` (all event rows)."""
+        return self.tocsc()[:, [self._indicators.get(i) for i in indicators]]
+
+    def to_frame(self, sort: bool = True) -> pd.DataFrame:
+        """
+        Dense event x indicator frame (zeros filled), matching the layout
+        of the former ``pivot_table`` output. Only call for small
+        matrices or slices.
+        """
+        csr = self.tocsr()
+        rows = np.flatnonzero(self._events.active_mask())
+        cols = np.flatnonzero(self._indicators.active_mask())
+        dense = csr[rows][:, cols].toarray()
+        frame = pd.DataFrame(dense, index=self.events, columns=self.indicators)
+        if sort:
+            frame = frame.sort_index(axis=0).sort_index(axis=1)
+        return frame
+
+    def to_long(self) -> pd.DataFrame:
+        """Non-zero entries as (event, indicator, value) rows."""
+        coo = self.tocsr().tocoo()
+        return pd.DataFrame(
+            {
+                "event": np.asarray(self._events.labels, dtype=object)[coo.row],
+                "indicator": np.asarray(self._indicators.labels, dtype=object)[coo.col],
+                "value": coo.data,
+            }
+        )
+
+    # -------------------------
+    # Serialization
+    # -------------------------
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """
+        Write the compacted matrix and its labels to one ``.npz`` file
+        (CSR arrays, no dense materialization).
+        """
+        path = Path(path)
+        if path.suffix != ".npz":
+            path = path.with_suffix(".npz")
+        ensure_parent(path)
+
+        m = self.compact()
+        csr = m.tocsr()
+        np.savez_compressed(
+            path,
+            data=csr.data,
+            indices=csr.indices,
+            indptr=csr.indptr,
+            shape=np.asarray(csr.shape),
+            events=np.array(m.events.astype(str).tolist(), dtype=str),
+            indicators=np.array(m.indicators.astype(str).tolist(), dtype=str),
+        )
+        logger.debug("Saved %r to %s", m, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ImpactMatrix":
+        """Read a matrix written by ``save``."""
+        with np.load(Path(path), allow_pickle=False) as f:
+            csr = sparse.csr_matrix(
+                (f["data"], f["indices"], f["indptr"]), shape=tuple(f["shape"])
+            )
+            return cls(f["events"].tolist(), f["indicators"].tolist(), csr)
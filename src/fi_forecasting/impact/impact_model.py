@@ -2,86 +2,193 @@
 # impact_model.py - Updated for merged_df column names
 # ==================================================
 
+import numpy as np
 import pandas as pd
 
+from typing import Iterable, Mapping, Optional, Union
+
+from fi_forecasting.impact.impact_links import ImpactLinkStore
+from fi_forecasting.impact.impact_matrix import ImpactMatrix
+from fi_forecasting.impact.lag_models import (
+    direction_signs,
+    evidence_weights,
+    magnitude_values,
+)
+from fi_forecasting.utils.profiling import instrument
+
 # -----------------------------
 # 1. Merge events with impact links
 # -----------------------------
-def merge_events_impact(events_df: pd.DataFrame, impact_links_df: pd.DataFrame) -> pd.DataFrame:
+@instrument
+def merge_events_impact(
+    events_df: pd.DataFrame,
+    impact_links_df: Union[pd.DataFrame, ImpactLinkStore],
+) -> pd.DataFrame:
     """
     Merge events with their impact links using 'record_id' from events
-    and 'parent_id' from impact links. Fills missing indicator codes
-    from related_indicator if needed.
+    and 'parent_id' from impact links. Every event is kept; overlapping
+    columns get '_event' / '_link' suffixes and 'indicator_code' holds
+    each link's canonical indicator (its own indicator_code, falling back
+    to related_indicator).
+
+    Pass an ``ImpactLinkStore`` to reuse its indexes across calls.
     """
-    df_links = impact_links_df.copy()
-
-    # Ensure we have a column named 'indicator_code'
-    if 'indicator_code' not in df_links.columns or df_links['indicator_code'].isna().all():
-        if 'related_indicator' in df_links.columns:
-            df_links['indicator_code'] = df_links['related_indicator']
-        else:
-            df_links['indicator_code'] = 'UNKNOWN'
-
-    merged_df = events_df.merge(
-        df_links,
-        how='left',  # keep all events
-        left_on='record_id',
-        right_on='parent_id',
-        suffixes=('_event', '_link')
+    store = (
+        impact_links_df
+        if isinstance(impact_links_df, ImpactLinkStore)
+        else ImpactLinkStore(impact_links_df)
     )
-
-    # Fill missing indicator_code column
-    if 'indicator_code' not in merged_df.columns:
-        merged_df['indicator_code'] = merged_df.get('related_indicator_link', 'UNKNOWN')
-    else:
-        merged_df['indicator_code'] = merged_df['indicator_code'].fillna(
-            merged_df.get('related_indicator_link', 'UNKNOWN')
-        )
-
-    return merged_df
+    return store.join_events(events_df)
 
 
 # -----------------------------
 # 2. Compute effect values
 # -----------------------------
-def apply_event_effects(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+EFFECT_LEVEL_COLUMNS = ("impact_magnitude", "impact_direction", "evidence_basis")
+
+
+def _link_col(df: pd.DataFrame, name: str) -> str:
+    """Column holding the link's ``name`` (suffixed after a merge)."""
+    return f"{name}_link" if f"{name}_link" in df.columns else name
+
+
+def _normalized_codes(values: pd.Series):
+    """
+    Integer codes and lower-cased levels of a label column.
+
+    Categorical columns reuse their codes; other columns are factorized
+    once. Only the (few) distinct labels are normalized, never the rows.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        uniques = values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+    keys = pd.Index(uniques).astype(str).str.strip().str.lower()
+    key_codes, levels = pd.factorize(keys)
+    if len(keys):
+        codes = np.where(codes >= 0, key_codes[np.maximum(codes, 0)], -1)
+    return codes, pd.Index(levels)
+
+
+def _lookup(
+    values: pd.Series, table: Mapping[str, float], default: float
+) -> np.ndarray:
+    """``table[label]`` for every row via one array take (``default`` if absent)."""
+    codes, levels = _normalized_codes(values)
+    lut = np.array([table.get(k, default) for k in levels] + [default], dtype=float)
+    return lut[codes]
+
 
-    # columns
+def encode_effect_levels(
+    df: pd.DataFrame,
+    columns: Iterable[str] = EFFECT_LEVEL_COLUMNS,
+) -> pd.DataFrame:
+    """
+    Link label columns as normalized (lower-case) categoricals.
+
+    Encode once before repeated ``apply_event_effects`` calls (e.g. a
+    scenario sweep over magnitude tables) so each call is a lookup on
+    the stored codes. Other columns are shared, not copied.
+    """
+    encoded = {}
+    for name in columns:
+        col = _link_col(df, name)
+        if col in df.columns:
+            codes, levels = _normalized_codes(df[col])
+            encoded[col] = pd.Categorical.from_codes(codes, categories=levels)
+    return df.assign(**encoded)
+
+
+@instrument
+def apply_event_effects(
+    df: pd.DataFrame,
+    magnitudes: Optional[Mapping[str, float]] = None,
+    directions: Optional[Mapping[str, float]] = None,
+    weights: Optional[Mapping[str, float]] = None,
+    scale: float = 100.0,
+) -> pd.DataFrame:
+    """
+    Effect of each event -> indicator link, in percentage points.
+
+    ``effect_value = magnitude * scale * direction sign * evidence weight``
+    where the magnitude level comes from ``events.magnitude_values``
+    (unknown levels give 0), the sign from ``events.direction_signs``
+    (unknown directions give 0) and the weight from
+    ``events.evidence_weights`` (unknown or missing bases give 1).
+
+    Labels are mapped through lookup arrays indexed by their integer
+    codes; only the output columns are allocated, the input frame is
+    neither copied nor modified. Run ``encode_effect_levels`` first to
+    reuse the codes across many calls.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Output of ``merge_events_impact`` (``*_link`` columns) or raw
+        impact-link rows.
+    magnitudes, directions, weights : mapping, optional
+        Override the configured tables (keys are lower-case labels).
+    scale : float
+        Multiplier from configured magnitude values to effect units.
+
+    Returns
+    -------
+    pd.DataFrame
+        record_id_event, indicator_code, impact_magnitude, direction_sign,
+        evidence_weight, lag_months, effect_value.
+    """
     event_col = "record_id_event"
     ind_col = "indicator_code"
 
-    # ---- MAP MAGNITUDE (THIS IS THE REAL ISSUE) ----
-    magnitude_map = {
-        "low": 5,
-        "medium": 15,
-        "high": 25
-    }
-
-    df["impact_magnitude"] = (
-        df["impact_magnitude_link"]
-        .str.lower()
-        .map(magnitude_map)
-        .fillna(0)
-    )
-
-    df["lag_months"] = pd.to_numeric(
-        df["lag_months_link"], errors="coerce"
-    ).fillna(0)
+    magnitudes = magnitude_values() if magnitudes is None else magnitudes
+    directions = direction_signs() if directions is None else directions
+    weights = evidence_weights() if weights is None else weights
 
-    # ---- EFFECT MODEL ----
-    df["effect_value"] = df["impact_magnitude"]
+    n = len(df)
+    magnitude = _lookup(df[_link_col(df, "impact_magnitude")], magnitudes, 0.0)
+    magnitude *= scale
 
-    return df[
-        [event_col, ind_col, "impact_magnitude", "lag_months", "effect_value"]
-    ]
+    direction_col = _link_col(df, "impact_direction")
+    sign = (
+        _lookup(df[direction_col], directions, 0.0)
+        if direction_col in df.columns
+        else np.ones(n)
+    )
 
+    evidence_col = _link_col(df, "evidence_basis")
+    weight = (
+        _lookup(df[evidence_col], weights, 1.0)
+        if evidence_col in df.columns
+        else np.ones(n)
+    )
 
+    lag = df[_link_col(df, "lag_months")]
+    if not pd.api.types.is_numeric_dtype(lag):
+        lag = pd.to_numeric(lag, errors="coerce")
+    lag = np.nan_to_num(lag.to_numpy(dtype=float, na_value=np.nan))
+
+    effect = magnitude * sign
+    effect *= weight
+
+    return pd.DataFrame(
+        {
+            event_col: df[event_col].array,
+            ind_col: df[ind_col].array,
+            "impact_magnitude": magnitude,
+            "direction_sign": sign,
+            "evidence_weight": weight,
+            "lag_months": lag,
+            "effect_value": effect,
+        },
+        index=df.index,
+    )
 
 
 # -----------------------------
 # 3. Build Event-Indicator Association Matrix
 # -----------------------------
+@instrument
 def build_event_indicator_matrix(
     df: pd.DataFrame,
     event_col='record_id_event',
@@ -90,15 +197,17 @@ def build_event_indicator_matrix(
 ) -> pd.DataFrame:
     """
     Pivot table of events vs indicators with effect values.
+
+    Built through the sparse ``ImpactMatrix``; use that class directly to
+    keep the matrix sparse, update it incrementally or serialize it.
     """
     if df.empty:
         return pd.DataFrame()  # return empty if no data
 
-    pivot = df.pivot_table(
-        index=event_col,
-        columns=indicator_col,
-        values=effect_col,
-        aggfunc='sum',
-        fill_value=0
+    matrix = ImpactMatrix.from_links(
+        df, event_col=event_col, indicator_col=indicator_col, value_col=effect_col
     )
+    pivot = matrix.to_frame()
+    pivot.index.name = event_col
+    pivot.columns.name = indicator_col
     return pivot
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from fi_forecasting.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_SHAPES = ("step", "ramp", "logistic", "decay")
+DEFAULT_SHAPE = "step"
+DEFAULT_HALF_LIFE_MONTHS = 24.0
+
+# Logistic steepness: the S-curve rises from ~2% to ~98% of the full
+# effect over ``lag_months``.
+_LOGISTIC_SPAN = 8.0
+
+
+# ---------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------
+
+def events_config() -> Dict:
+    """The ``events`` section of the merged config."""
+    return settings.get("events", {}) or {}
+
+
+def default_impacts() -> Dict[str, Dict]:
+    """``events.default_impacts``: per-category lag, magnitude and shape."""
+    return dict(events_config().get("default_impacts", {}))
+
+
+def magnitude_values() -> Dict[str, float]:
+    """``events.magnitude_values``: magnitude level -> relative effect."""
+    values = events_config().get("magnitude_values") or {}
+    return {k: float(v) for k, v in values.items()}
+
+
+def direction_signs() -> Dict[str, float]:
+    """``events.direction_signs``: impact_direction -> +1 / -1."""
+    signs = events_config().get("direction_signs") or {"increase": 1, "decrease": -1}
+    return {k: float(v) for k, v in signs.items()}
+
+
+def evidence_weights() -> Dict[str, float]:
+    """``events.evidence_weights``: evidence_basis -> effect weight."""
+    weights = events_config().get("evidence_weights") or {}
+    return {k: float(v) for k, v in weights.items()}
+
+
+def fill_link_defaults(
+    links: pd.DataFrame,
+    category_col: str = "category",
+) -> pd.DataFrame:
+    """
+    Fill missing ``lag_months``, ``magnitude`` and ``shape`` of links from
+    ``events.default_impacts`` for their event category.
+
+    Columns that are absent are created. Links whose category has no
+    defaults keep their missing values. Returns a new frame.
+    """
+    defaults = default_impacts()
+    out = links.copy()
+    category = out[category_col].astype(object) if category_col in out.columns else None
+
+    for col, key in (
+        ("lag_months", "lag_months"),
+        ("magnitude", "magnitude"),
+        ("shape", "shape"),
+    ):
+        if col not in out.columns:
+            out[col] = np.nan if col == "lag_months" else None
+        if category is None:
+            continue
+        fallback = category.map({c: d.get(key) for c, d in defaults.items()})
+        if col == "lag_months":
+            out[col] = pd.to_numeric(out[col], errors="coerce").fillna(
+                pd.to_numeric(fallback, errors="coerce")
+            )
+        else:
+            out[col] = out[col].astype(object).where(out[col].notna(), fallback)
+    return out
+
+
+# ---------------------------------------------------------------------
+# Response shapes
+# ---------------------------------------------------------------------
+
+def response_curve(
+    shape: str,
+    lag_months: float,
+    n_months: int,
+    half_life_months: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Share of the full effect reached ``m`` months after an event.
+
+    Shapes
+    ------
+    step
+        0 before ``lag_months``, 1 from then on (the notebook's rule).
+    ramp
+        Linear rise from 0 at the event to 1 at ``lag_months``.
+    logistic
+        S-curve centered on ``lag_months / 2``, near 1 by ``lag_months``.
+    decay
+        Full effect at ``lag_months``, then halving every
+        ``half_life_months``.
+
+    Returns
+    -------
+    np.ndarray
+        Length ``n_months``; element ``m`` is the response at month ``m``.
+    """
+    if shape not in RESPONSE_SHAPES:
+        raise ValueError(
+            f"Unknown response shape '{shape}'; expected one of {RESPONSE_SHAPES}"
+        )
+
+    m = np.arange(n_months, dtype=float)
+    lag = max(float(lag_months), 0.0)
+
+    if shape == "step" or lag == 0 and shape in ("ramp", "logistic"):
+        return (m >= lag).astype(float)
+    if shape == "ramp":
+        return np.clip(m / lag, 0.0, 1.0)
+    if shape == "logistic":
+        return 1.0 / (1.0 + np.exp(-_LOGISTIC_SPAN / lag * (m - lag / 2)))
+
+    half_life = half_life_months or DEFAULT_HALF_LIFE_MONTHS
+    return np.where(m >= lag, np.exp(-np.log(2) * (m - lag) / half_life), 0.0)
+
+
+# ---------------------------------------------------------------------
+# Effect grid
+# ---------------------------------------------------------------------
+
+@dataclass
+class EffectGrid:
+    """Summed event effects on an (indicator x month) grid."""
+
+    indicators: pd.Index
+    months: pd.PeriodIndex
+    values: np.ndarray
+
+    def to_frame(self) -> pd.DataFrame:
+        """Wide frame: months as rows, one column per indicator."""
+        return pd.DataFrame(self.values.T, index=self.months, columns=self.indicators)
+
+    def long(self) -> pd.DataFrame:
+        """Long frame: indicator_code, month, effect."""
+        I, M = self.values.shape
+        return pd.DataFrame(
+            {
+                "indicator_code": np.repeat(np.asarray(self.indicators), M),
+                "month": np.tile(self.months, I),
+                "effect": self.values.ravel(),
+            }
+        )
+
+    def annual(self, how: str = "mean") -> pd.DataFrame:
+        """
+        Aggregate to calendar years (rows) x indicators.
+
+        ``how="mean"`` averages the months of each year; ``how="last"``
+        takes December (or the last month on the grid).
+        """
+        frame = self.to_frame()
+        grouped = frame.groupby(self.months.year)
+        out = grouped.last() if how == "last" else grouped.mean()
+        out.index.name = "year"
+        return out
+
+
+def _month_index(dates: pd.Series) -> np.ndarray:
+    """Months since year 0 (``year * 12 + month - 1``); NaN for NaT."""
+    dates = pd.to_datetime(dates, errors="coerce", format="mixed")
+    return (dates.dt.year * 12 + dates.dt.month - 1).to_numpy(dtype=float)
+
+
+def build_effect_grid(
+    links: pd.DataFrame,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    indicators: Optional[Sequence[str]] = None,
+    shape: Optional[str] = None,
+    half_life_months: Optional[float] = None,
+    effect_col: str = "effect",
+) -> EffectGrid:
+    """
+    Apply every event -> indicator link to a monthly grid at once.
+
+    Links are grouped by their response kernel (shape and lag). For each
+    kernel the link effects are scattered as impulses at their event
+    months into an (indicator x month) array, and all kernels are
+    convolved with their impulse arrays in a single batched FFT pass, so
+    runtime grows with the number of distinct kernels (a handful of
+    lags), not with the number of events.
+
+    Parameters
+    ----------
+    links : pd.DataFrame
+        Columns ``event_date``, ``indicator_code``, ``lag_months`` and
+        ``effect_col``; optional ``shape`` per link (missing values use
+        ``shape``, then ``events.default_impacts``, then ``"step"``).
+        ``forecasting.scenarios.prepare_links`` produces this layout.
+    start, end : str, optional
+        Grid bounds (anything ``pd.Period(..., "M")`` accepts); default
+        to the first event month and 36 months past the last onset.
+    indicators : sequence of str, optional
+        Grid rows; defaults to the linked indicators.
+    shape : str, optional
+        Shape for links without one.
+    half_life_months : float, optional
+        Half-life of ``decay`` responses; defaults to
+        ``events.decay_half_life_months``.
+
+    Returns
+    -------
+    EffectGrid
+    """
+    cfg = events_config()
+    half_life = half_life_months or cfg.get(
+        "decay_half_life_months", DEFAULT_HALF_LIFE_MONTHS
+    )
+
+    links = fill_link_defaults(links) if "category" in links.columns else links
+    event_month = _month_index(links["event_date"])
+    lag = pd.to_numeric(links["lag_months"], errors="coerce").fillna(0).to_numpy()
+    effect = pd.to_numeric(links[effect_col], errors="coerce").fillna(0).to_numpy()
+    shapes = (
+        links["shape"].astype(object).fillna(shape or DEFAULT_SHAPE).to_numpy()
+        if "shape" in links.columns
+        else np.full(len(links), shape or DEFAULT_SHAPE, dtype=object)
+    )
+    if shape is not None and "shape" in links.columns:
+        shapes = np.where(links["shape"].isna().to_numpy(), shape, shapes)
+
+    keep = np.isfinite(event_month) & (effect != 0)
+    if indicators is None:
+        indicators = pd.Index(pd.unique(links["indicator_code"][keep]))
+    else:
+        indicators = pd.Index(indicators)
+    row = indicators.get_indexer(links["indicator_code"])
+    keep &= row >= 0
+
+    if start is not None:
+        first = pd.Period(start, "M")
+    elif keep.any():
+        month = int(event_month[keep].min())
+        first = pd.Period(year=month // 12, month=month % 12 + 1, freq="M")
+    else:
+        first = pd.Period(pd.Timestamp.today(), "M")
+    if end is not None:
+        last = pd.Period(end, "M")
+    else:
+        if keep.any():
+            horizon = (event_month[keep] + lag[keep]).max() + 36
+        else:
+            horizon = first.year * 12 + first.month - 1 + 12
+        last = pd.Period(year=int(horizon // 12), month=int(horizon % 12) + 1, freq="M")
+
+    months = pd.period_range(first, last, freq="M")
+    origin = first.year * 12 + first.month - 1
+    n_months = len(months)
+    values = np.zeros((len(indicators), n_months))
+
+    if not keep.any():
+        return EffectGrid(indicators, months, values)
+
+    # Events before the grid still shape it; extend the working grid
+    # back to the earliest event and crop afterwards.
+    offset = event_month[keep].astype(int) - origin
+    pad = max(0, -int(offset.min()))
+    width = n_months + pad
+    col = offset + pad
+    inside = col < width
+
+    kernel_keys = pd.MultiIndex.from_arrays([shapes[keep], lag[keep]])
+    codes, uniques = pd.factorize(kernel_keys)
+    kernels = np.stack(
+        [response_curve(s, l, width, half_life) for s, l in uniques]
+    )                                                          # (K, W)
+
+    impulses = np.zeros((len(uniques), len(indicators), width))
+    np.add.at(
+        impulses,
+        (codes[inside], row[keep][inside], col[inside]),
+        effect[keep][inside],
+    )
+
+    n_fft = 1 << int(np.ceil(np.log2(2 * width)))
+    spectrum = (
+        np.fft.rfft(impulses, n_fft, axis=-1)
+        * np.fft.rfft(kernels, n_fft, axis=-1)[:, None, :]
+    )
+    response = np.fft.irfft(spectrum.sum(axis=0), n_fft, axis=-1)[:, :width]
+
+    values[:] = response[:, pad:]
+    # FFT round-off: exact zeros stay zero
+    values[np.abs(values) < 1e-12] = 0.0
+
+    logger.debug(
+        "Effect grid: %d link(s), %d kernel(s), %d indicator(s) x %d month(s)",
+        int(keep.sum()), len(uniques), len(indicators), n_months,
+    )
+    return EffectGrid(indicators, months, values)
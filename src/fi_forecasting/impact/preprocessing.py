@@ -1,6 +1,13 @@
 import pandas as pd
 import numpy as np
 
+from fi_forecasting.data.schema import apply_schema, fill_unknown
+from fi_forecasting.utils.profiling import instrument
+
+TRANSFORMS = ('growth_rate', 'log_diff', 'cagr', 'rolling_change')
+
+
+@instrument
 def clean_fi_data(df):
     """
     Basic preprocessing for Ethiopia FI dataset.
@@ -8,6 +15,9 @@ def clean_fi_data(df):
     - Fills missing pillar values with 'unknown'
     - Converts value_numeric to float
     - Fills key categorical columns with 'unknown'
+    - Applies the unified dtype schema (see data.schema.apply_schema)
+
+    The input frame is never modified.
 
     Raises:
         ValueError: if required columns are missing
@@ -17,11 +27,11 @@ def clean_fi_data(df):
     if missing_cols:
         raise ValueError(f"Missing required columns in dataset: {missing_cols}")
 
-    # Drop rows missing observation_date
-    df = df.dropna(subset=['observation_date'])
+    # Drop rows missing observation_date (explicit copy, not a view)
+    df = df.dropna(subset=['observation_date']).copy()
 
     # Fill missing pillar values
-    df['pillar'] = df['pillar'].fillna('unknown')
+    df['pillar'] = fill_unknown(df['pillar'])
 
     # Ensure numeric conversion
     if 'value_numeric' in df.columns:
@@ -29,25 +39,174 @@ def clean_fi_data(df):
 
     # Fill missing categorical columns
     for col in ['record_type', 'indicator_code', 'category', 'source_name']:
-        df[col] = df[col].fillna('unknown')
+        df[col] = fill_unknown(df[col])
+
+    return apply_schema(df)
+
+
+def _group_shift(values, starts, periods):
+    """Shift a sorted array by ``periods`` rows without crossing group starts."""
+    shifted = np.full(values.shape, np.nan)
+    if periods >= len(values):
+        return shifted
+    shifted[periods:] = values[:-periods]
+    # Position of each row within its group
+    idx = np.arange(len(values))
+    group_start = np.maximum.accumulate(np.where(starts, idx, 0))
+    shifted[idx - group_start < periods] = np.nan
+    return shifted
+
+
+@instrument
+def compute_indicator_transforms(
+    df,
+    transforms=TRANSFORMS,
+    group_cols=('indicator_code',),
+    date_col='observation_date',
+    value_col='value_numeric',
+    window=3,
+    by_year=False,
+    wide=False,
+):
+    """
+    Growth-style transforms for every indicator in one sorted pass.
+
+    Rows are sorted once by ``group_cols`` + ``date_col``; every transform
+    is then computed with array shifts that never cross group boundaries,
+    so the cost is one sort plus O(rows) regardless of the number of
+    indicators.
+
+    Transforms:
+    - growth_rate: period-on-period % change (YoY for annual data)
+    - log_diff: log(value) - log(previous value)
+    - cagr: compound annual growth rate (%) since the group's first
+      observation
+    - rolling_change: value minus the value ``window`` observations earlier
+
+    Args:
+        df: unified dataset (only the needed columns are read)
+        transforms: subset of TRANSFORMS
+        group_cols: series keys, e.g. ('indicator_code', 'region', 'gender')
+        by_year: average values per calendar year before transforming
+        wide: return a (period x series) panel instead of long rows
+
+    Returns:
+        Long frame: group_cols, date_col (or 'year'), value_col and one
+        column per transform, in sorted order. With ``wide=True`` a panel
+        indexed by period with (measure, series...) column levels.
+
+    Raises:
+        ValueError: on unknown transforms or missing columns
+    """
+    unknown = set(transforms) - set(TRANSFORMS)
+    if unknown:
+        raise ValueError(f"Unknown transforms: {sorted(unknown)}")
 
-    return df
+    group_cols = list(group_cols)
+    missing = [c for c in group_cols + [date_col, value_col] if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns in dataset: {missing}")
+
+    data = df[group_cols + [date_col, value_col]]
+    dates = data[date_col]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, errors='coerce', format='mixed')
+    data = data.assign(**{
+        date_col: dates,
+        value_col: pd.to_numeric(data[value_col], errors='coerce'),
+    })
+
+    # Missing keys (e.g. national rows without a region) form their own group
+    grouping = dict(dropna=False, sort=False, observed=True)
+
+    period_col = date_col
+    if by_year:
+        period_col = 'year'
+        data = (
+            data.assign(year=data[date_col].dt.year)
+            .groupby(group_cols + ['year'], **grouping)[value_col]
+            .mean()
+            .reset_index()
+        )
+
+    data = data.sort_values(group_cols + [period_col], kind='mergesort')
+
+    values = data[value_col].to_numpy(dtype=float)
+    # Group codes rather than raw keys: NaN != NaN would split every row
+    # with a missing key (e.g. national rows without a region) into its own group
+    codes = data.groupby(group_cols, **grouping).ngroup().to_numpy()
+    starts = np.ones(len(data), dtype=bool)
+    if len(data) > 1:
+        starts[1:] = codes[1:] != codes[:-1]
+
+    out = {}
+    prev = _group_shift(values, starts, 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if 'growth_rate' in transforms:
+            out['growth_rate'] = (values / prev - 1) * 100
+
+        if 'log_diff' in transforms:
+            out['log_diff'] = np.log(values) - np.log(prev)
+
+        if 'cagr' in transforms:
+            if by_year:
+                t = data['year'].to_numpy(dtype=float)
+            else:
+                days = data[date_col].to_numpy().astype('datetime64[D]')
+                t = days.astype(float) / 365.25
+            idx = np.arange(len(data))
+            first = np.maximum.accumulate(np.where(starts, idx, 0))
+            years = t - t[first]
+            ratio = values / values[first]
+            cagr = (np.power(ratio, 1 / years) - 1) * 100
+            cagr[~(years > 0)] = np.nan
+            out['cagr'] = cagr
+
+        if 'rolling_change' in transforms:
+            out['rolling_change'] = values - _group_shift(values, starts, window)
+
+    for name, arr in out.items():
+        arr[~np.isfinite(arr)] = np.nan
+
+    result = data.assign(**out)
+
+    if not wide:
+        return result
+
+    measures = [value_col] + [t for t in TRANSFORMS if t in out]
+    panel = (
+        result.groupby([period_col] + group_cols, **grouping)[measures]
+        .mean()
+        .unstack(group_cols)
+        .dropna(axis=1, how='all')
+        .sort_index()
+        .sort_index(axis=1)
+    )
+    return panel.astype(np.float32)
 
 
 def add_growth_rate(df, indicator_code):
     """
     Add year-on-year growth rate for a specific indicator.
-    - Creates a new column 'growth_rate' in df for the specified indicator.
-    
+    - Returns a new frame with a 'growth_rate' column filled for the
+      specified indicator (other rows keep any existing value or NaN).
+
+    Use compute_indicator_transforms to compute growth for every
+    indicator at once.
+
     Raises:
         ValueError: if indicator_code not found in df
     """
-    if indicator_code not in df['indicator_code'].values:
+    mask = (df['indicator_code'] == indicator_code).to_numpy()
+    if not mask.any():
         raise ValueError(f"Indicator '{indicator_code}' not found in dataset")
 
-    sub = df[df['indicator_code'] == indicator_code].sort_values('observation_date')
-    sub['growth_rate'] = sub['value_numeric'].pct_change() * 100
+    growth = compute_indicator_transforms(df[mask], transforms=('growth_rate',))
 
-    # Add back to main df
-    df.loc[sub.index, 'growth_rate'] = sub['growth_rate']
-    return df
+    current = (
+        df['growth_rate'] if 'growth_rate' in df.columns
+        else pd.Series(np.nan, index=df.index)
+    )
+    fresh = growth['growth_rate'].reindex(df.index)
+    return df.assign(growth_rate=current.astype(float).where(~mask, fresh))
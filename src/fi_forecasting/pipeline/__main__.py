@@ -0,0 +1,86 @@
+r"""
+Command-line entry point: ``python -m fi_forecasting.pipeline``.
+
+Examples
+--------
+Run everything (unchanged stages come from the cache)::
+
+    python -m fi_forecasting.pipeline
+
+Only the forecasts, recomputing the baseline::
+
+    python -m fi_forecasting.pipeline baseline intervals scenarios --force baseline
+
+Trace every stage and sample the enrichment for a flamegraph::
+
+    python -m fi_forecasting.pipeline --force \
+        --profile-stage enrich_dataset --profiler sampling
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+
+from fi_forecasting.pipeline.stages import default_pipeline
+from fi_forecasting.utils import profiling
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m fi_forecasting.pipeline",
+        description="Run the financial inclusion pipeline with stage caching.",
+    )
+    parser.add_argument("targets", nargs="*", help="stages to build (default: all)")
+    parser.add_argument("--force", nargs="*", metavar="STAGE",
+                        help="re-run the given stages (all when no name is given)")
+    parser.add_argument("--jobs", type=int, default=None, help="concurrent stages")
+    parser.add_argument(
+        "--clear-cache", action="store_true", help="drop cached outputs first"
+    )
+    parser.add_argument("--list", action="store_true", help="print the stages and exit")
+    parser.add_argument("--profile", action="store_true",
+                        help="trace stage and function timings to reports/logs")
+    parser.add_argument("--profile-stage", metavar="NAME",
+                        help="also profile one function or stage (implies --profile)")
+    parser.add_argument("--profiler", choices=profiling.PROFILERS, default=None,
+                        help="profiler for --profile-stage")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+
+    pipe = default_pipeline(max_workers=args.jobs)
+    if args.list:
+        for name in pipe.order():
+            deps = ", ".join(pipe.stages[name].deps) or "-"
+            print(f"{name:<10} <- {deps}")
+        return 0
+    if args.clear_cache:
+        pipe.cache.clear()
+
+    tracer = profiling.configure(
+        enabled=True if args.profile or args.profile_stage else None,
+        capture=args.profile_stage,
+        profiler=args.profiler,
+    )
+
+    force = True if args.force == [] else (args.force or False)
+    try:
+        run = pipe.run(args.targets or None, force=force)
+    finally:
+        profiling.disable()
+    print(run.report().drop(columns="key").to_string(index=False))
+
+    if tracer is not None and tracer.records:
+        trace = tracer.to_frame()
+        print("\n" + profiling.summarize_trace(trace).to_string(index=False))
+        chrome = profiling.export_chrome_trace(trace)
+        print(f"\nTrace: {tracer.path} (flame chart: {chrome})")
+    return 0 if run.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
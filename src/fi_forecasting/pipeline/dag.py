@@ -0,0 +1,628 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import textwrap
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+import pandas as pd
+
+import fi_forecasting
+from fi_forecasting.core.settings import settings
+from fi_forecasting.data.cache import FrameCache
+from fi_forecasting.utils import profiling
+from fi_forecasting.utils.paths import ensure_dir
+
+logger = logging.getLogger(__name__)
+
+FileInput = Union[str, Path, Callable[[], Optional[Path]]]
+
+DEFAULT_CACHE_DIR = "data/interim/.pipeline_cache"
+
+
+def pipeline_config() -> Dict:
+    """The ``pipeline`` section of the merged config."""
+    return settings.get("pipeline", {}) or {}
+
+
+# ---------------------------------------------------------------------
+# Stage definition
+# ---------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One step of a pipeline.
+
+    ``func`` is called with the outputs of ``deps`` as keyword arguments
+    (named after the upstream stages) and returns the stage output,
+    which must be picklable when ``cache`` is on.
+
+    Parameters
+    ----------
+    name : str
+        Unique stage name; also the keyword under which downstream
+        stages receive the output.
+    func : callable
+        Stage body.
+    deps : sequence of str
+        Upstream stages whose outputs ``func`` consumes.
+    files : sequence
+        Files read by the stage: paths (relative to the project root) or
+        zero-argument callables returning one, resolved at planning time
+        so they can follow the config. A missing file hashes as absent.
+    config : sequence of str
+        Config sections the stage reads.
+    modules : sequence of str
+        ``fi_forecasting`` modules the stage depends on beyond those
+        imported by ``func`` itself, e.g. ``"impact.preprocessing"``.
+    version : str
+        Bump to invalidate cached outputs by hand.
+    cache : bool
+        Store the output on disk. Stages with side effects (exports)
+        set this to False and run whenever they are selected.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    deps: Tuple[str, ...] = ()
+    files: Tuple[FileInput, ...] = ()
+    config: Tuple[str, ...] = ()
+    modules: Tuple[str, ...] = ()
+    version: str = "1"
+    cache: bool = True
+
+
+@dataclass
+class StageResult:
+    """Outcome of one stage in a run."""
+
+    name: str
+    key: str
+    status: str            # "hit", "run", "skipped" or "failed"
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def cache_hit(self) -> bool:
+        return self.status == "hit"
+
+
+@dataclass
+class PipelineRun:
+    """Outputs and per-stage report of ``Pipeline.run``."""
+
+    results: Dict[str, StageResult] = field(default_factory=dict)
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(r.status != "failed" for r in self.results.values())
+
+    def __getitem__(self, name: str) -> Any:
+        return self.outputs[name]
+
+    def report(self) -> pd.DataFrame:
+        """One row per stage: name, status, cache_hit, seconds, key, error."""
+        return pd.DataFrame(
+            [
+                {
+                    "stage": r.name,
+                    "status": r.status,
+                    "cache_hit": r.cache_hit,
+                    "seconds": round(r.seconds, 4),
+                    "key": r.key,
+                    "error": r.error,
+                }
+                for r in self.results.values()
+            ],
+            columns=["stage", "status", "cache_hit", "seconds", "key", "error"],
+        )
+
+
+# ---------------------------------------------------------------------
+# Output cache
+# ---------------------------------------------------------------------
+
+class StageCache:
+    """
+    Pickled stage outputs named ``<stage>-<key>.pkl``.
+
+    Writes go through a temporary file, so a crashed run never leaves a
+    partial entry. Each stage keeps its ``keep`` most recently used
+    entries, so switching a setting back and forth stays cached.
+    """
+
+    def __init__(self, cache_dir: Path, keep: int = 3):
+        self.cache_dir = Path(cache_dir)
+        self.keep = keep
+
+    def path(self, name: str, key: str) -> Path:
+        return self.cache_dir / f"{name}-{key}.pkl"
+
+    def has(self, name: str, key: str) -> bool:
+        return self.path(name, key).exists()
+
+    def load(self, name: str, key: str) -> Any:
+        path = self.path(name, key)
+        with path.open("rb") as f:
+            value = pickle.load(f)
+        os.utime(path)
+        return value
+
+    def save(self, name: str, key: str, value: Any) -> Path:
+        ensure_dir(self.cache_dir)
+        path = self.path(name, key)
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+        self._prune(name)
+        return path
+
+    def _prune(self, name: str) -> None:
+        entries = sorted(
+            self.cache_dir.glob(f"{name}-*.pkl"),
+            key=lambda p: p.stat().st_mtime_ns,
+            reverse=True,
+        )
+        for old in entries[self.keep:]:
+            old.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        if not self.cache_dir.exists():
+            return
+        for path in self.cache_dir.iterdir():
+            if path.suffix in {".pkl", ".tmp", ".json"}:
+                path.unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------
+
+def _digest(payload: Any) -> str:
+    text = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def _code_digest(func: Callable) -> str:
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        module = getattr(func, "__module__", "")
+        source = f"{module}.{getattr(func, '__qualname__', repr(func))}"
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+_PACKAGE = fi_forecasting.__name__
+
+
+def _module_path(module: str) -> Optional[Path]:
+    """Source file of a ``fi_forecasting`` module or package (None if absent)."""
+    base = Path(fi_forecasting.__file__).parent.joinpath(*module.split(".")[1:])
+    for path in (base.with_suffix(".py"), base / "__init__.py"):
+        if path.is_file():
+            return path
+    return None
+
+
+def _imported_modules(nodes: Iterable[ast.AST]) -> Set[str]:
+    """``fi_forecasting`` modules named by the import statements in ``nodes``."""
+    found = set()
+    for node in nodes:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            # ``from pkg import mod`` may name a submodule
+            names = [node.module] + [f"{node.module}.{a.name}" for a in node.names]
+        else:
+            continue
+        for name in names:
+            if name.split(".")[0] == _PACKAGE and _module_path(name):
+                found.add(name)
+    return found
+
+
+def _top_level(tree: ast.Module) -> Iterable[ast.AST]:
+    """Statements run at import time (function bodies are skipped)."""
+    stack = list(tree.body)
+    while stack:
+        node = stack.pop()
+        yield node
+        if isinstance(node, (ast.If, ast.Try)):
+            stack.extend(ast.iter_child_nodes(node))
+
+
+def _stage_modules(stage: Stage) -> Tuple[str, ...]:
+    """
+    Modules a stage's output depends on: the module defining ``func``,
+    the ``fi_forecasting`` imports in its body (stage bodies import their
+    work lazily) and ``stage.modules``.
+    """
+    roots = {f"{_PACKAGE}.{m}" for m in stage.modules}
+    module = getattr(stage.func, "__module__", None) or ""
+    if module.split(".")[0] == _PACKAGE:
+        roots.add(module)
+    try:
+        body = ast.parse(textwrap.dedent(inspect.getsource(stage.func)))
+        roots |= _imported_modules(ast.walk(body))
+    except (OSError, TypeError, SyntaxError):
+        pass
+    return tuple(sorted(roots))
+
+
+def _module_closure(modules: Iterable[str]) -> Set[str]:
+    """
+    ``modules``, their parent packages and every ``fi_forecasting``
+    module they import at load time, transitively.
+    """
+    seen: Set[str] = set()
+    queue = list(modules)
+    while queue:
+        module = queue.pop()
+        if module in seen:
+            continue
+        seen.add(module)
+        parts = module.split(".")
+        queue.extend(".".join(parts[:i]) for i in range(1, len(parts)))
+        path = _module_path(module)
+        if path is not None:
+            queue.extend(_imported_modules(_top_level(ast.parse(path.read_bytes()))))
+    return seen
+
+
+@lru_cache(maxsize=None)
+def _library_digest(modules: Tuple[str, ...]) -> str:
+    """
+    Hash of the sources in ``_module_closure(modules)``. Edits elsewhere
+    in the package (e.g. the dashboard or benchmarks) leave it alone.
+    """
+    h = hashlib.sha256()
+    for module in sorted(_module_closure(modules)):
+        path = _module_path(module)
+        h.update(module.encode("utf-8"))
+        h.update(path.read_bytes() if path is not None else b"missing")
+    return h.hexdigest()[:16]
+
+
+class Pipeline:
+    """
+    DAG of stages with content-addressed output caching.
+
+    Each stage's cache key hashes its code, the ``fi_forecasting``
+    modules it depends on, ``version``, the content of its input files, the config
+    sections it reads and the keys of its upstream stages, so a change
+    anywhere upstream invalidates exactly the stages downstream of it.
+    Keys are computed before anything runs; stages whose output is
+    cached are not executed, and their outputs are only read from disk
+    when a stage that must run (or a requested target) needs them. An
+    unreadable entry turns the stage back into a miss. Ready stages run
+    concurrently on a thread pool.
+
+    Example
+    -------
+    >>> pipe = Pipeline()
+    >>> pipe.add(Stage("load", load_unified_excel, files=("data/raw/x.xlsx",)))
+    >>> pipe.add(Stage("clean", clean_fi_data_stage, deps=("load",)))
+    >>> run = pipe.run(["clean"])
+    >>> run.report()
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[Stage] = (),
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_workers: Optional[int] = None,
+    ):
+        cfg = pipeline_config()
+        cache_dir = Path(cache_dir or cfg.get("cache_dir", DEFAULT_CACHE_DIR))
+        if not cache_dir.is_absolute():
+            cache_dir = settings.root / cache_dir
+        self.cache = StageCache(cache_dir, keep=int(cfg.get("keep_versions", 3)))
+        self.max_workers = max_workers or cfg.get("max_workers") or 4
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            self.add(stage)
+
+    # -------------------------
+    # Definition
+    # -------------------------
+
+    def add(self, stage: Stage) -> Stage:
+        if stage.name in self.stages:
+            raise ValueError(f"Duplicate stage '{stage.name}'")
+        self.stages[stage.name] = stage
+        return stage
+
+    def stage(self, name: Optional[str] = None, **kwargs) -> Callable:
+        """Decorator form of ``add``: ``@pipe.stage(deps=("load",))``."""
+        def register(func: Callable) -> Callable:
+            self.add(Stage(name or func.__name__, func, **kwargs))
+            return func
+        return register
+
+    def order(self, targets: Optional[Sequence[str]] = None) -> List[str]:
+        """
+        Stages needed for ``targets`` (default: all), upstream first.
+
+        Raises
+        ------
+        KeyError
+            If a target or dependency is not a known stage.
+        ValueError
+            If the dependencies contain a cycle.
+        """
+        wanted = list(self.stages) if targets is None else list(targets)
+        order: List[str] = []
+        state: Dict[str, int] = {}      # 1 = visiting, 2 = done
+
+        def visit(name: str, path: Tuple[str, ...]) -> None:
+            if name not in self.stages:
+                raise KeyError(
+                    f"Unknown stage '{name}'"
+                    + (f" (required by '{path[-1]}')" if path else "")
+                )
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Cycle in pipeline: {' -> '.join(path + (name,))}")
+            state[name] = 1
+            for dep in self.stages[name].deps:
+                visit(dep, path + (name,))
+            state[name] = 2
+            order.append(name)
+
+        for name in wanted:
+            visit(name, ())
+        return order
+
+    # -------------------------
+    # Keys
+    # -------------------------
+
+    def _file_digests(self, stage: Stage, fingerprints: FrameCache) -> Dict[str, str]:
+        digests = {}
+        for item in stage.files:
+            path = item() if callable(item) else item
+            if path is None:
+                continue
+            path = Path(path)
+            if not path.is_absolute():
+                path = settings.root / path
+            digests[str(path)] = (
+                fingerprints.fingerprint(path).sha256 if path.exists() else "missing"
+            )
+        return digests
+
+    def keys(self, names: Sequence[str]) -> Dict[str, str]:
+        """Cache key of every stage in ``names`` (upstream first)."""
+        fingerprints = FrameCache(self.cache.cache_dir)
+        keys: Dict[str, str] = {}
+        for name in names:
+            stage = self.stages[name]
+            keys[name] = _digest(
+                {
+                    "name": name,
+                    "version": stage.version,
+                    "code": _code_digest(stage.func),
+                    "library": _library_digest(_stage_modules(stage)),
+                    "files": self._file_digests(stage, fingerprints),
+                    "config": {s: settings.get(s) for s in stage.config},
+                    "deps": {d: keys[d] for d in stage.deps},
+                }
+            )
+        return keys
+
+    # -------------------------
+    # Execution
+    # -------------------------
+
+    def run(
+        self,
+        targets: Optional[Sequence[str]] = None,
+        force: Union[bool, Iterable[str]] = False,
+        max_workers: Optional[int] = None,
+    ) -> PipelineRun:
+        """
+        Run the stages needed for ``targets``.
+
+        Parameters
+        ----------
+        targets : sequence of str, optional
+            Stages whose outputs are wanted; defaults to every stage.
+        force : bool or iterable of str
+            Re-execute all stages (True) or the named ones even when
+            cached. Keys do not change, so downstream stages still hit
+            the cache unless forced too.
+        max_workers : int, optional
+            Thread-pool size; defaults to ``pipeline.max_workers``.
+
+        Returns
+        -------
+        PipelineRun
+            Outputs of the targets (and of every stage that ran) plus a
+            per-stage report. A failing stage marks its downstream
+            stages as skipped; the others still run.
+        """
+        start = time.perf_counter()
+        names = self.order(targets)
+        keys = self.keys(names)
+        wanted = set(names if targets is None else targets)
+        forced = set(names) if force is True else set(force or ())
+
+        hit = {
+            n for n in names
+            if self.stages[n].cache and n not in forced and self.cache.has(n, keys[n])
+        }
+        # Cached outputs are read only where a stage that runs, or the
+        # caller, consumes them.
+        needed: Set[str] = set(wanted)
+        for n in names:
+            if n not in hit:
+                needed.update(self.stages[n].deps)
+        active = {n for n in names if n not in hit or n in needed}
+
+        run = PipelineRun()
+        for n in names:
+            if n not in active:
+                run.results[n] = StageResult(n, keys[n], "hit")
+
+        pending = {n: set(self.stages[n].deps) & active for n in names if n in active}
+        running: Dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as pool:
+            while pending or running:
+                for n in [n for n, deps in pending.items() if not deps]:
+                    del pending[n]
+                    failed = [
+                        d
+                        for d in self.stages[n].deps
+                        if run.results[d].status in ("failed", "skipped")
+                    ]
+                    if failed:
+                        run.results[n] = StageResult(
+                            n,
+                            keys[n],
+                            "skipped",
+                            error=f"upstream failed: {', '.join(failed)}",
+                        )
+                        logger.warning(
+                            "Stage %s skipped (upstream failed: %s)",
+                            n,
+                            ", ".join(failed),
+                        )
+                        self._release(n, pending)
+                        continue
+                    inputs = (
+                        {} if n in hit
+                        else {d: run.outputs[d] for d in self.stages[n].deps}
+                    )
+                    future = pool.submit(
+                        self._execute, self.stages[n], keys[n], n in hit, inputs
+                    )
+                    running[future] = n
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    n = running.pop(future)
+                    result, output = future.result()
+                    if result is None:
+                        self._replan(n, hit, active, pending, running, run)
+                        continue
+                    run.results[n] = result
+                    if result.status != "failed":
+                        run.outputs[n] = output
+                    self._release(n, pending)
+
+        # Keep only what was asked for plus what had to be computed
+        run.outputs = {
+            n: v for n, v in run.outputs.items()
+            if n in wanted or run.results[n].status == "run"
+        }
+        run.results = {n: run.results[n] for n in names}
+        run.seconds = time.perf_counter() - start
+        n_hits = sum(r.cache_hit for r in run.results.values())
+        logger.info(
+            "Pipeline finished in %.2fs: %d stage(s), %d cache hit(s), %d failed",
+            run.seconds, len(names), n_hits,
+            sum(r.status == "failed" for r in run.results.values()),
+        )
+        return run
+
+    def _replan(
+        self,
+        name: str,
+        hit: Set[str],
+        active: Set[str],
+        pending: Dict[str, Set[str]],
+        running: Dict[Future, str],
+        run: PipelineRun,
+    ) -> None:
+        """
+        Turn a cache hit whose entry could not be read into a miss.
+
+        Upstream outputs it now consumes are loaded (or recomputed, if
+        their entries are unreadable too) before it runs again.
+        """
+        hit.discard(name)
+        scheduled = set(pending) | set(running.values())
+        waiting = set()
+        for dep in self.stages[name].deps:
+            if dep in run.outputs:
+                continue
+            if dep not in active:
+                # Planned as an unread hit: load it now
+                active.add(dep)
+                pending[dep] = set()
+                waiting.add(dep)
+            elif dep in scheduled:
+                waiting.add(dep)
+        pending[name] = waiting
+
+    @staticmethod
+    def _release(name: str, pending: Dict[str, Set[str]]) -> None:
+        for deps in pending.values():
+            deps.discard(name)
+
+    def _execute(self, stage: Stage, key: str, cached: bool, inputs: Dict[str, Any]):
+        start = time.perf_counter()
+        if cached:
+            try:
+                output = self.cache.load(stage.name, key)
+                seconds = time.perf_counter() - start
+                logger.info("Stage %-12s cache hit  (%.3fs)", stage.name, seconds)
+                return StageResult(stage.name, key, "hit", seconds), output
+            except Exception as exc:
+                # Recomputing needs the upstream outputs, which a hit was
+                # not given; ``run`` re-plans the stage as a miss.
+                logger.warning(
+                    "Discarding unreadable cache entry for %s: %s", stage.name, exc
+                )
+                self.cache.path(stage.name, key).unlink(missing_ok=True)
+                return None, None
+
+        try:
+            with profiling.span(f"pipeline.{stage.name}") as traced:
+                output = stage.func(**inputs)
+                traced.rows_out = profiling.row_count(output)
+        except Exception as exc:
+            seconds = time.perf_counter() - start
+            logger.exception("Stage %s failed after %.3fs", stage.name, seconds)
+            return (
+                StageResult(stage.name, key, "failed", seconds, error=repr(exc)),
+                None,
+            )
+
+        seconds = time.perf_counter() - start
+        if stage.cache:
+            try:
+                self.cache.save(stage.name, key, output)
+            except Exception as exc:
+                logger.warning("Could not cache output of %s: %s", stage.name, exc)
+        logger.info("Stage %-12s ran        (%.3fs)", stage.name, seconds)
+        return StageResult(stage.name, key, "run", seconds), output
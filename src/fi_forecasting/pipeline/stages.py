@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+from fi_forecasting.core.settings import settings
+from fi_forecasting.pipeline.dag import Pipeline, Stage, pipeline_config
+from fi_forecasting.utils.paths import ensure_parent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUTS = {
+    "enriched": "data/processed/enriched_fi_data.csv",
+    "impact_links": "data/processed/enriched_impact_links.csv",
+    "impact_matrix": "models/impact_association_matrix.npz",
+    "forecasts": "models/forecast_outputs.csv",
+    "scenarios": "models/scenario_forecasts.csv",
+    "panel_forecasts": "models/panel_forecasts.csv",
+    "reconciled_forecasts": "models/reconciled_panel_forecasts.csv",
+    "views": "data/processed/views",
+}
+
+
+def _dataset_path(name: str) -> Optional[Path]:
+    path = settings.get("datasets", {}).get(name, {}).get("path")
+    return settings.root / path if path else None
+
+
+def output_path(name: str) -> Path:
+    """Configured path of an exported file (``pipeline.outputs``)."""
+    outputs = {**DEFAULT_OUTPUTS, **(pipeline_config().get("outputs") or {})}
+    return settings.root / outputs[name]
+
+
+# ---------------------------------------------------------------------
+# Stage bodies
+# ---------------------------------------------------------------------
+
+def load_stage() -> pd.DataFrame:
+    from fi_forecasting.data.loaders import load_unified_excel
+
+    return load_unified_excel()
+
+
+def enrich_stage(load: pd.DataFrame) -> pd.DataFrame:
+    from fi_forecasting.data.enrichers import enrich_dataset
+    from fi_forecasting.data.loaders import load_additional_data_guide
+    from fi_forecasting.utils.logger import EnrichmentLog
+
+    guide = load_additional_data_guide()
+    if guide is None:
+        logger.warning("Additional data guide not found; skipping enrichment")
+        return load
+    with EnrichmentLog() as audit:
+        return enrich_dataset(load, guide, log_fn=audit)
+
+
+def clean_stage(enrich: pd.DataFrame) -> pd.DataFrame:
+    from fi_forecasting.impact.preprocessing import clean_fi_data
+
+    return clean_fi_data(enrich)
+
+
+def impact_stage(enrich: pd.DataFrame) -> Dict:
+    from fi_forecasting.impact.impact_links import ImpactLinkStore
+    from fi_forecasting.impact.impact_matrix import ImpactMatrix
+    from fi_forecasting.impact.impact_model import (
+        apply_event_effects,
+        merge_events_impact,
+    )
+
+    store = ImpactLinkStore.from_unified(enrich)
+    events = enrich[enrich["record_type"] == "event"]
+    effects = apply_event_effects(merge_events_impact(events, store))
+    return {
+        "links": store.frame,
+        "effects": effects,
+        "matrix": ImpactMatrix.from_links(effects),
+    }
+
+
+def links_stage(enrich: pd.DataFrame) -> pd.DataFrame:
+    from fi_forecasting.forecasting.scenarios import prepare_links
+
+    return prepare_links(enrich)
+
+
+def baseline_stage(clean: pd.DataFrame) -> Dict:
+    from fi_forecasting.forecasting.forecaster import (
+        forecast_config,
+        forecast_trends,
+        year_panel,
+    )
+
+    observations = clean[clean["record_type"] == "observation"]
+    panel = year_panel(observations, indicators=forecast_config().get("indicators"))
+    forecast, fit = forecast_trends(panel)
+    return {"panel": panel, "forecast": forecast, "fit": fit}
+
+
+def intervals_stage(baseline: Dict) -> pd.DataFrame:
+    from fi_forecasting.forecasting.uncertainty import prediction_intervals
+
+    return prediction_intervals(
+        baseline["fit"], horizon=list(baseline["forecast"].index)
+    )
+
+
+def scenarios_stage(baseline: Dict, links: pd.DataFrame):
+    from fi_forecasting.forecasting.scenarios import run_scenarios
+
+    return run_scenarios(baseline["forecast"], links)
+
+
+def _disaggregated_observations(clean: pd.DataFrame) -> pd.DataFrame:
+    from fi_forecasting.forecasting.forecaster import forecast_config
+    from fi_forecasting.forecasting.panel import disaggregated_panel
+
+    observations = clean[clean["record_type"] == "observation"]
+    indicators = forecast_config().get("indicators")
+    return disaggregated_panel(observations, indicators=indicators)
+
+
+def panel_stage(clean: pd.DataFrame):
+    from fi_forecasting.forecasting.panel import forecast_panel
+
+    return forecast_panel(_disaggregated_observations(clean))
+
+
+def reconcile_stage(clean: pd.DataFrame, panel) -> pd.DataFrame:
+    from fi_forecasting.forecasting.reconciliation import reconcile_panel
+
+    return reconcile_panel(panel, history=_disaggregated_observations(clean))
+
+
+def views_stage(clean: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    from fi_forecasting.dashboard.views import build_views
+
+    return build_views(clean)
+
+
+def forecast_outputs(cube, intervals: pd.DataFrame) -> pd.DataFrame:
+    """
+    Year-indexed forecast table in the notebook's layout:
+    ``<code>`` (base scenario), ``<code>_<scenario>`` and
+    ``<code>_lower`` / ``<code>_upper``.
+    """
+    from fi_forecasting.forecasting.uncertainty import interval_columns
+
+    long = cube.to_frame()
+    wide = long.pivot(
+        index="year", columns=["indicator_code", "scenario"], values="forecast"
+    )
+    wide.columns = [f"{code}_{scenario}" for code, scenario in wide.columns]
+    base = long[long["scenario"] == cube.scenarios[0].name].pivot(
+        index="year", columns="indicator_code", values="forecast"
+    )
+    out = pd.concat([base, wide, interval_columns(intervals)], axis=1)
+    out.index.name = "year"
+    return out
+
+
+def export_stage(
+    clean, enrich, impact, intervals, scenarios, panel, reconcile, views
+) -> Dict[str, str]:
+    from fi_forecasting.dashboard.views import save_views
+
+    written = {}
+
+    def write(name: str, frame: pd.DataFrame, index: bool = False) -> None:
+        path = ensure_parent(output_path(name))
+        frame.to_csv(path, index=index)
+        written[name] = str(path)
+
+    write("enriched", clean)
+    write("impact_links", enrich[enrich["record_type"] == "impact_link"])
+    written["impact_matrix"] = str(impact["matrix"].save(output_path("impact_matrix")))
+    write("forecasts", forecast_outputs(scenarios, intervals), index=True)
+    write("scenarios", scenarios.to_frame())
+    write("panel_forecasts", panel.forecasts)
+    write("reconciled_forecasts", reconcile)
+    written["views"] = str(save_views(views, output_path("views")))
+    logger.info("Exported %d file(s)", len(written))
+    return written
+
+
+# ---------------------------------------------------------------------
+# Project pipeline
+# ---------------------------------------------------------------------
+
+def default_pipeline(**kwargs) -> Pipeline:
+    """
+    load -> enrich -> clean -> baseline -> intervals / scenarios -> export,
+    with the impact matrix, scenario links, reconciled region x gender
+    panel forecasts and dashboard views built alongside the baseline
+    forecasts.
+    """
+    return Pipeline(
+        [
+            Stage("load", load_stage,
+                  files=(lambda: _dataset_path("unified_excel"),),
+                  config=("datasets", "data")),
+            Stage("enrich", enrich_stage, deps=("load",),
+                  files=(lambda: _dataset_path("additional_data_guide"),),
+                  config=("datasets",)),
+            Stage("clean", clean_stage, deps=("enrich",), config=("data",)),
+            Stage("impact", impact_stage, deps=("enrich",), config=("events",)),
+            Stage("links", links_stage, deps=("enrich",), config=("events",)),
+            Stage("baseline", baseline_stage, deps=("clean",), config=("forecast",)),
+            Stage("intervals", intervals_stage, deps=("baseline",)),
+            Stage("scenarios", scenarios_stage, deps=("baseline", "links"),
+                  config=("forecast", "events")),
+            Stage("panel", panel_stage, deps=("clean",), config=("forecast",)),
+            Stage("reconcile", reconcile_stage, deps=("clean", "panel"),
+                  config=("forecast",)),
+            Stage("views", views_stage, deps=("clean",), config=("dashboard",)),
+            Stage("export", export_stage,
+                  deps=("clean", "enrich", "impact", "intervals", "scenarios", "panel",
+                        "reconcile", "views"),
+                  config=("pipeline",), cache=False),
+        ],
+        **kwargs,
+    )
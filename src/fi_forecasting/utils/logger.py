@@ -1,10 +1,213 @@
+from __future__ import annotations
+
+import json
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
+
+import pandas as pd
+
 from fi_forecasting.core.project_root import get_project_root
+from fi_forecasting.utils.paths import ensure_parent
+
+
+def default_log_path() -> Path:
+    """``docs/data_enrichment_log.md`` under the project root."""
+    return get_project_root() / "docs" / "data_enrichment_log.md"
+
+
+def __getattr__(name: str):
+    # Resolved on access so importing this module does not touch the
+    # filesystem.
+    if name == "DEFAULT_LOG_PATH":
+        return default_log_path()
+    if name == "root":
+        return get_project_root()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_FIELDS = ("timestamp", "record_type", "record_id", "indicator", "source",
+           "confidence", "notes")
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def sidecar_path(log_path: Path) -> Path:
+    """Machine-readable JSONL companion of a markdown enrichment log."""
+    return log_path.with_suffix(".jsonl")
+
 
-root = get_project_root()
-DEFAULT_LOG_PATH = root / "docs" / "data_enrichment_log.md"
+def _format_markdown(entry: Dict) -> str:
+    return (
+        f"- [{entry['timestamp']}] ({entry['record_type']}) "
+        f"{entry['record_id']}: {entry['indicator']} | "
+        f"Source: {entry['source']} | Confidence: {entry['confidence']} | "
+        f"Notes: {entry['notes']}\n"
+    )
+
+
+class EnrichmentLog:
+    """
+    Buffered writer for the enrichment audit log.
+
+    Entries are kept in memory and written on ``flush`` (or when the
+    context manager exits) with one append to the markdown log and one
+    append to its JSONL sidecar, instead of a filesystem round trip per
+    record. Instances are callable with the ``log_addition`` signature,
+    so they can be passed wherever a ``log_fn`` is expected; ingestion
+    code that sees ``log_records`` logs whole batches at once.
+
+    Example
+    -------
+    >>> with EnrichmentLog() as audit:
+    ...     df = enrich_dataset(df, guides, log_fn=audit)
+    """
+
+    def __init__(
+        self,
+        log_path: Optional[Path] = None,
+        sidecar: bool = True,
+        max_buffer: int = 10_000,
+    ):
+        self.log_path = Path(log_path) if log_path else default_log_path()
+        self.sidecar = sidecar
+        self.max_buffer = max_buffer
+        self._entries: List[Dict] = []
+
+    def __enter__(self) -> "EnrichmentLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -------------------------
+    # Buffering
+    # -------------------------
+
+    def log(
+        self,
+        record_id: str,
+        record_type: str,
+        indicator: Optional[str] = None,
+        source: Optional[str] = None,
+        confidence: Optional[str] = None,
+        notes: Optional[str] = None,
+        *,
+        description: Optional[str] = None,
+        justification: Optional[str] = None,
+        source_url: Optional[str] = None,
+    ) -> None:
+        """Buffer a single record addition (``log_addition`` signature)."""
+        self._entries.append(
+            {
+                "timestamp": _now(),
+                "record_type": record_type,
+                "record_id": record_id,
+                "indicator": indicator or description or "N/A",
+                "source": source or source_url or "Unknown",
+                "confidence": confidence or "unknown",
+                "notes": notes or justification or "",
+            }
+        )
+        self._maybe_flush()
+
+    __call__ = log
+
+    def log_records(
+        self,
+        records: pd.DataFrame,
+        record_type: Optional[str] = None,
+        *,
+        indicator_col: str = "indicator",
+        source_col: str = "source_url",
+        source: Optional[str] = None,
+        confidence_col: str = "confidence",
+        notes_col: str = "notes",
+    ) -> None:
+        """
+        Buffer one entry per row of ``records``.
+
+        Parameters
+        ----------
+        records : pd.DataFrame
+            Added records; must contain ``record_id``.
+        record_type : str, optional
+            Record type for every row; defaults to the ``record_type``
+            column.
+        source : str, optional
+            Constant source for every row, overriding ``source_col``.
+        """
+        if records.empty:
+            return
+
+        def col(name: str, default: str) -> pd.Series:
+            if name in records.columns:
+                values = records[name].astype(object)
+                return values.where(values.notna() & values.ne(""), default)
+            return pd.Series(default, index=records.index, dtype=object)
+
+        frame = pd.DataFrame(
+            {
+                "timestamp": _now(),
+                "record_type": (
+                    record_type if record_type is not None
+                    else col("record_type", "unknown")
+                ),
+                "record_id": records["record_id"].astype(object),
+                "indicator": col(indicator_col, "N/A"),
+                "source": source if source is not None else col(source_col, "Unknown"),
+                "confidence": col(confidence_col, "unknown"),
+                "notes": col(notes_col, ""),
+            },
+            columns=list(_FIELDS),
+        )
+        self._entries.extend(frame.to_dict("records"))
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if len(self._entries) >= self.max_buffer:
+            self.flush()
+
+    # -------------------------
+    # Output
+    # -------------------------
+
+    def flush(self) -> None:
+        """Write buffered entries to the markdown log and sidecar."""
+        if not self._entries:
+            return
+
+        entries, self._entries = self._entries, []
+        ensure_parent(self.log_path)
+
+        with self.log_path.open("a", encoding="utf-8") as f:
+            f.write("".join(_format_markdown(e) for e in entries))
+
+        if self.sidecar:
+            with sidecar_path(self.log_path).open("a", encoding="utf-8") as f:
+                f.write(
+                    "".join(
+                        json.dumps(e, ensure_ascii=False, default=str) + "\n"
+                        for e in entries
+                    )
+                )
+
+
+def read_enrichment_log(log_path: Optional[Path] = None) -> pd.DataFrame:
+    """
+    Load the structured sidecar of an enrichment log.
+
+    Returns an empty frame with the log columns if nothing was logged.
+    """
+    path = sidecar_path(Path(log_path) if log_path else default_log_path())
+    if not path.exists() or path.stat().st_size == 0:
+        return pd.DataFrame(columns=list(_FIELDS))
+    return pd.read_json(path, lines=True, dtype=False)
 
 
 def log_addition(
@@ -18,32 +221,24 @@ def log_addition(
     description: Optional[str] = None,
     justification: Optional[str] = None,
     source_url: Optional[str] = None,
-    log_path: Path = DEFAULT_LOG_PATH,
+    log_path: Optional[Path] = None,
 ):
     """
     Append a single record addition to a markdown log file.
 
     Backward-compatible logger that supports both positional and
-    keyword-based enrichment pipelines.
+    keyword-based enrichment pipelines. For many records, use an
+    ``EnrichmentLog`` to write them in one batch.
     """
-
-    # -------------------------
-    # Normalize aliases
-    # -------------------------
-    indicator = indicator or description or "N/A"
-    source = source or source_url or "Unknown"
-    notes = notes or justification or ""
-
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    log_path.touch(exist_ok=True)
-
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    log_entry = (
-        f"- [{now}] ({record_type}) {record_id}: {indicator} | "
-        f"Source: {source} | Confidence: {confidence or 'unknown'} | "
-        f"Notes: {notes}\n"
-    )
-
-    with log_path.open("a", encoding="utf-8") as f:
-        f.write(log_entry)
+    with EnrichmentLog(log_path) as log:
+        log.log(
+            record_id,
+            record_type,
+            indicator,
+            source,
+            confidence,
+            notes,
+            description=description,
+            justification=justification,
+            source_url=source_url,
+        )
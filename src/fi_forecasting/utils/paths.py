@@ -0,0 +1,15 @@
+from pathlib import Path
+
+
+def ensure_dir(path: Path) -> Path:
+    """Create ``path`` (and parents) if missing and return it."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def ensure_parent(path: Path) -> Path:
+    """Create the parent directory of a file about to be written."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
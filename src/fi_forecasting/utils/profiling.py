@@ -0,0 +1,638 @@
+"""
+Opt-in instrumentation of the pipeline functions.
+
+``@instrument`` wraps the loaders, parsers, enrichers, impact model and
+forecaster; ``span`` times any block. Nothing is measured until a
+``Tracer`` is installed with ``enable`` (or ``configure`` from the
+``profiling`` config section); until then a wrapped call costs one
+global lookup.
+
+Each traced call appends one JSON line to the trace file (default
+``<paths.reports.logs>/trace.jsonl``) with wall time, thread CPU time,
+RSS and peak RSS, optional tracemalloc deltas and input/output row
+counts. One function can additionally be captured with cProfile
+(``.prof``, for pstats/snakeviz) or a sampling profiler (collapsed
+stacks, for flamegraph.pl/speedscope), and the trace converts to the
+Chrome trace format (Perfetto, speedscope) with ``export_chrome_trace``.
+
+Example
+-------
+>>> from fi_forecasting.utils import profiling
+>>> profiling.enable(capture="enrich_dataset", profiler="sampling")
+>>> df = enrich_dataset(df, guide)
+>>> profiling.disable()
+>>> profiling.summarize_trace()
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+from fi_forecasting.core.settings import settings
+from fi_forecasting.utils.paths import ensure_dir, ensure_parent
+
+try:  # not available on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+MEMORY_MODES = ("rss", "tracemalloc", "none")
+PROFILERS = ("cprofile", "sampling")
+DEFAULT_TRACE_NAME = "trace.jsonl"
+DEFAULT_SAMPLE_INTERVAL = 0.005
+# TraceRecord fields attached to Chrome trace events as ``args``
+CHROME_ARGS = (
+    "rows_in",
+    "rows_out",
+    "cpu_s",
+    "rss_delta_mb",
+    "peak_rss_delta_mb",
+    "traced_peak_mb",
+)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def profiling_config() -> Dict:
+    """The ``profiling`` section of the merged config."""
+    return settings.get("profiling", {}) or {}
+
+
+def logs_dir() -> Path:
+    """``paths.reports.logs`` (``reports/logs`` by default)."""
+    try:
+        return settings.paths["reports"]["logs"]
+    except KeyError:
+        return settings.root / "reports" / "logs"
+
+
+# ---------------------------------------------------------------------
+# Measurements
+# ---------------------------------------------------------------------
+
+def _rss_mb() -> Optional[float]:
+    """Current resident set size (Linux ``/proc``; None elsewhere)."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 1e6
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Process high-water RSS so far."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def _delta(end: Optional[float], start: Optional[float]) -> Optional[float]:
+    """``end - start``, or None when either reading is unavailable."""
+    return end - start if end is not None and start is not None else None
+
+
+def row_count(obj: Any) -> Optional[int]:
+    """
+    Rows in a pipeline value: frames, series and arrays by length, dicts
+    by the total of their frame values, tuples by their first item.
+    """
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return len(obj)
+    if hasattr(obj, "shape") and getattr(obj, "ndim", 0):
+        return int(obj.shape[0])
+    if isinstance(obj, dict):
+        frames = [v for v in obj.values() if isinstance(v, (pd.DataFrame, pd.Series))]
+        counts = [row_count(v) for v in frames]
+        return sum(counts) if counts else None
+    if isinstance(obj, (tuple, list)) and obj:
+        return row_count(obj[0])
+    frame = getattr(obj, "frame", None)
+    return len(frame) if isinstance(frame, pd.DataFrame) else None
+
+
+def _input_rows(args, kwargs) -> Optional[int]:
+    """Rows of the first frame-like argument."""
+    for value in (*args, *kwargs.values()):
+        rows = row_count(value)
+        if rows is not None:
+            return rows
+    return None
+
+
+@dataclass
+class TraceRecord:
+    """One traced call, as written to the trace file."""
+
+    name: str
+    started_at: str
+    wall_s: float
+    cpu_s: float
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    rss_mb: Optional[float] = None
+    rss_delta_mb: Optional[float] = None
+    peak_rss_mb: Optional[float] = None
+    peak_rss_delta_mb: Optional[float] = None
+    traced_delta_mb: Optional[float] = None
+    traced_peak_mb: Optional[float] = None
+    depth: int = 0
+    parent: Optional[str] = None
+    thread: str = ""
+    pid: int = 0
+    start_ns: int = 0
+    error: Optional[str] = None
+    profile: Optional[str] = None
+
+
+@dataclass
+class Span:
+    """An open traced call; set ``rows_out`` before it closes."""
+
+    name: str
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    _children_peak: int = field(default=0, repr=False)
+
+
+class _NullSpan:
+    """Stand-in yielded by ``span`` while tracing is off."""
+
+    __slots__ = ()
+    name = None
+    rows_in = None
+
+    def __setattr__(self, name, value):   # rows_out assignments are dropped
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+# ---------------------------------------------------------------------
+# Profilers
+# ---------------------------------------------------------------------
+
+class SamplingProfiler:
+    """
+    Wall-clock sampler of one thread's Python stack.
+
+    A daemon thread reads the target thread's frame every ``interval``
+    seconds and counts each distinct stack, which is exactly the
+    collapsed-stack input of flamegraph.pl, inferno and speedscope.
+    Sampling costs the profiled code almost nothing, unlike cProfile's
+    per-call hooks, so it suits long numpy/pandas-heavy stages.
+    """
+
+    def __init__(
+        self, interval: float = DEFAULT_SAMPLE_INTERVAL, thread_id: Optional[int] = None
+    ):
+        self.interval = float(interval)
+        self.thread_id = thread_id
+        self.stacks: Counter = Counter()
+        self._stop: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        code = frame.f_code
+        filename = os.path.basename(code.co_filename)
+        return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        labels = []
+        while frame is not None:
+            labels.append(self._frame_label(frame))
+            frame = frame.f_back
+        if labels:
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def start(self) -> "SamplingProfiler":
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._stop = threading.Event()
+
+        def loop(stop: threading.Event) -> None:
+            while not stop.wait(self.interval):
+                self._sample()
+
+        self._thread = threading.Thread(
+            target=loop, args=(self._stop,), name="profiling-sampler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        if self._stop is not None:
+            self._stop.set()
+            self._thread.join()
+            self._stop = self._thread = None
+        return self
+
+    def write_collapsed(self, path: Union[str, Path]) -> Path:
+        """Write ``stack count`` lines (the flamegraph "folded" format)."""
+        path = ensure_parent(Path(path))
+        with path.open("w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+
+# ---------------------------------------------------------------------
+# Tracer
+# ---------------------------------------------------------------------
+
+class Tracer:
+    """
+    Records every instrumented call while installed (see ``enable``).
+
+    Parameters
+    ----------
+    path : Path, optional
+        JSONL trace file; default ``<reports/logs>/trace.jsonl``.
+    memory : {"rss", "tracemalloc", "none"}
+        ``rss`` reads the resident set size around each call (cheap);
+        ``tracemalloc`` also records the Python allocation delta and
+        peak of each call, at a large slowdown. With concurrent stages
+        the tracemalloc figures mix the threads' allocations.
+    capture : str, optional
+        Name (full ``module.function`` label or bare function name) of
+        the call to profile; every call of it is captured.
+    profiler : {"cprofile", "sampling"}
+        Profiler used for ``capture``.
+    sample_interval : float
+        Seconds between samples of the sampling profiler.
+    profile_dir : Path, optional
+        Where captures go; default ``<reports/logs>/profiles``.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        memory: str = "rss",
+        capture: Optional[str] = None,
+        profiler: str = "cprofile",
+        sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+        profile_dir: Optional[Path] = None,
+    ):
+        if memory not in MEMORY_MODES:
+            raise ValueError(f"memory must be one of {MEMORY_MODES}, got {memory!r}")
+        if profiler not in PROFILERS:
+            raise ValueError(f"profiler must be one of {PROFILERS}, got {profiler!r}")
+        self.path = Path(path) if path else logs_dir() / DEFAULT_TRACE_NAME
+        self.memory = memory
+        self.capture = capture
+        self.profiler = profiler
+        self.sample_interval = float(sample_interval)
+        self.profile_dir = Path(profile_dir) if profile_dir else logs_dir() / "profiles"
+        self.records: List[TraceRecord] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._file = None
+        self._capturing = False
+        self._started_tracemalloc = False
+        if memory == "tracemalloc" and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    # -------------------------
+    # Output
+    # -------------------------
+
+    def _write(self, record: TraceRecord) -> None:
+        line = json.dumps(asdict(record), default=str)
+        with self._lock:
+            self.records.append(record)
+            if self._file is None:
+                self._file = ensure_parent(self.path).open("a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def to_frame(self) -> pd.DataFrame:
+        """Records of this tracer (one row per traced call)."""
+        with self._lock:
+            return pd.DataFrame([asdict(r) for r in self.records])
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    # -------------------------
+    # Spans
+    # -------------------------
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _wants_capture(self, name: str) -> bool:
+        if not self.capture or self._capturing:
+            return False
+        return name == self.capture or name.rsplit(".", 1)[-1] == self.capture
+
+    def _profile_path(self, name: str, suffix: str) -> Path:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        return ensure_dir(self.profile_dir) / f"{name}-{stamp}{suffix}"
+
+    @contextmanager
+    def span(self, name: str, rows_in: Optional[int] = None) -> Iterator[Span]:
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        current = Span(name, rows_in)
+
+        traced_start = 0
+        if self.memory == "tracemalloc":
+            traced_start, traced_peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent._children_peak = max(parent._children_peak, traced_peak)
+            tracemalloc.reset_peak()
+
+        profiler, capture = None, self._wants_capture(name)
+        if capture:
+            self._capturing = True
+            profiler = (
+                cProfile.Profile() if self.profiler == "cprofile"
+                else SamplingProfiler(self.sample_interval)
+            )
+            if isinstance(profiler, cProfile.Profile):
+                profiler.enable()
+            else:
+                profiler.start()
+
+        stack.append(current)
+        rss_start = _rss_mb() if self.memory != "none" else None
+        peak_rss_start = _peak_rss_mb() if self.memory != "none" else None
+        started_at = datetime.now().isoformat(timespec="milliseconds")
+        start_ns = time.perf_counter_ns()
+        cpu_start = time.thread_time()
+        error = None
+        try:
+            yield current
+        except BaseException as exc:
+            error = repr(exc)
+            raise
+        finally:
+            wall = (time.perf_counter_ns() - start_ns) / 1e9
+            cpu = time.thread_time() - cpu_start
+            stack.pop()
+
+            profile_path = None
+            if profiler is not None:
+                if isinstance(profiler, cProfile.Profile):
+                    profiler.disable()
+                    profile_path = self._profile_path(name, ".prof")
+                    profiler.dump_stats(str(profile_path))
+                else:
+                    profile_path = profiler.stop().write_collapsed(
+                        self._profile_path(name, ".folded")
+                    )
+                self._capturing = False
+                logger.info("Profile of %s written to %s", name, profile_path)
+
+            record = TraceRecord(
+                name=name,
+                started_at=started_at,
+                wall_s=wall,
+                cpu_s=cpu,
+                rows_in=current.rows_in,
+                rows_out=current.rows_out,
+                depth=len(stack),
+                parent=parent.name if parent is not None else None,
+                thread=threading.current_thread().name,
+                pid=os.getpid(),
+                start_ns=start_ns,
+                error=error,
+                profile=str(profile_path) if profile_path else None,
+            )
+            if self.memory != "none":
+                rss, peak_rss = _rss_mb(), _peak_rss_mb()
+                record.rss_mb = rss
+                record.rss_delta_mb = _delta(rss, rss_start)
+                record.peak_rss_mb = peak_rss
+                record.peak_rss_delta_mb = _delta(peak_rss, peak_rss_start)
+            if self.memory == "tracemalloc":
+                traced_end, traced_peak = tracemalloc.get_traced_memory()
+                peak = max(traced_peak, current._children_peak)
+                record.traced_delta_mb = (traced_end - traced_start) / 1e6
+                record.traced_peak_mb = (peak - traced_start) / 1e6
+                if parent is not None:
+                    parent._children_peak = max(parent._children_peak, peak)
+            self._write(record)
+
+
+# ---------------------------------------------------------------------
+# Global switch
+# ---------------------------------------------------------------------
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    """The installed tracer, or None while instrumentation is off."""
+    return _tracer
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+def enable(**kwargs) -> Tracer:
+    """
+    Install a ``Tracer`` (arguments as for ``Tracer``), replacing and
+    closing any previous one.
+    """
+    global _tracer
+    previous, _tracer = _tracer, Tracer(**kwargs)
+    if previous is not None:
+        previous.close()
+    logger.info("Instrumentation on; trace file %s", _tracer.path)
+    return _tracer
+
+
+def disable() -> Optional[Tracer]:
+    """Remove the tracer (closing its trace file) and return it."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.close()
+    return tracer
+
+
+def configure(
+    enabled: Optional[bool] = None,
+    capture: Optional[str] = None,
+    profiler: Optional[str] = None,
+) -> Optional[Tracer]:
+    """
+    Enable or disable instrumentation from the ``profiling`` config
+    section; non-None arguments override it (e.g. from CLI flags).
+    Naming a ``capture`` target implies ``enabled``.
+    """
+    cfg = profiling_config()
+    capture = capture or cfg.get("capture")
+    enabled = bool(cfg.get("enabled", False) or capture) if enabled is None else enabled
+    if not enabled:
+        disable()
+        return None
+    trace_file = cfg.get("trace_file")
+    interval_ms = float(cfg.get("sample_interval_ms", DEFAULT_SAMPLE_INTERVAL * 1000))
+    return enable(
+        path=logs_dir() / trace_file if trace_file else None,
+        memory=cfg.get("memory", "rss"),
+        capture=capture,
+        profiler=profiler or cfg.get("profiler", "cprofile"),
+        sample_interval=interval_ms / 1000,
+    )
+
+
+def span(name: str, rows_in: Optional[int] = None):
+    """
+    Context manager tracing a block as ``name``; yields a ``Span`` whose
+    ``rows_out`` can be set. A no-op while instrumentation is off.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return nullcontext(_NULL_SPAN)
+    return tracer.span(name, rows_in)
+
+
+def _label(func: Callable) -> str:
+    module = func.__module__
+    if module.startswith("fi_forecasting."):
+        module = module[len("fi_forecasting."):]
+    return f"{module}.{func.__qualname__}"
+
+
+def instrument(func: Optional[Callable] = None, *, name: Optional[str] = None):
+    """
+    Decorator tracing every call of ``func`` (``@instrument`` or
+    ``@instrument(name=...)``).
+
+    The label defaults to the module path without the package prefix,
+    e.g. ``data.enrichers.enrich_dataset``. Input rows come from the
+    first frame-like argument and output rows from the return value
+    (see ``row_count``). While instrumentation is off the wrapper only
+    checks the global tracer and calls through.
+    """
+
+    def decorate(f: Callable) -> Callable:
+        label = name or _label(f)
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return f(*args, **kwargs)
+            with tracer.span(label, _input_rows(args, kwargs)) as current:
+                result = f(*args, **kwargs)
+                current.rows_out = row_count(result)
+                return result
+
+        return wrapper
+
+    return decorate(func) if func is not None else decorate
+
+
+# ---------------------------------------------------------------------
+# Reading and exporting traces
+# ---------------------------------------------------------------------
+
+def default_trace_path() -> Path:
+    trace_file = profiling_config().get("trace_file") or DEFAULT_TRACE_NAME
+    return logs_dir() / trace_file
+
+
+def load_trace(path: Optional[Path] = None) -> pd.DataFrame:
+    """Trace records as a frame (one row per traced call)."""
+    path = Path(path or default_trace_path())
+    if not path.exists():
+        return pd.DataFrame(
+            columns=[f.name for f in TraceRecord.__dataclass_fields__.values()]
+        )
+    return pd.read_json(path, lines=True)
+
+
+def summarize_trace(trace: Union[pd.DataFrame, Path, None] = None) -> pd.DataFrame:
+    """
+    Per-name totals, slowest first: calls, wall_s, cpu_s, mean_wall_s,
+    rows_in, rows_out, max peak_rss_delta_mb and traced_peak_mb.
+
+    Nested spans are counted in their parents too, so totals of
+    different depths overlap.
+    """
+    df = trace if isinstance(trace, pd.DataFrame) else load_trace(trace)
+    if df.empty:
+        return pd.DataFrame(columns=["name", "calls", "wall_s", "cpu_s", "mean_wall_s"])
+    grouped = df.groupby("name", sort=False)
+    out = grouped.agg(
+        calls=("wall_s", "size"), wall_s=("wall_s", "sum"), cpu_s=("cpu_s", "sum")
+    )
+    out["mean_wall_s"] = out["wall_s"] / out["calls"]
+    for col in ("rows_in", "rows_out"):
+        out[col] = grouped[col].sum(min_count=1)
+    for col in ("peak_rss_delta_mb", "traced_peak_mb"):
+        if col in df.columns:
+            out[col] = grouped[col].max()
+    return out.sort_values("wall_s", ascending=False).reset_index()
+
+
+def export_chrome_trace(
+    trace: Union[pd.DataFrame, Path, None] = None,
+    path: Optional[Path] = None,
+) -> Path:
+    """
+    Write the trace in the Chrome trace-event format (complete "X"
+    events per call), which Perfetto, chrome://tracing and speedscope
+    render as a flame chart per thread.
+    """
+    df = trace if isinstance(trace, pd.DataFrame) else load_trace(trace)
+    path = ensure_parent(Path(path or default_trace_path().with_suffix(".chrome.json")))
+    events = []
+    for row in df.to_dict("records"):
+        args = {
+            k: row[k]
+            for k in CHROME_ARGS
+            if k in row and pd.notna(row[k])
+        }
+        events.append(
+            {
+                "name": row["name"],
+                "ph": "X",
+                "ts": row["start_ns"] / 1e3,
+                "dur": row["wall_s"] * 1e6,
+                "pid": int(row["pid"]),
+                "tid": row["thread"],
+                "args": args,
+            }
+        )
+    path.write_text(
+        json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8"
+    )
+    return path
@@ -0,0 +1,74 @@
+import pandas as pd
+
+from fi_forecasting.data.additional_parsers import (
+    extract_direct_indicators,
+    extract_indirect_indicators,
+    process_additional_data_points,
+    report_rejected_rows,
+)
+
+
+def _sheet(start_row, rows):
+    """Raw guide sheet: ``start_row`` header rows, then data rows."""
+    header = [[None] * 5 for _ in range(start_row)]
+    return pd.DataFrame(header + [list(r) for r in rows])
+
+
+def test_direct_indicators_keep_valid_names_only():
+    sheet = _sheet(
+        8,
+        [
+            (None, "Mobile money agents", "strong", "reach", "NBE"),
+            (None, "  Digital payments  ", "medium", "usage", "GSMA"),
+            (None, "ab", "weak", None, None),
+            (None, 42, "weak", None, None),
+            (None, None, None, None, None),
+        ],
+    )
+
+    out = extract_direct_indicators(sheet)
+
+    assert out["indicator"].tolist() == ["Mobile money agents", "Digital payments"]
+    assert out["indicator_code"].tolist() == [
+        "DIR_MOBILE_MONEY_AGENTS",
+        "DIR_DIGITAL_PAYMENTS",
+    ]
+    assert out["pillar"].tolist() == ["ACCESS", "USAGE"]
+    assert out["why_matters"].tolist() == ["reach", "usage"]
+
+
+def test_indirect_indicators_are_access():
+    sheet = _sheet(8, [(None, "Night lights", "proxy", None, None)])
+
+    out = extract_indirect_indicators(sheet)
+
+    assert out["indicator_code"].tolist() == ["IND_NIGHT_LIGHTS"]
+    assert out["pillar"].tolist() == ["ACCESS"]
+    assert out["why_matters"].tolist() == [None]
+
+
+def test_rejected_rows_report_reasons():
+    sheets = {
+        "direct_correlation": _sheet(
+            8, [(None, "Good name", None, None, None), (None, "ab", None, None, None),
+                (None, 3.5, None, None, None), (None, None, None, None, None)]
+        )
+    }
+
+    report = report_rejected_rows(sheets)
+
+    direct = report[report["sheet"] == "direct_correlation"]
+    assert direct["reason"].tolist() == ["too_short", "not_text", "missing"]
+    assert direct["row"].tolist() == [9, 10, 11]
+
+
+def test_empty_input_gives_empty_frames():
+    out = process_additional_data_points({})
+
+    assert set(out) == {
+        "alternative_sources",
+        "direct_indicators",
+        "indirect_indicators",
+        "market_notes",
+    }
+    assert all(frame.empty for frame in out.values())
@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+
+from fi_forecasting.benchmarks.suite import (
+    BenchmarkRun,
+    CaseResult,
+    append_history,
+    compare_to_baseline,
+    load_history,
+)
+from fi_forecasting.benchmarks.synthetic import (
+    SyntheticSpec,
+    generate_unified,
+    parse_scale,
+    scale_label,
+)
+from fi_forecasting.data.validation_engine import validate_dataset
+
+
+def test_scale_labels_round_trip():
+    assert parse_scale("10k") == 10_000
+    assert parse_scale(" 1.5M ") == 1_500_000
+    assert parse_scale("1_000") == 1_000
+    assert scale_label(parse_scale("100k")) == "100k"
+    with pytest.raises(ValueError):
+        parse_scale("lots")
+
+
+def test_synthetic_dataset_is_seeded_and_consistent():
+    spec = SyntheticSpec(n_records=2_000, n_indicators=12, seed=7)
+
+    df = generate_unified(spec)
+
+    assert len(df) == 2_000
+    assert df["record_type"].value_counts().to_dict() == spec.counts
+    pd.testing.assert_frame_equal(df, generate_unified(spec))
+    links = df[df["record_type"] == "impact_link"]
+    events = set(df.loc[df["record_type"] == "event", "record_id"])
+    assert set(links["parent_id"].astype(object)) <= events
+    assert validate_dataset(df).ok
+    with pytest.raises(ValueError):
+        SyntheticSpec(n_records=3).counts
+
+
+def _run(seconds, peak_mb=None):
+    return BenchmarkRun(
+        "2026-01-01T00:00:00",
+        {},
+        {},
+        [
+            CaseResult(case, "10k", 10_000, 3, s, s, 10_000 / s, mb)
+            for case, s, mb in zip(
+                ("fast", "slow", "big"), seconds, peak_mb or [None] * 3
+            )
+        ],
+    )
+
+
+def test_compare_flags_time_and_memory_regressions():
+    baseline = _run([0.001, 1.0, 1.0], [10.0, 10.0, 10.0])
+    current = _run([0.004, 1.5, 1.0], [10.0, 10.0, 20.0])
+
+    out = compare_to_baseline(current, baseline, threshold=0.25, min_seconds=0.05)
+
+    assert out.set_index("case")["regression"].to_dict() == {
+        "fast": False,
+        "slow": True,
+        "big": True,
+    }
+
+
+def test_history_appends_runs(tmp_path):
+    path = tmp_path / "history.json"
+
+    append_history(_run([1.0, 2.0, 3.0]), path)
+    append_history(_run([1.1, 2.1, 3.1]), path)
+
+    runs = load_history(path)
+    assert len(runs) == 2
+    assert runs[1].results[0].seconds == 1.1
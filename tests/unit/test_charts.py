@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from fi_forecasting.dashboard.charts import collapse_events, downsample_series
+
+
+def test_downsample_keeps_missing_values():
+    n = 1000
+    y = np.sin(np.linspace(0, 20, n))
+    y[[100, 500]] = np.nan
+    df = pd.DataFrame({"x": np.arange(n), "y": y, "series": "a"})
+
+    out = downsample_series(df, "x", "y", group="series", max_points=50)
+
+    assert out["y"].isna().sum() == 2
+    assert out["y"].notna().sum() == 50
+    assert out["x"].is_monotonic_increasing
+    assert out["x"].iloc[0] == 0 and out["x"].iloc[-1] == n - 1
+
+
+def test_downsample_leaves_small_series_alone():
+    df = pd.DataFrame({"x": range(10), "y": range(10)})
+
+    assert downsample_series(df, "x", "y", max_points=50) is df
+
+
+def test_collapse_events_skips_empty_labels():
+    events = pd.DataFrame(
+        {"year": [2020, 2020, 2020, 2024], "category": [None, "policy", "policy", ""]}
+    )
+
+    markers = collapse_events(events, "year", "category", min_gap=1)
+
+    assert markers["label"].tolist() == ["policy", ""]
+    assert markers["n_events"].tolist() == [3, 1]
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from fi_forecasting.dashboard.data_access import DataStore, read_forecast_table
+
+
+@pytest.fixture
+def store(tmp_path):
+    calls = []
+
+    def loader(path):
+        calls.append(path)
+        return path.read_text()
+
+    path = tmp_path / "data.txt"
+    path.write_text("v1")
+    store = DataStore(paths={"data": path}, loaders={"data": loader})
+    store.calls = calls
+    return store
+
+
+def _touch(path, text):
+    stat = path.stat()
+    path.write_text(text)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_get_parses_once_until_the_content_changes(store):
+    path = store.paths["data"]
+
+    assert store.get("data") == "v1" and store.get("data") == "v1"
+    _touch(path, "v1")
+    assert store.get("data") == "v1"
+    assert len(store.calls) == 1 and store.version == 1
+
+    _touch(path, "v2")
+    assert store.refresh() == 2
+    assert store.get("data") == "v2" and len(store.calls) == 2
+
+
+def test_missing_file_keeps_the_last_good_copy(store, tmp_path):
+    store.get("data")
+    store.paths["data"].unlink()
+
+    assert store.get("data") == "v1"
+    fresh = DataStore(paths={"data": tmp_path / "nope"}, loaders=store.loaders)
+    with pytest.raises(FileNotFoundError):
+        fresh.get("data")
+
+
+def test_forecast_table_names_an_unlabelled_year_column(tmp_path):
+    path = tmp_path / "forecasts.csv"
+    path.write_text(",ACC_OWNERSHIP\n2025,52.0\n")
+
+    assert read_forecast_table(path).columns.tolist() == ["year", "ACC_OWNERSHIP"]
@@ -0,0 +1,57 @@
+import pandas as pd
+
+from fi_forecasting.utils.logger import EnrichmentLog, log_addition, read_enrichment_log
+
+
+def test_entries_are_buffered_until_flush(tmp_path):
+    path = tmp_path / "log.md"
+    audit = EnrichmentLog(path)
+
+    audit("OBS_1", "observation", description="Account ownership", confidence="high")
+    assert len(audit) == 1 and not path.exists()
+
+    audit.flush()
+    assert len(audit) == 0
+    assert "OBS_1: Account ownership" in path.read_text()
+
+
+def test_batches_round_trip_through_the_sidecar(tmp_path):
+    path = tmp_path / "log.md"
+    records = pd.DataFrame(
+        {
+            "record_id": ["IND_1", "IND_2"],
+            "indicator": ["Agents", None],
+            "confidence": ["medium", ""],
+        }
+    )
+
+    with EnrichmentLog(path) as audit:
+        audit.log_records(records, record_type="indicator_definition", source="Guide")
+
+    log = read_enrichment_log(path)
+    assert log["record_id"].tolist() == ["IND_1", "IND_2"]
+    assert log["indicator"].tolist() == ["Agents", "N/A"]
+    assert log["confidence"].tolist() == ["medium", "unknown"]
+    assert set(log["source"]) == {"Guide"}
+    assert len(path.read_text().splitlines()) == 2
+
+
+def test_buffer_flushes_at_its_limit(tmp_path):
+    path = tmp_path / "log.md"
+    audit = EnrichmentLog(path, sidecar=False, max_buffer=2)
+
+    audit("A", "observation")
+    audit("B", "observation")
+
+    assert len(audit) == 0
+    assert len(path.read_text().splitlines()) == 2
+    assert read_enrichment_log(path).empty
+
+
+def test_log_addition_appends(tmp_path):
+    path = tmp_path / "log.md"
+
+    log_addition("OBS_1", "observation", "x", log_path=path)
+    log_addition("OBS_2", "observation", "y", log_path=path)
+
+    assert read_enrichment_log(path)["record_id"].tolist() == ["OBS_1", "OBS_2"]
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fi_forecasting.impact.impact_model import apply_event_effects, encode_effect_levels
+from fi_forecasting.impact.lag_models import (
+    direction_signs,
+    evidence_weights,
+    magnitude_values,
+)
+
+
+@pytest.fixture
+def merged():
+    return pd.DataFrame(
+        {
+            "record_id_event": ["E1", "E1", "E2", "E3"],
+            "indicator_code": ["A", "B", "A", "C"],
+            "impact_magnitude_link": ["High", " very_high", "medium", "unknown"],
+            "impact_direction_link": ["increase", "Decrease", None, "increase"],
+            "evidence_basis_link": ["theoretical", None, "empirical", "literature"],
+            "lag_months_link": ["12", None, 6, 3],
+        }
+    )
+
+
+def test_tables_come_from_the_events_config():
+    assert magnitude_values()["very_high"] == 0.25
+    assert direction_signs()["decrease"] == -1.0
+    assert evidence_weights()["theoretical"] == 0.5
+
+
+def test_effects_use_configured_levels_signs_and_weights(merged):
+    out = apply_event_effects(merged)
+
+    np.testing.assert_allclose(out["impact_magnitude"], [15.0, 25.0, 8.0, 0.0])
+    np.testing.assert_allclose(out["direction_sign"], [1.0, -1.0, 0.0, 1.0])
+    np.testing.assert_allclose(out["evidence_weight"], [0.5, 1.0, 1.0, 0.8])
+    np.testing.assert_allclose(out["effect_value"], [7.5, -25.0, 0.0, 0.0])
+    np.testing.assert_allclose(out["lag_months"], [12.0, 0.0, 6.0, 3.0])
+    assert merged["impact_magnitude_link"].iloc[0] == "High"
+
+
+def test_overrides_and_encoded_levels_give_the_same_effects(merged):
+    tables = dict(
+        magnitudes={"high": 0.2, "very_high": 0.3}, directions={"increase": 1}
+    )
+    encoded = encode_effect_levels(merged)
+
+    plain = apply_event_effects(merged, **tables)
+    cached = apply_event_effects(encoded, **tables)
+
+    assert isinstance(encoded["impact_direction_link"].dtype, pd.CategoricalDtype)
+    np.testing.assert_allclose(plain["effect_value"], [10.0, 0.0, 0.0, 0.0])
+    pd.testing.assert_frame_equal(plain, cached)
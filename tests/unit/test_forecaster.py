@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from fi_forecasting.forecasting.forecaster import (
+    fit_trends,
+    forecast_trends,
+    year_panel,
+)
+
+
+def _panel():
+    years = np.arange(2014, 2025)
+    rng = np.random.default_rng(0)
+    panel = pd.DataFrame(
+        {
+            "line": 2.0 * years - 4000,
+            "noisy": 0.5 * years + rng.normal(0, 1, len(years)),
+            "sparse": np.nan,
+        },
+        index=years,
+    )
+    panel.loc[[2014, 2020, 2024], "sparse"] = [10.0, 16.0, 20.0]
+    panel.loc[2017, "noisy"] = np.nan
+    return panel
+
+
+def test_batched_fit_matches_per_series_polyfit():
+    panel = _panel()
+    fit = fit_trends(panel, degree=1)
+
+    for j, name in enumerate(panel.columns):
+        observed = panel[name].dropna()
+        slope, _ = np.polyfit(observed.index - fit.center[j], observed.to_numpy(), 1)
+        np.testing.assert_allclose(fit.params[j, 1], slope)
+    assert fit.n_obs.tolist() == [11, 10, 3]
+    np.testing.assert_allclose(fit.sigma2[0], 0.0, atol=1e-18)
+
+
+def test_forecast_standard_errors_and_short_series():
+    panel = _panel()
+    forecast, fit = forecast_trends(panel, horizon=[2025, 2030], degree=1, min_obs=4)
+
+    np.testing.assert_allclose(forecast["line"], [50.0, 60.0])
+    assert forecast["sparse"].isna().all()
+    _, se = fit.predict([2025, 2030], return_se=True)
+    assert se.loc[2030, "noisy"] > se.loc[2025, "noisy"] > 0
+    assert np.isnan(fit.residuals[:, 2]).all()
+
+
+def test_year_panel_averages_per_year_and_series():
+    df = pd.DataFrame(
+        {
+            "indicator_code": ["A", "A", "A", "B", "C"],
+            "region": ["x", "x", "y", "x", "x"],
+            "observation_date": [
+                "2020-01-01",
+                "2020-06-01",
+                "2021-01-01",
+                "2021-01-01",
+                "2021-01-01",
+            ],
+            "value_numeric": [1.0, 3.0, 5.0, "bad", 7.0],
+        }
+    )
+
+    panel = year_panel(
+        df, group_cols=["indicator_code", "region"], indicators=["A", "B"]
+    )
+
+    assert panel.index.tolist() == [2020, 2021]
+    assert panel.columns.tolist() == [("A", "x"), ("A", "y")]
+    assert panel.loc[2020, ("A", "x")] == 2.0
+    assert np.isnan(panel.loc[2021, ("A", "x")])
@@ -0,0 +1,74 @@
+import os
+
+import pandas as pd
+
+from fi_forecasting.data.cache import FrameCache
+
+
+def _touch(path, text):
+    path.write_text(text)
+    # Make sure the mtime moves even on coarse-grained filesystems
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_builds_once_then_hits(tmp_path):
+    source = tmp_path / "book.xlsx"
+    source.write_text("v1")
+    cache = FrameCache(tmp_path / "cache")
+    builds = []
+
+    def build():
+        builds.append(1)
+        return pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+
+    first = cache.get_or_build(source, build, key_parts=("Sheet1",))
+    second = cache.get_or_build(source, build, key_parts=("Sheet1",))
+
+    pd.testing.assert_frame_equal(first, second)
+    assert len(builds) == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_key_parts_and_content_changes_miss(tmp_path):
+    source = tmp_path / "book.xlsx"
+    source.write_text("v1")
+    cache = FrameCache(tmp_path / "cache")
+
+    cache.get_or_build(source, lambda: pd.DataFrame({"a": [1]}))
+    other = cache.get_or_build(
+        source, lambda: pd.DataFrame({"a": [2]}), key_parts=("Sheet2",)
+    )
+    _touch(source, "v2")
+    rebuilt = cache.get_or_build(source, lambda: pd.DataFrame({"a": [3]}))
+
+    assert other["a"].tolist() == [2]
+    assert rebuilt["a"].tolist() == [3]
+    assert cache.stats.invalidations == 1
+
+
+def test_unchanged_touch_reuses_the_hash(tmp_path):
+    source = tmp_path / "book.xlsx"
+    source.write_text("v1")
+    cache = FrameCache(tmp_path / "cache")
+    cache.get_or_build(source, lambda: pd.DataFrame({"a": [1]}))
+
+    _touch(source, "v1")
+    again = cache.get_or_build(source, lambda: pd.DataFrame({"a": [9]}))
+
+    assert again["a"].tolist() == [1]
+    assert cache.stats.invalidations == 0
+
+
+def test_unreadable_entry_is_rebuilt(tmp_path):
+    source = tmp_path / "book.xlsx"
+    source.write_text("v1")
+    cache = FrameCache(tmp_path / "cache")
+    cache.get_or_build(source, lambda: pd.DataFrame({"a": [1]}))
+    for entry in (tmp_path / "cache").glob("*.parquet"):
+        entry.write_bytes(b"garbage")
+
+    df = cache.get_or_build(source, lambda: pd.DataFrame({"a": [2]}))
+
+    assert df["a"].tolist() == [2]
+    assert cache.stats.errors == 1
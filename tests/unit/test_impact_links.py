@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+
+from fi_forecasting.impact.impact_links import ImpactLinkStore, resolve_indicator_codes
+
+# take_rows must not go through pandas' deprecated non-standard ``take`` inputs
+pytestmark = pytest.mark.filterwarnings("error::FutureWarning")
+
+
+@pytest.fixture
+def links():
+    return pd.DataFrame(
+        {
+            "record_id": ["L1", "L2", "L3", "L4"],
+            "parent_id": ["E1", "E2", "E1", None],
+            "related_indicator": ["ACC_OWN", None, "USG_P2P", "ACC_OWN"],
+            "indicator_code": [None, "ACC_MM", "OTHER", None],
+            "impact_magnitude": ["high", "low", "medium", "low"],
+        }
+    )
+
+
+def test_indicator_code_wins_over_related_indicator(links):
+    codes = resolve_indicator_codes(links)
+
+    # L3 carries both columns and they disagree: its own indicator_code is kept
+    assert codes.tolist() == ["ACC_OWN", "ACC_MM", "OTHER", "ACC_OWN"]
+    only_related = resolve_indicator_codes(links.drop(columns="indicator_code"))
+    assert only_related.tolist()[2] == "USG_P2P"
+    assert resolve_indicator_codes(pd.DataFrame(index=[0])).tolist() == ["UNKNOWN"]
+
+
+def test_index_queries(links):
+    store = ImpactLinkStore(links)
+
+    assert store.links_for_events(["E2", "E1", "E9"])["record_id"].tolist() == [
+        "L2",
+        "L1",
+        "L3",
+    ]
+    assert store.links_for_indicators(["ACC_OWN"])["record_id"].tolist() == ["L1", "L4"]
+    assert store.events_for_indicator("OTHER").tolist() == ["E1"]
+    assert store.events_for_indicator("USG_P2P").tolist() == []
+    assert store.indicators_for_event("E1").tolist() == ["ACC_OWN", "OTHER"]
+    assert store.indicators_for_event("missing").tolist() == []
+
+
+def test_upsert_replaces_matching_keys_and_resets_indexes(links):
+    store = ImpactLinkStore(links)
+    assert store.indicators_for_event("E2").tolist() == ["ACC_MM"]
+
+    store.upsert(
+        pd.DataFrame(
+            {
+                "record_id": ["L2", "L5"],
+                "parent_id": ["E2", "E2"],
+                "related_indicator": ["USG_P2P", "ACC_OWN"],
+            }
+        )
+    )
+
+    assert len(store) == 5
+    assert store.indicators_for_event("E2").tolist() == ["USG_P2P", "ACC_OWN"]
+
+
+def test_join_matches_a_left_merge(links):
+    events = pd.DataFrame(
+        {
+            "record_id": ["E1", "E3", "E2"],
+            "indicator_code": ["EVT_A", "EVT_B", "EVT_C"],
+            "year": [2021, 2022, 2023],
+        }
+    )
+    store = ImpactLinkStore(links)
+
+    joined = store.join_events(events)
+    expected = events.merge(
+        store.frame,
+        how="left",
+        left_on="record_id",
+        right_on="parent_id",
+        suffixes=("_event", "_link"),
+    )
+    expected["indicator_code"] = expected["indicator_code_link"]
+
+    pd.testing.assert_frame_equal(joined, expected, check_dtype=False)
+    assert joined["record_id_event"].tolist() == ["E1", "E1", "E3", "E2"]
+    assert pd.isna(joined.loc[2, "record_id_link"])
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fi_forecasting.impact.impact_matrix import ImpactMatrix
+from fi_forecasting.pipeline.stages import output_path
+
+
+def test_save_and_load_round_trip(tmp_path):
+    links = pd.DataFrame(
+        {
+            "record_id_event": ["EVT_1", "EVT_1", "EVT_2", "EVT_2"],
+            "indicator_code": ["ACC", "USG", "ACC", "ACC"],
+            "effect_value": [1.0, -2.0, 0.5, 0.25],
+        }
+    )
+    matrix = ImpactMatrix.from_links(links)
+
+    path = matrix.save(tmp_path / "impact.npz")
+    loaded = ImpactMatrix.load(path)
+
+    pd.testing.assert_frame_equal(loaded.to_frame(), matrix.to_frame())
+    assert loaded.to_frame().loc["EVT_2", "ACC"] == 0.75
+
+
+def test_pipeline_exports_the_sparse_matrix():
+    assert output_path("impact_matrix").suffix == ".npz"
+
+
+@pytest.fixture
+def matrix():
+    m = ImpactMatrix()
+    m.add_links(["EVT_1", "EVT_1", "EVT_2"], ["ACC", "USG", "ACC"], [1.0, -2.0, 0.5])
+    return m
+
+
+def test_add_link_sums_into_the_pending_buffer(matrix):
+    matrix.add_link("EVT_2", "ACC", 0.25)
+    matrix.add_link("EVT_3", "DIG", 3.0)
+    assert len(matrix._pending) == 3
+
+    assert matrix.row("EVT_2").to_dict() == {"ACC": 0.75}
+    assert matrix._pending == []
+    assert matrix.shape == (3, 3)
+    assert matrix.nnz == 4
+
+
+def test_add_event_registers_events_without_effects(matrix):
+    matrix.add_event("EVT_3", {"USG": 4.0, "DIG": 1.5})
+    matrix.add_event("EVT_4", {})
+
+    assert "EVT_4" in matrix
+    assert matrix.row("EVT_3").to_dict() == {"USG": 4.0, "DIG": 1.5}
+    assert matrix.row("EVT_4").empty
+    assert matrix.to_frame().loc["EVT_4"].eq(0).all()
+
+
+def test_row_column_and_slices(matrix):
+    assert matrix.column("ACC").to_dict() == {"EVT_1": 1.0, "EVT_2": 0.5}
+    assert matrix.column("USG").to_dict() == {"EVT_1": -2.0}
+
+    rows = matrix.rows(["EVT_2", "EVT_1"]).toarray()
+    np.testing.assert_array_equal(rows, [[0.5, 0.0], [1.0, -2.0]])
+    cols = matrix.columns(["USG"]).toarray()
+    np.testing.assert_array_equal(cols, [[-2.0], [0.0]])
+    with pytest.raises(KeyError):
+        matrix.row("EVT_9")
+
+
+def test_remove_link_drops_one_entry(matrix):
+    matrix.remove_link("EVT_1", "USG")
+
+    assert matrix.row("EVT_1").to_dict() == {"ACC": 1.0}
+    assert matrix.column("USG").empty
+    assert matrix.nnz == 2
+
+
+def test_remove_event_keeps_its_slot_until_compact(matrix):
+    matrix.column("ACC")  # cache the CSC copy
+    matrix.remove_event("EVT_1")
+
+    assert "EVT_1" not in matrix
+    assert matrix.shape == (1, 2)
+    assert matrix.events.tolist() == ["EVT_2"]
+    assert matrix.to_frame().shape == matrix.shape
+    assert matrix.tocsr().shape == (2, 2)
+    assert matrix.column("ACC").to_dict() == {"EVT_2": 0.5}
+    with pytest.raises(KeyError):
+        matrix.row("EVT_1")
+
+    compacted = matrix.compact()
+    assert compacted.tocsr().shape == compacted.shape == (1, 2)
+    pd.testing.assert_frame_equal(compacted.to_frame(), matrix.to_frame())
+
+
+def test_readding_a_removed_event_reuses_its_empty_slot(matrix):
+    matrix.remove_event("EVT_1")
+    matrix.add_link("EVT_1", "USG", 7.0)
+
+    assert matrix.shape == (2, 2)
+    assert matrix.tocsr().shape == (2, 2)
+    assert matrix.row("EVT_1").to_dict() == {"USG": 7.0}
+    assert matrix.events.tolist() == ["EVT_1", "EVT_2"]
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from fi_forecasting.impact.lag_models import build_effect_grid
+
+
+def _links(rows):
+    return pd.DataFrame(
+        rows, columns=["event_date", "indicator_code", "lag_months", "effect", "shape"]
+    )
+
+
+def test_grid_without_links_spans_a_year_from_start():
+    grid = build_effect_grid(_links([]), start="2024-01")
+
+    assert len(grid.months) == 13
+    assert grid.months[0] == pd.Period("2024-01", "M")
+    assert grid.values.shape == (0, 13)
+
+
+def test_grid_with_only_zero_effects_is_not_empty():
+    links = _links([("2024-03-01", "ACC_OWNERSHIP", 6, 0.0, "step")])
+
+    grid = build_effect_grid(links, start="2024-01", indicators=["ACC_OWNERSHIP"])
+
+    assert grid.months[-1] == pd.Period("2025-01", "M")
+    assert grid.values.shape == (1, 13)
+    assert not grid.values.any()
+
+
+def test_step_effect_starts_at_event_plus_lag():
+    links = _links([("2024-03-01", "ACC_OWNERSHIP", 2, 5.0, "step")])
+
+    grid = build_effect_grid(links, start="2024-01", end="2024-12")
+    effect = grid.to_frame()["ACC_OWNERSHIP"]
+
+    assert effect.loc[: pd.Period("2024-04", "M")].abs().max() < 1e-9
+    np.testing.assert_allclose(effect.loc[pd.Period("2024-12", "M")], 5.0, atol=1e-9)
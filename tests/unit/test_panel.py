@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fi_forecasting.forecasting import panel as panel_module
+from fi_forecasting.forecasting.panel import disaggregated_panel, forecast_panel
+
+
+@pytest.fixture
+def observations():
+    rng = np.random.default_rng(5)
+    rows = []
+    for code, region in [
+        ("ACC", None),
+        ("ACC", "Amhara"),
+        ("USG", "Oromia"),
+        ("MM", None),
+    ]:
+        for year in range(2014, 2025):
+            value = 10 + (year - 2014) * (2 if code == "ACC" else 1) + rng.normal()
+            rows.append((code, region, "male", f"{year}-06-01", value))
+    df = pd.DataFrame(
+        rows,
+        columns=[
+            "indicator_code",
+            "region",
+            "gender",
+            "observation_date",
+            "value_numeric",
+        ],
+    )
+    return df[(df["indicator_code"] != "MM") | (df["observation_date"] < "2015")]
+
+
+def test_missing_keys_form_their_own_series(observations):
+    panel = disaggregated_panel(
+        observations, keys=["indicator_code", "region", "gender"]
+    )
+
+    assert ("ACC", "all", "male") in panel.columns
+    assert ("ACC", "Amhara", "male") in panel.columns
+    assert panel.shape == (11, 4)
+
+
+def test_infinite_series_fail_alone(observations):
+    panel = disaggregated_panel(observations, keys=["indicator_code", "region"])
+    panel.iloc[3, 1] = np.inf
+
+    result = forecast_panel(panel, horizon=[2025, 2026], degree=1, workers=1)
+
+    status = result.fits.set_index(["indicator_code", "region"])["status"]
+    assert status.to_dict() == {
+        ("ACC", "Amhara"): "ok",
+        ("ACC", "all"): "failed",
+        ("MM", "all"): "unfitted",
+        ("USG", "Oromia"): "ok",
+    }
+    assert result.errors["error"].tolist() == ["non-finite values"]
+    ok = result.forecasts.dropna()
+    assert len(ok) == 4 and (ok["lower"] < ok["forecast"]).all()
+    assert result.wide().shape == (2, 4)
+
+
+def test_worker_pool_matches_inline_fit(observations, monkeypatch):
+    panel = disaggregated_panel(observations, keys=["indicator_code", "region"])
+    panel.iloc[3, 1] = np.inf
+    inline = forecast_panel(panel, horizon=[2025], degree=1, workers=1)
+
+    monkeypatch.setattr(
+        panel_module, "panel_config", lambda: {"parallel_min_series": 1}
+    )
+    pooled = forecast_panel(panel, horizon=[2025], degree=1, workers=2, chunk_size=1)
+
+    pd.testing.assert_frame_equal(pooled.forecasts, inline.forecasts)
+    pd.testing.assert_frame_equal(pooled.fits, inline.fits)
+    pd.testing.assert_frame_equal(pooled.errors, inline.errors)
@@ -0,0 +1,99 @@
+import pytest
+
+from fi_forecasting.pipeline import dag
+from fi_forecasting.pipeline.dag import Pipeline, Stage
+
+
+@pytest.fixture
+def calls():
+    return {"load": 0, "double": 0}
+
+
+@pytest.fixture
+def pipe(tmp_path, calls):
+    def load():
+        calls["load"] += 1
+        return [1, 2, 3]
+
+    def double(load):
+        calls["double"] += 1
+        return [2 * x for x in load]
+
+    def total(double):
+        return sum(double)
+
+    return Pipeline(
+        [
+            Stage("load", load),
+            Stage("double", double, deps=("load",)),
+            Stage("total", total, deps=("double",), cache=False),
+        ],
+        cache_dir=tmp_path,
+        max_workers=2,
+    )
+
+
+def test_second_run_hits_the_cache(pipe, calls):
+    pipe.run()
+    run = pipe.run()
+
+    assert run.results["double"].status == "hit"
+    assert run.outputs["total"] == 12
+    assert calls == {"load": 1, "double": 1}
+
+
+def test_unreadable_cache_entry_is_recomputed(pipe, calls):
+    pipe.run()
+    key = pipe.keys(pipe.order())["double"]
+    pipe.cache.path("double", key).write_bytes(b"not a pickle")
+
+    run = pipe.run()
+
+    assert run.results["double"].status == "run"
+    assert run.results["total"].status == "run"
+    assert run.outputs["total"] == 12
+    # The upstream output is read from its own cache entry, not recomputed
+    assert calls == {"load": 1, "double": 2}
+
+
+def test_unreadable_entries_up_the_chain(pipe, calls):
+    pipe.run()
+    keys = pipe.keys(pipe.order())
+    for name in ("load", "double"):
+        pipe.cache.path(name, keys[name]).write_bytes(b"")
+
+    run = pipe.run()
+
+    assert run.outputs["total"] == 12
+    assert calls == {"load": 2, "double": 2}
+
+
+def test_keys_follow_library_sources(pipe, monkeypatch):
+    before = pipe.keys(pipe.order())
+    monkeypatch.setattr(dag, "_library_digest", lambda modules: "edited")
+
+    after = pipe.keys(pipe.order())
+
+    assert all(before[n] != after[n] for n in before)
+
+
+def _clean_stage(frame):
+    from fi_forecasting.impact.preprocessing import clean_fi_data
+
+    return clean_fi_data(frame)
+
+
+def test_library_digest_covers_only_the_modules_a_stage_imports():
+    stage = Stage("clean", _clean_stage, modules=("forecasting.forecaster",))
+
+    roots = dag._stage_modules(stage)
+    closure = dag._module_closure(roots)
+
+    assert roots == (
+        "fi_forecasting.forecasting.forecaster",
+        "fi_forecasting.impact.preprocessing",
+    )
+    assert {"fi_forecasting.impact", "fi_forecasting.core.settings"} <= closure
+    unrelated = ("fi_forecasting.dashboard", "fi_forecasting.benchmarks")
+    assert not any(m.startswith(unrelated) for m in closure)
+    assert dag._library_digest(roots) != dag._library_digest(())
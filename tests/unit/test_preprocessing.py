@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fi_forecasting.impact.preprocessing import (
+    add_growth_rate,
+    compute_indicator_transforms,
+)
+
+
+@pytest.fixture
+def observations():
+    # ACC has no region (national rows), USG has one
+    return pd.DataFrame(
+        {
+            "indicator_code": ["ACC"] * 3 + ["USG"] * 3,
+            "region": [np.nan] * 3 + ["Addis"] * 3,
+            "observation_date": ["2021-01-01", "2022-01-01", "2023-01-01"] * 2,
+            "value_numeric": [10.0, 20.0, 40.0, 1.0, 3.0, 6.0],
+        }
+    )
+
+
+def test_transforms_group_rows_with_nan_key(observations):
+    result = compute_indicator_transforms(
+        observations, group_cols=("indicator_code", "region")
+    )
+
+    growth = result.groupby("indicator_code")["growth_rate"].apply(list).to_dict()
+    assert np.isnan(growth["ACC"][0]) and growth["ACC"][1:] == [100.0, 100.0]
+    assert np.isnan(growth["USG"][0]) and growth["USG"][1:] == [200.0, 100.0]
+    np.testing.assert_allclose(result["log_diff"].iloc[[1, 2]], np.log(2.0))
+
+
+def test_transforms_do_not_cross_groups(observations):
+    result = compute_indicator_transforms(observations)
+
+    first_rows = result.groupby("indicator_code").head(1)
+    assert first_rows[["growth_rate", "log_diff", "cagr"]].isna().all().all()
+
+
+def test_wide_panel_keeps_nan_key_series(observations):
+    panel = compute_indicator_transforms(
+        observations, group_cols=("indicator_code", "region"), by_year=True, wide=True
+    )
+
+    values = panel["value_numeric"]
+    assert values.shape == (3, 2)
+    assert values.loc[2023].tolist() == [40.0, 6.0]
+
+
+def test_add_growth_rate_replaces_stale_values(observations):
+    stale = observations.assign(growth_rate=99.0)
+
+    result = add_growth_rate(stale, "ACC")
+
+    acc = result[result["indicator_code"] == "ACC"]["growth_rate"]
+    assert np.isnan(acc.iloc[0])
+    assert acc.iloc[1:].tolist() == [100.0, 100.0]
+    assert (result[result["indicator_code"] == "USG"]["growth_rate"] == 99.0).all()
+
+
+def test_add_growth_rate_unknown_indicator(observations):
+    with pytest.raises(ValueError):
+        add_growth_rate(observations, "MISSING")
@@ -0,0 +1,67 @@
+import json
+
+import pandas as pd
+import pytest
+
+from fi_forecasting.utils import profiling
+
+
+@profiling.instrument
+def _double(df):
+    with profiling.span("inner", rows_in=len(df)) as current:
+        current.rows_out = 1
+    return pd.concat([df, df])
+
+
+@profiling.instrument(name="custom")
+def _fail(df):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+def tracer(tmp_path):
+    tracer = profiling.enable(path=tmp_path / "trace.jsonl", profile_dir=tmp_path)
+    yield tracer
+    profiling.disable()
+
+
+def test_instrumented_calls_are_untraced_while_off():
+    assert not profiling.is_enabled()
+    with profiling.span("noop") as current:
+        current.rows_out = 5
+    assert len(_double(pd.DataFrame({"a": [1]}))) == 2
+
+
+def test_tracer_records_nesting_rows_and_errors(tracer):
+    _double(pd.DataFrame({"a": [1, 2, 3]}))
+    with pytest.raises(RuntimeError):
+        _fail(pd.DataFrame())
+
+    records = tracer.to_frame().set_index("name")
+    outer = records.loc[f"{__name__}._double"]
+    assert (outer["rows_in"], outer["rows_out"], outer["depth"]) == (3, 6, 0)
+    assert records.loc["inner", "parent"] == outer.name
+    assert records.loc["inner", "depth"] == 1
+    assert "boom" in records.loc["custom", "error"]
+
+    summary = profiling.summarize_trace(tracer.path)
+    assert set(summary["name"]) == {"inner", outer.name, "custom"}
+    assert summary["calls"].sum() == 3
+
+
+def test_capture_and_chrome_export(tmp_path):
+    tracer = profiling.enable(
+        path=tmp_path / "trace.jsonl", profile_dir=tmp_path, capture="_double"
+    )
+    try:
+        _double(pd.DataFrame({"a": [1]}))
+    finally:
+        profiling.disable()
+
+    profile = tracer.to_frame().set_index("name").loc[f"{__name__}._double", "profile"]
+    assert profile.endswith(".prof")
+    out = profiling.export_chrome_trace(tracer.path, tmp_path / "chrome.json")
+    events = json.loads(out.read_text())["traceEvents"]
+    assert [e["ph"] for e in events] == ["X", "X"]
+    with pytest.raises(ValueError):
+        profiling.Tracer(memory="everything")
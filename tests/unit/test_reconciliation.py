@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fi_forecasting.forecasting.reconciliation import (
+    build_hierarchy,
+    historical_proportions,
+    reconcile,
+    reconcile_matrix,
+)
+
+KEYS = ["indicator_code", "region"]
+
+
+@pytest.fixture
+def series():
+    return pd.MultiIndex.from_tuples(
+        [("A", "all"), ("A", "north"), ("A", "south"), ("B", "all")], names=KEYS
+    )
+
+
+def test_hierarchy_sums_regions_into_the_national_total(series):
+    hierarchy = build_hierarchy(series, aggregation="sum")
+
+    assert hierarchy.S.toarray().tolist() == [
+        [1, 1, 0],
+        [1, 0, 0],
+        [0, 1, 0],
+        [0, 0, 1],
+    ]
+    assert hierarchy.bottom.tolist() == [1, 2, 3]
+    assert hierarchy.top.tolist() == [0, 0, 3]
+
+    weights = pd.Series({"north": 3.0, "south": 1.0}).rename_axis("region")
+    mean = build_hierarchy(series[:3], aggregation="mean", weights=weights)
+    assert mean.S.toarray()[0].tolist() == [0.75, 0.25]
+
+
+@pytest.mark.parametrize("method", ["bottom_up", "ols", "wls_struct", "mint"])
+def test_every_method_returns_coherent_forecasts(series, method):
+    hierarchy = build_hierarchy(series, aggregation="sum")
+    Y = np.array([[12.0, 20.0], [5.0, 9.0], [4.0, 9.0], [7.0, 7.0]])
+
+    out = reconcile_matrix(hierarchy, Y, method, sigma2=np.array([4.0, 1.0, 1.0, 1.0]))
+
+    assert hierarchy.incoherence(out) < 1e-9
+    np.testing.assert_allclose(out[3], Y[3])
+    if method == "bottom_up":
+        np.testing.assert_allclose(out[0], [9.0, 18.0])
+
+
+def test_missing_series_are_inferred_from_their_tree(series):
+    hierarchy = build_hierarchy(series, aggregation="sum")
+    Y = np.array([10.0, 4.0, np.nan, np.nan])
+
+    out = reconcile_matrix(hierarchy, Y, "ols").ravel()
+
+    np.testing.assert_allclose(out[:3], [10.0, 4.0, 6.0])
+    assert np.isnan(out[3])
+    with pytest.raises(ValueError):
+        reconcile_matrix(hierarchy, Y, "mint")
+
+
+def test_top_down_long_frame_uses_historical_shares(series):
+    history = pd.DataFrame(
+        [[10.0, 6.0, 4.0, 1.0], [20.0, 12.0, 8.0, 2.0]],
+        index=[2023, 2024],
+        columns=series,
+    )
+    hierarchy = build_hierarchy(series, aggregation="sum")
+    np.testing.assert_allclose(
+        historical_proportions(hierarchy, history), [0.6, 0.4, 1.0]
+    )
+
+    forecasts = pd.DataFrame(
+        {
+            "indicator_code": ["A", "A", "A", "B"],
+            "region": ["all", "north", "south", "all"],
+            "year": 2025,
+            "forecast": [30.0, 15.0, 10.0, 3.0],
+        }
+    )
+    out = reconcile(
+        forecasts, method="top_down", keys=KEYS, history=history, aggregation="sum"
+    )
+
+    assert out["forecast"].tolist() == [30.0, 18.0, 12.0, 3.0]
+    assert out["forecast_base"].tolist() == forecasts["forecast"].tolist()
@@ -0,0 +1,58 @@
+import pandas as pd
+
+from fi_forecasting.data.guide_ingestion import stage_guide_observations
+from fi_forecasting.data.records import IdAllocator, RecordBuffer
+
+
+def test_allocator_continues_after_existing_ids():
+    alloc = IdAllocator.from_ids(
+        ["IND_DEF_00003", "IND_DEF_00010", "OBS_0007", None, "free-text"]
+    )
+
+    assert alloc.allocate("IND_DEF_", 2) == ["IND_DEF_00011", "IND_DEF_00012"]
+    assert alloc.allocate("OBS_") == ["OBS_00008"]
+    assert alloc.allocate("NEW_") == ["NEW_00001"]
+
+
+def test_allocator_floors_and_observe_never_go_back():
+    alloc = IdAllocator(floors={"IND_DEF_": 1000})
+    alloc.observe(["IND_DEF_00005"])
+
+    assert alloc.peek("IND_DEF_") == 1000
+    assert alloc.allocate("IND_DEF_") == ["IND_DEF_01001"]
+
+
+def test_buffer_materializes_all_batches_once():
+    base = pd.DataFrame({"record_id": ["A"], "value": [1.0]})
+    buffer = RecordBuffer()
+    buffer.add([{"record_id": "B", "value": 2.0}])
+    buffer.add({"record_id": ["C", "D"], "value": [3.0, None]}, value=0.0)
+    buffer.add(pd.DataFrame())
+
+    out = buffer.materialize(base)
+
+    assert len(buffer) == 3 and len(buffer.batches) == 2
+    assert out["record_id"].tolist() == ["A", "B", "C", "D"]
+    assert out["value"].tolist() == [1.0, 2.0, 3.0, 0.0]
+
+
+def test_staged_observations_get_defaults_and_are_logged():
+    logged = []
+    buffer = RecordBuffer()
+    observations = [
+        {"record_id": "OBS_1", "indicator": "x", "confidence": "high"},
+        {
+            "record_id": "OBS_2",
+            "indicator": "y",
+            "confidence": "low",
+            "collected_by": "Analyst",
+        },
+    ]
+
+    batch = stage_guide_observations(
+        buffer, observations, log_fn=lambda **record: logged.append(record)
+    )
+
+    assert batch["collected_by"].tolist() == ["Data Scientist", "Analyst"]
+    assert batch["collection_date"].notna().all()
+    assert [r["record_id"] for r in logged] == ["OBS_1", "OBS_2"]
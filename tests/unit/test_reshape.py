@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from fi_forecasting.dashboard.reshape import parse_forecast_columns, reshape_forecasts
+
+SCENARIOS = ("base", "optimistic", "pessimistic")
+
+
+def test_parse_splits_indicator_codes_with_underscores():
+    grammar = parse_forecast_columns(
+        [
+            "ACC_OWNERSHIP_base",
+            "ACC_OWNERSHIP_lower",
+            "USG_P2P_COUNT",
+            "ACC_MM_ACCOUNT",
+        ],
+        scenarios=SCENARIOS,
+    ).set_index("column")
+
+    assert grammar.loc["ACC_OWNERSHIP_base", "indicator_code"] == "ACC_OWNERSHIP"
+    assert grammar.loc["ACC_OWNERSHIP_base", "kind"] == "scenario"
+    assert grammar.loc["ACC_OWNERSHIP_lower", "kind"] == "lower"
+    assert grammar.loc["USG_P2P_COUNT", "kind"] == "bare"
+    assert grammar.loc["ACC_MM_ACCOUNT", "indicator_code"] == "ACC_MM_ACCOUNT"
+
+
+def test_reshape_to_long_with_bounds():
+    wide = pd.DataFrame(
+        {
+            "year": [2025, 2026],
+            "ACC_OWNERSHIP_base": [50.0, 52.0],
+            "ACC_OWNERSHIP_optimistic": [55.0, 58.0],
+            "ACC_OWNERSHIP_lower": [45.0, 46.0],
+            "ACC_OWNERSHIP_upper": [55.0, 58.0],
+            "USG_P2P_COUNT": [10.0, 12.0],
+        }
+    )
+
+    long = reshape_forecasts(wide, scenarios=SCENARIOS)
+
+    assert list(long.columns) == [
+        "year",
+        "indicator_code",
+        "scenario",
+        "forecast",
+        "lower_ci",
+        "upper_ci",
+    ]
+    assert len(long) == 6
+    first = long[long["year"] == 2025]
+    assert first["scenario"].tolist() == ["base", "optimistic", "base"]
+    assert first["forecast"].tolist() == [50.0, 55.0, 10.0]
+    assert first["lower_ci"].tolist()[:2] == [45.0, 45.0]
+    assert np.isnan(first["lower_ci"].iloc[2])
+    row = long[(long["year"] == 2026) & (long["scenario"] == "optimistic")].iloc[0]
+    assert (row["forecast"], row["upper_ci"]) == (58.0, 58.0)
+
+
+def test_reshape_reads_years_from_the_index():
+    wide = pd.DataFrame({"ACC_OWNERSHIP": [1.0, 2.0]}, index=[2025, 2026])
+
+    long = reshape_forecasts(wide, scenarios=SCENARIOS)
+
+    assert long["year"].tolist() == [2025, 2026]
+    assert long["scenario"].tolist() == ["base", "base"]
+
+
+def test_reshape_without_series_is_empty():
+    assert reshape_forecasts(pd.DataFrame({"year": [2025]}), scenarios=SCENARIOS).empty
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from fi_forecasting.forecasting.scenarios import (
+    ScenarioSpec,
+    prepare_links,
+    run_scenarios,
+)
+
+
+def _links(rows):
+    return pd.DataFrame(
+        rows,
+        columns=["event_id", "indicator_code", "effect", "event_year", "lag_months"],
+    ).assign(magnitude="high", category="policy")
+
+
+def test_link_effects_sum_per_indicator():
+    baseline = pd.DataFrame(
+        {"ACC": [50.0, 52.0], "USG": [10.0, 11.0]}, index=[2025, 2026]
+    )
+    links = _links(
+        [
+            ("e1", "ACC", 0.10, 2024.0, 0.0),
+            ("e2", "ACC", 0.05, 2025.0, 12.0),  # active from 2026
+            ("e3", "USG", -0.20, 2024.0, 0.0),
+            ("e4", "OTHER", 1.00, 2024.0, 0.0),  # not in the baseline
+        ]
+    )
+    specs = [
+        ScenarioSpec("base"),
+        ScenarioSpec("double", magnitude_scale=2.0),
+        ScenarioSpec("no_e1", disabled_events=("e1",)),
+    ]
+
+    effect = run_scenarios(baseline, links, specs, magnitudes={"high": 1.0}).effect
+
+    np.testing.assert_allclose(effect[0], [[0.10, 0.15], [-0.20, -0.20]])
+    np.testing.assert_allclose(effect[1], 2 * effect[0])
+    np.testing.assert_allclose(effect[2], [[0.0, 0.05], [-0.20, -0.20]])
+
+
+def test_prepare_links_prefers_indicator_code():
+    df = pd.DataFrame(
+        {
+            "record_type": ["event", "impact_link", "impact_link"],
+            "record_id": ["EVT_1", "LNK_1", "LNK_2"],
+            "parent_id": [None, "EVT_1", "EVT_1"],
+            "category": ["policy", None, None],
+            "observation_date": ["2024-05-01", None, None],
+            "related_indicator": [None, "ACC_OWNERSHIP", "ACC_OWNERSHIP"],
+            "indicator_code": [None, "USG_P2P_COUNT", None],
+            "impact_direction": [None, "increase", "decrease"],
+            "impact_magnitude": [None, "high", "low"],
+            "impact_estimate": [None, 5.0, None],
+            "lag_months": [None, 12, 6],
+        }
+    )
+
+    links = prepare_links(df, magnitudes={"high": 0.1, "low": 0.02})
+
+    assert links["indicator_code"].tolist() == ["USG_P2P_COUNT", "ACC_OWNERSHIP"]
+    np.testing.assert_allclose(links["effect"], [0.05, -0.02])
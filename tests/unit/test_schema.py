@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from fi_forecasting.data.schema import UnifiedSchema, apply_schema, fill_unknown
+
+
+def _schema(**overrides):
+    return UnifiedSchema(
+        date_columns=("observation_date",),
+        numeric_columns=("value_numeric",),
+        categorical_columns=("pillar",),
+        **overrides,
+    )
+
+
+def test_apply_schema_converts_configured_columns():
+    df = pd.DataFrame(
+        {
+            "observation_date": ["2021-01-01", "Dec 2024", "not a date"],
+            "value_numeric": ["1.5", "x", "3"],
+            "pillar": ["ACCESS", "USAGE", "ACCESS"],
+            "count": [1, 2, 3],
+        }
+    )
+
+    out = apply_schema(df, _schema())
+
+    assert out["observation_date"].tolist()[:2] == [
+        pd.Timestamp("2021-01-01"),
+        pd.Timestamp("2024-12-01"),
+    ]
+    assert pd.isna(out["observation_date"].iloc[2])
+    assert out["value_numeric"].dtype == np.float32
+    assert np.isnan(out["value_numeric"].iloc[1])
+    assert isinstance(out["pillar"].dtype, pd.CategoricalDtype)
+    assert out["count"].dtype == np.int8
+    assert df["value_numeric"].tolist() == ["1.5", "x", "3"]
+
+
+def test_floats_are_only_downcast_when_lossless():
+    df = pd.DataFrame({"exact": [0.5, np.nan], "precise": [0.1, 1 / 3]})
+
+    out = apply_schema(df, _schema())
+
+    assert out["exact"].dtype == np.float32
+    assert out["precise"].dtype == np.float64
+
+
+def test_text_columns_become_category_when_sparse_or_repetitive():
+    df = pd.DataFrame(
+        {
+            "notes": [None, None, None, "one"],
+            "source": ["a", "a", "a", "b"],
+            "free": ["w", "x", "y", "z"],
+        }
+    )
+
+    out, report = apply_schema(df, _schema(), return_report=True, skip=["source"])
+
+    assert isinstance(out["notes"].dtype, pd.CategoricalDtype)
+    assert not isinstance(out["source"].dtype, pd.CategoricalDtype)
+    assert not isinstance(out["free"].dtype, pd.CategoricalDtype)
+    assert report["column"].iloc[-1] == "TOTAL"
+    assert report["bytes_after"].iloc[-1] == report["bytes_after"].iloc[:-1].sum()
+
+
+def test_fill_unknown_adds_the_category():
+    values = pd.Series(["a", None], dtype="category")
+
+    assert fill_unknown(values).tolist() == ["a", "unknown"]
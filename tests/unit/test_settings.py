@@ -0,0 +1,46 @@
+import os
+
+from fi_forecasting.core.settings import Settings, load_config
+
+
+def _write(path, text):
+    path.write_text(text)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_configs_are_deep_merged_in_name_order(tmp_path):
+    (tmp_path / "a.yaml").write_text(
+        "forecast:\n  horizon: [2025]\n  trend:\n    degree: 1\n"
+    )
+    (tmp_path / "b.yaml").write_text("forecast:\n  trend:\n    degree: 2\n")
+
+    config = load_config(tmp_path)
+
+    assert config["forecast"] == {"horizon": [2025], "trend": {"degree": 2}}
+
+
+def test_merged_config_is_cached_until_a_file_changes(tmp_path):
+    path = tmp_path / "a.yaml"
+    path.write_text("x: 1\n")
+
+    first = load_config(tmp_path)
+    assert load_config(tmp_path) is first
+
+    _write(path, "x: 2\n")
+    assert load_config(tmp_path)["x"] == 2
+
+
+def test_settings_follow_config_edits_and_resolve_paths(tmp_path):
+    config = tmp_path / "config"
+    config.mkdir()
+    path = config / "paths.yaml"
+    path.write_text("paths:\n  reports:\n    logs: reports/logs\n")
+    settings = Settings(root=tmp_path)
+
+    assert settings.paths["reports"]["logs"] == tmp_path.resolve() / "reports" / "logs"
+    assert not (tmp_path / "reports").exists()
+
+    _write(path, "paths:\n  reports:\n    logs: out/logs\n")
+    assert settings.paths.REPORTS["logs"] == tmp_path.resolve() / "out" / "logs"
+    assert settings.get("missing", {}) == {}
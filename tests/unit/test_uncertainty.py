@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fi_forecasting.forecasting.forecaster import fit_trends
+from fi_forecasting.forecasting.uncertainty import (
+    interval_columns,
+    prediction_intervals,
+    simulate_paths,
+)
+
+
+@pytest.fixture
+def fit():
+    years = np.arange(2011, 2025)
+    rng = np.random.default_rng(1)
+    panel = pd.DataFrame(
+        {
+            "A": 10 + 2.0 * (years - 2011) + rng.normal(0, 1, len(years)),
+            "B": 50 - 1.0 * (years - 2011) + rng.normal(0, 3, len(years)),
+            "C": np.nan,
+            "D": np.nan,
+        },
+        index=years,
+    )
+    panel.columns.name = "indicator_code"
+    panel.loc[[2020, 2024], "C"] = [30.0, 40.0]
+    panel.loc[2024, "D"] = 5.0
+    return fit_trends(panel, degree=1)
+
+
+@pytest.mark.parametrize("method", ["bootstrap", "parametric"])
+def test_intervals_bracket_the_forecast(fit, method):
+    out = prediction_intervals(fit, horizon=[2025, 2027], n_draws=2000, method=method)
+
+    live = out[out["indicator_code"].isin(["A", "B", "C"])]
+    assert (live["q0.025"] < live["forecast"]).all()
+    assert (live["forecast"] < live["q0.975"]).all()
+    np.testing.assert_allclose(live["q0.5"], live["forecast"], atol=1.5)
+    assert out.loc[out["indicator_code"] == "D", "q0.5"].isna().all()
+    pooled = out.groupby("indicator_code")["pooled_scale"].first()
+    assert pooled.tolist() == [False, False, True, False]
+
+
+def test_blocking_and_workers_do_not_change_results(fit):
+    whole = prediction_intervals(fit, horizon=[2025], n_draws=500, seed=3)
+    blocked = prediction_intervals(
+        fit, horizon=[2025], n_draws=500, seed=3, max_bytes=1
+    )
+    pooled = prediction_intervals(
+        fit, horizon=[2025], n_draws=500, seed=3, max_bytes=1, n_jobs=2
+    )
+
+    assert whole["q0.5"].notna().sum() == 3
+    pd.testing.assert_frame_equal(blocked, pooled)
+
+
+def test_paths_and_interval_columns(fit):
+    paths = simulate_paths(fit, horizon=[2025, 2026], n_draws=50, seed=0)
+    out = prediction_intervals(fit, horizon=[2025, 2026], n_draws=200)
+
+    assert paths.shape == (50, 4, 2)
+    assert np.isnan(paths[:, 3]).all() and np.isfinite(paths[:, :3]).all()
+    wide = interval_columns(out)
+    assert wide.index.tolist() == [2025, 2026]
+    assert "A_lower" in wide.columns and "C_upper" in wide.columns
+    with pytest.raises(ValueError):
+        interval_columns(out, lower=0.1)
+    with pytest.raises(ValueError):
+        prediction_intervals(fit, quantiles=[1.5])
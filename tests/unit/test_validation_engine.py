@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fi_forecasting.data.validation_engine import ValidationPlan, validate_dataset
+
+
+@pytest.fixture
+def reference():
+    return pd.DataFrame(
+        {
+            "field": ["pillar", "pillar", "confidence"],
+            "valid_value": ["ACCESS", "USAGE", "high"],
+        }
+    )
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame(
+        {
+            "record_type": ["observation", "event", "bogus", "observation"],
+            "pillar": ["ACCESS", "GENDER", "USAGE", "GENDER"],
+            "value_numeric": [1.0, np.nan, 2.0, np.nan],
+        },
+        index=[10, 11, 12, 13],
+    )
+
+
+def test_plan_reports_every_violation_with_rows(reference, frame):
+    plan = ValidationPlan.compile(
+        reference_df=reference, required_columns=["record_type"]
+    )
+    report = plan.run(frame)
+
+    by_key = {(v.rule, v.column): v for v in report.violations}
+    assert not report.ok
+    assert by_key[("allowed_values", "pillar")].rows.tolist() == [11, 13]
+    assert by_key[("allowed_values", "pillar")].values == ["GENDER"]
+    assert by_key[("allowed_values", "record_type")].rows.tolist() == [12]
+    assert by_key[("non_null", "value_numeric")].rows.tolist() == [13]
+    assert by_key[("missing_column", "confidence")].count == 0
+    with pytest.raises(ValueError):
+        report.raise_if_failed()
+
+
+def test_categorical_columns_match_object_columns(reference, frame):
+    plan = ValidationPlan.compile(
+        reference_df=reference, required_columns=["record_type"]
+    )
+    categorical = frame.astype({"pillar": "category", "record_type": "category"})
+
+    expected = plan.run(frame).rows()
+    got = plan.run(categorical).rows()
+
+    pd.testing.assert_frame_equal(got, expected)
+
+
+def test_chunked_run_merges_to_the_single_pass_result(reference, frame):
+    plan = ValidationPlan.compile(
+        reference_df=reference, required_columns=["record_type"]
+    )
+
+    whole = plan.run(frame)
+    chunked = plan.run_chunked(frame, chunk_size=1)
+
+    assert chunked.n_rows == whole.n_rows
+    pd.testing.assert_frame_equal(chunked.rows(), whole.rows())
+    counts = {(v.rule, v.column): v.count for v in whole.violations}
+    assert {(v.rule, v.column): v.count for v in chunked.violations} == counts
+
+
+def test_validate_dataset_flags_missing_required_columns():
+    report = validate_dataset(pd.DataFrame({"record_type": ["observation"]}))
+
+    missing = report.violations[0]
+    assert missing.rule == "required_columns"
+    assert "record_id" in missing.values and "record_type" not in missing.values
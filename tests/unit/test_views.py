@@ -0,0 +1,78 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fi_forecasting.dashboard.views import (
+    DashboardViews,
+    build_views,
+    load_views,
+    save_views,
+)
+
+
+@pytest.fixture
+def unified():
+    return pd.DataFrame(
+        {
+            "record_id": ["O1", "O2", "O3", "O4", "O5", "E1", "E2"],
+            "record_type": ["observation"] * 5 + ["event", "event"],
+            "indicator_code": ["ACC", "ACC", "ACC", "ACC", "USG", "EVT", "EVT"],
+            "indicator": ["a", "a", "a", "a", "u", "Launch", "Policy"],
+            "category": [None] * 5 + ["product_launch", "policy"],
+            "gender": ["male", "female", None, "male", None, None, None],
+            "value_numeric": [40.0, 30.0, 35.0, 50.0, 7.0, np.nan, np.nan],
+            "observation_date": [
+                "2021-01-01",
+                "2021-06-01",
+                "2021-12-31",
+                "2024-01-01",
+                "2022-01-01",
+                None,
+                "2019-05-01",
+            ],
+            "event_date": [None] * 5 + ["2023-03-01", None],
+        }
+    )
+
+
+def test_build_views_aggregates_trends_kpis_and_events(unified):
+    views = build_views(unified, dimensions=["gender", "region"])
+
+    trends = views["trends"].set_index(["indicator_code", "year"])
+    assert trends.loc[("ACC", 2021), "value"] == 35.0
+    assert trends.loc[("ACC", 2021), "n_obs"] == 3
+    detail = views["trends_detail"]
+    assert set(detail.columns) >= {"gender", "value"} and "region" not in detail
+    assert detail.loc[detail["gender"] == "all", "n_obs"].sum() == 2
+
+    kpi = views["kpis"].set_index("indicator_code").loc["ACC"]
+    assert (kpi["year"], kpi["prev_year"], kpi["change"]) == (2024, 2021, 15.0)
+    assert views["events"]["record_id"].tolist() == ["E2", "E1"]
+    assert views["events"]["year"].tolist() == [2019, 2023]
+
+
+def test_views_round_trip_with_manifest(unified, tmp_path):
+    views = build_views(unified, dimensions=["gender"])
+
+    save_views(views, tmp_path / "views")
+    loaded = load_views(tmp_path / "views")
+
+    manifest = json.loads((tmp_path / "views" / "manifest.json").read_text())
+    assert manifest["views"]["trends"] == len(views["trends"])
+    pd.testing.assert_frame_equal(loaded.events, views["events"])
+    (tmp_path / "views" / "kpis.parquet").unlink()
+    with pytest.raises(FileNotFoundError):
+        load_views(tmp_path / "views")
+
+
+def test_indexed_lookups(unified):
+    views = DashboardViews.from_data(unified, dimensions=["gender"])
+
+    assert views.indicators == ["ACC", "USG"]
+    assert views.year_range == (2021, 2024)
+    assert views.trend(["ACC"], start=2022)["year"].tolist() == [2024]
+    assert views.trend(["USG", "missing"], end=2021).empty
+    assert views.kpi("USG")["value"] == 7.0 and views.kpi("missing") is None
+    assert views.events_between(2020, 2024)["record_id"].tolist() == ["E1"]
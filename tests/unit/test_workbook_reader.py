@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from fi_forecasting.data.workbook_reader import read_workbook, sheet_xml_sizes
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "book.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({"a": [1, 2, 3]}).to_excel(writer, sheet_name="data", index=False)
+        pd.DataFrame({"b": ["x"]}).to_excel(writer, sheet_name="meta", index=False)
+    return path
+
+
+def test_reads_requested_sheets_in_order(workbook):
+    read = read_workbook(workbook, ["meta", "data"])
+
+    assert list(read.frames) == ["meta", "data"]
+    assert read.frames["data"]["a"].tolist() == [1, 2, 3]
+    assert set(read.report()["sheet"]) == {"meta", "data"}
+
+
+def test_positions_and_all_sheets(workbook):
+    assert list(read_workbook(workbook, [1]).frames) == ["meta"]
+    assert list(read_workbook(workbook).frames) == ["data", "meta"]
+
+
+def test_missing_sheets(workbook):
+    read = read_workbook(workbook, ["data", "extra"], optional=["extra"])
+    assert list(read.frames) == ["data"]
+
+    with pytest.raises(ValueError):
+        read_workbook(workbook, ["extra"])
+    with pytest.raises(FileNotFoundError):
+        read_workbook(workbook.with_name("absent.xlsx"))
+
+
+def test_parallel_read_matches_inline(workbook):
+    inline = read_workbook(workbook)
+    pooled = read_workbook(workbook, parallel=True, parallel_min_bytes=0)
+
+    for name, frame in inline.frames.items():
+        pd.testing.assert_frame_equal(pooled.frames[name], frame)
+    assert all(s.parallel for s in pooled.stats)
+    assert sheet_xml_sizes(workbook).keys() == {"data", "meta"}